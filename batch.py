@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+# batch.py
+"""
+CLI headless pentru generarea mai multor cărți fără UI.
+
+Manifest (JSON) — listă de proiecte sau {"projects": [...]}:
+    [
+      {"name": "Dragon Road", "plot": "...", "genre": "fantasy", "chapters": 12, "anpc": 5,
+       "title": "The Dragon Road", "author": "Jane Doe"}
+    ]
+
+Proiectele existente în projects/ sunt reluate de unde au rămas.
+Exemplu:
+    python batch.py manifest.json --concurrency 3 --provider-concurrency "LM Studio=1" --provider-concurrency OpenAI=6
+
+Înregistrare / redare a apelurilor LLM (vezi state/llm_cassette.py):
+    python batch.py manifest.json --record runs/dragon.jsonl.gz
+    python batch.py manifest.json --replay runs/dragon.jsonl.gz --replay-speed 10
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.logger import log_console
+from state.pipeline_context import PipelineContext
+from state.pipeline_state import StopToken, stop_scope
+from state.llm_telemetry import call_count, get_calls, summarize_calls
+from provider.provider_manager import set_provider_concurrency
+from state import llm_cassette
+from state.project_store import (
+    read_project_context,
+    read_project_data,
+    write_project_context,
+    _validate_name,
+)
+from pipeline.jobs import run_create_job, resume_point_for
+from pipeline.events import EventKind
+
+
+def _load_manifest(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data.get("projects", []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError("Manifest must be a list of projects or an object with a 'projects' list.")
+
+    projects = []
+    for i, entry in enumerate(entries):
+        name = (entry.get("name") or entry.get("project_name") or "").strip()
+        err = _validate_name(name)
+        if err:
+            raise ValueError(f"Manifest entry #{i+1}: {err}")
+        projects.append({
+            "name": name,
+            "plot": entry.get("plot", ""),
+            "genre": entry.get("genre", ""),
+            "num_chapters": int(entry.get("chapters", entry.get("num_chapters", 5)) or 5),
+            "anpc": int(entry.get("anpc", entry.get("avg_pages_per_chapter", 5)) or 5),
+            "title": entry.get("title") or name,
+            "author": entry.get("author"),
+        })
+    return projects
+
+
+def _parse_provider_limits(values):
+    limits = {}
+    for value in values or []:
+        if "=" not in value:
+            raise ValueError(f"Invalid --provider-concurrency value '{value}' (expected Provider=N).")
+        provider, limit = value.rsplit("=", 1)
+        limits[provider.strip()] = int(limit)
+    return limits
+
+
+def _run_book(project: dict, stop: StopToken) -> dict:
+    """Generează (sau reia) o carte. Rulează într-un thread din pool, cu propriul stop."""
+    name = project["name"]
+    thread_id = threading.get_ident()
+    telemetry_start = call_count()
+
+    if read_project_data(name) is None:
+        write_project_context(name, PipelineContext(
+            plot=project["plot"],
+            genre=project["genre"],
+            num_chapters=project["num_chapters"],
+            anpc=project["anpc"],
+        ))
+        log_console(f"🆕 [{name}] Project created.")
+
+    context = read_project_context(name)
+    chapters_before = len(context.chapters_full or [])
+    if resume_point_for(context) is not None and chapters_before:
+        log_console(f"▶️ [{name}] Resuming from chapter {chapters_before + 1}/{context.num_chapters}.")
+
+    started = time.time()
+    counter = ""
+    printed_lines = 0
+    with stop_scope(stop):
+        for events in run_create_job({"source": "project", "project_name": name}):
+            for event in events:
+                if event.kind == EventKind.LOG_LINE:
+                    lines = [event.value]
+                elif event.kind == EventKind.LOG_RESET:
+                    # Log-ul complet al proiectului reluat: afișăm doar ce nu s-a afișat deja.
+                    lines = event.value[printed_lines:]
+                elif event.kind == EventKind.COUNTER:
+                    counter = event.value
+                    continue
+                else:
+                    continue
+                for line in lines:
+                    if line.strip():
+                        print(f"[{name}] {line}", flush=True)
+                printed_lines += len(lines)
+
+    elapsed = time.time() - started
+    final = read_project_context(name)
+    chapters_after = len(final.chapters_full or [])
+    usage = summarize_calls(get_calls(telemetry_start, thread_id=thread_id))
+
+    return {
+        "name": name,
+        "title": project["title"],
+        "author": project["author"],
+        "complete": resume_point_for(final) is None,
+        "chapters_generated": max(0, chapters_after - chapters_before),
+        "chapters_total": chapters_after,
+        "elapsed": elapsed,
+        "usage": usage,
+        "chapters": final.chapters_full,
+        "counter": counter,
+    }
+
+
+def _export(result: dict, default_author: str, output_dir: str):
+    from utils.epub import write_epub
+    return write_epub(
+        result["chapters"],
+        result["title"],
+        result["author"] or default_author,
+        output_dir=output_dir,
+    )
+
+
+def _format_rate(value: float) -> str:
+    return f"{value:,.2f}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="PlotKing headless batch generation.")
+    parser.add_argument("manifest", help="Path to the JSON manifest with projects to generate.")
+    parser.add_argument("--concurrency", type=int, default=1, help="Maximum number of books generated in parallel (default: 1).")
+    parser.add_argument("--provider-concurrency", action="append", default=[], metavar="PROVIDER=N",
+                        help="Maximum simultaneous LLM calls for a provider, e.g. 'LM Studio=1'. Can be repeated.")
+    parser.add_argument("--no-export", action="store_true", help="Skip EPUB export at the end.")
+    parser.add_argument("--author", default="PlotKing", help="Default author for exported EPUBs.")
+    parser.add_argument("--export-dir", default="exports", help="Output directory for EPUBs (default: exports).")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", metavar="PATH", help="Record every LLM request/response to a cassette (.jsonl.gz).")
+    cassette.add_argument("--replay", metavar="PATH", help="Answer LLM calls from a recorded cassette instead of the providers.")
+    parser.add_argument("--replay-speed", type=float, default=0.0,
+                        help="Replay timing: 1 = original LLM latency, 10 = 10x faster, 0 = instant (default).")
+    args = parser.parse_args(argv)
+
+    try:
+        projects = _load_manifest(args.manifest)
+        set_provider_concurrency(_parse_provider_limits(args.provider_concurrency))
+        if args.replay:
+            llm_cassette.start_replay(args.replay, args.replay_speed)
+        elif args.record:
+            llm_cassette.start_recording(args.record)
+        else:
+            llm_cassette.configure_from_env()
+    except Exception as e:
+        log_console(f"❌ {e}")
+        return 2
+
+    if not projects:
+        log_console("ℹ️ Manifest is empty — nothing to do.")
+        return 0
+
+    log_console(f"🚀 Batch started: {len(projects)} project(s), concurrency {max(1, args.concurrency)}.")
+    batch_started = time.time()
+    telemetry_start = call_count()
+    results = {}
+
+    # câte un stop per carte: clear_stop() din pipeline-ul unei cărți nu anulează Ctrl+C pentru celelalte
+    stops = {p["name"]: StopToken() for p in projects}
+    executor = ThreadPoolExecutor(max_workers=max(1, args.concurrency))
+    futures = {executor.submit(_run_book, p, stops[p["name"]]): p["name"] for p in projects}
+    try:
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                log_console(f"❌ [{name}] Failed: {e}")
+                continue
+            results[name] = result
+            state = "complete" if result["complete"] else "partial"
+            log_console(
+                f"✅ [{name}] {state}: {result['chapters_generated']} new chapter(s) in {result['elapsed']/60:.1f} min "
+                f"({result['usage']['output_tokens']:,} est. output tokens)."
+            )
+    except KeyboardInterrupt:
+        # Pipeline-ul se oprește la următorul punct de pauză; proiectele rămân salvate și pot fi reluate.
+        log_console("🛑 Interrupted — pausing all books after the current step...")
+        for future in futures:
+            future.cancel()
+        for stop in stops.values():
+            stop.request()
+        for future, name in futures.items():
+            if future.cancelled() or name in results:
+                continue
+            try:
+                results[name] = future.result()
+            except Exception:
+                pass
+    finally:
+        executor.shutdown(wait=True)
+
+    if not args.no_export:
+        for result in results.values():
+            if not result["complete"]:
+                log_console(f"⏭️ [{result['name']}] Incomplete — skipping export.")
+                continue
+            try:
+                path = _export(result, args.author, args.export_dir)
+                log_console(f"📚 [{result['name']}] Exported: {path}")
+            except Exception as e:
+                log_console(f"❌ [{result['name']}] Export failed: {e}")
+
+    if llm_cassette.mode() != llm_cassette.MODE_OFF:
+        log_console(llm_cassette.format_summary(llm_cassette.stop()))
+
+    wall = max(1e-6, time.time() - batch_started)
+    usage = summarize_calls(get_calls(telemetry_start))
+    chapters = sum(r["chapters_generated"] for r in results.values())
+    log_console(
+        f"📊 Throughput: {chapters} chapter(s) in {wall/3600:.2f} h → {_format_rate(chapters / (wall / 3600))} chapters/hour; "
+        f"{usage['output_tokens']:,} est. output tokens → {_format_rate(usage['output_tokens'] / wall)} tokens/sec "
+        f"({usage['calls']} LLM calls, {usage['failed']} failed)."
+    )
+    return 0 if all(r["complete"] for r in results.values()) and len(results) == len(projects) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 import gradio as gr
 import os, re, json
 from pipeline.constants import RUN_MODE_CHOICES
-from state.pipeline_state import request_stop, clear_stop
+from state.pipeline_state import clear_stop
 from state.checkpoint_manager import get_checkpoint, clear_checkpoint
 from state.checkpoint_manager import get_checkpoint, clear_checkpoint
 from utils.timestamp import ts_prefix
@@ -114,7 +114,8 @@ def show_stop_only():
     )
 
 def stop_pipeline(cur_status):
-    request_stop()
+    from pipeline.jobs import cancel_ui_create_job
+    cancel_ui_create_job()
     new_status = (cur_status + "\n" + ts_prefix("🛑 Stop requested")).strip() if cur_status else ts_prefix("🛑 Stop requested")
     return new_status, gr.update(interactive=False, value="Stopping…"), gr.update(visible=False)
 
@@ -556,8 +557,9 @@ def generate_dispatcher(current_run_mode, plot_val, chapters_in, genre_in, anpc_
     if current_run_mode == "Start Empty":
          yield from start_empty_mode_init(plot_val, genre_in, anpc_in, chapters_in)
     else:
-         from pipeline.runner_create import generate_book_outline_stream
-         yield from generate_book_outline_stream(plot_val, chapters_in, genre_in, anpc_in, run_mode_in)
+         # Rularea are loc într-un job din background; aici doar ne abonăm la progres.
+         from pipeline.jobs import create_job_stream
+         yield from create_job_stream(plot_val, chapters_in, genre_in, anpc_in, run_mode_in)
 
 def reset_chat_handler(plot, genre, current_log):
     greeting = call_llm_chat(plot, genre, [], "START_SESSION")
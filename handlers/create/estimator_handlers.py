@@ -0,0 +1,23 @@
+# handlers/create/estimator_handlers.py
+"""
+Handlers pentru estimatorul de cost / durată din Create tab.
+"""
+
+import gradio as gr
+from pipeline.estimator import estimate_create_run, format_estimate_markdown, format_comparison_markdown
+from state.llm_telemetry import get_runs
+
+
+def estimate_handler(num_chapters, anpc, run_mode):
+    """Estimare pentru un run nou cu parametrii curenți și modelele din Settings."""
+    try:
+        estimate = estimate_create_run(num_chapters, anpc, run_mode)
+    except Exception as e:
+        return gr.update(value=f"⚠️ Could not estimate: {e}")
+    return gr.update(value=format_estimate_markdown(estimate))
+
+
+def show_last_run_comparison():
+    """După un run: estimat vs real pentru ultima rulare înregistrată."""
+    runs = get_runs()
+    return gr.update(value=format_comparison_markdown(runs[-1] if runs else None))
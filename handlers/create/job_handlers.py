@@ -0,0 +1,93 @@
+# handlers/create/job_handlers.py
+"""
+Handlers pentru panoul "Background Jobs" din Create tab:
+listare job-uri, punere în coadă a proiectelor salvate, attach / detach / cancel.
+"""
+
+import gradio as gr
+from state.job_manager import JobManager
+from pipeline.jobs import JOB_KIND_CREATE, submit_create_job, job_stream
+from utils.logger import append_log_string
+from utils.timestamp import ts_prefix
+
+_STATUS_ICONS = {
+    "queued": "⏳",
+    "running": "⚙️",
+    "done": "✅",
+    "failed": "❌",
+    "cancelled": "🚫",
+    "interrupted": "⚠️",
+}
+
+
+def _job_choices():
+    jobs = JobManager().list_jobs(JOB_KIND_CREATE)
+    return [(f"{j.job_id} · {_STATUS_ICONS.get(j.status, '')} {j.status} · {j.label}", j.job_id) for j in jobs]
+
+
+def format_jobs_markdown() -> str:
+    jobs = JobManager().list_jobs()
+    if not jobs:
+        return "_No background jobs yet._"
+    lines = ["| Job | Type | Status | Progress | Created |", "|---|---|---|---|---|"]
+    for j in jobs[:20]:
+        progress = (j.error or j.progress or "").replace("|", "/").replace("\n", " ")
+        lines.append(
+            f"| `{j.job_id}` {j.label} | {j.kind} | {_STATUS_ICONS.get(j.status, '')} {j.status} | {progress} | {j.created_at} |"
+        )
+    return "\n".join(lines)
+
+
+def refresh_jobs_panel(selected_job=None):
+    choices = _job_choices()
+    values = [c[1] for c in choices]
+    if selected_job not in values:
+        selected_job = values[0] if values else None
+    return gr.update(value=format_jobs_markdown()), gr.update(choices=choices, value=selected_job)
+
+
+def queue_project_handler(selected_project, current_log):
+    """Pune în coadă generarea (sau reluarea) unui proiect salvat."""
+    if not selected_project:
+        new_log = append_log_string(current_log, ts_prefix("❌ Select a saved project to queue."))
+        jobs_md, jobs_dd = refresh_jobs_panel()
+        return new_log, jobs_md, jobs_dd
+
+    job_id = submit_create_job(project_name=selected_project)
+    new_log = append_log_string(current_log, ts_prefix(f"📥 Project “{selected_project}” queued as job {job_id}."))
+    jobs_md, jobs_dd = refresh_jobs_panel(job_id)
+    return new_log, jobs_md, jobs_dd
+
+
+def attach_job_stream(job_id, current_log):
+    """Reatașare la un job: redă ultimul output și continuă cu progresul live."""
+    if not job_id:
+        yield gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), append_log_string(current_log, ts_prefix("❌ Select a job to attach to.")), gr.update()
+        return
+    job = JobManager().get(job_id)
+    if not job:
+        yield gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), append_log_string(current_log, ts_prefix(f"❌ Job {job_id} not found.")), gr.update()
+        return
+    if job.last_output is None and not job.is_active:
+        yield gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), append_log_string(current_log, ts_prefix(f"ℹ️ Job {job_id} is {job.status}; no live output to show.")), gr.update()
+        return
+    yield from job_stream(job_id, current_log)
+
+
+def detach_job_handler(job_id, current_log):
+    """Detașează UI-ul de job; job-ul continuă să ruleze pe server."""
+    if not job_id:
+        return append_log_string(current_log, ts_prefix("❌ Select a job to detach from."))
+    JobManager().detach(job_id)
+    return append_log_string(current_log, ts_prefix(f"⏏️ Detached from job {job_id} — it keeps running in the background."))
+
+
+def cancel_job_handler(job_id, current_log):
+    if not job_id:
+        new_log = append_log_string(current_log, ts_prefix("❌ Select a job to cancel."))
+    elif JobManager().cancel(job_id):
+        new_log = append_log_string(current_log, ts_prefix(f"🛑 Cancel requested for job {job_id}."))
+    else:
+        new_log = append_log_string(current_log, ts_prefix(f"ℹ️ Job {job_id} is not active."))
+    jobs_md, jobs_dd = refresh_jobs_panel(job_id)
+    return new_log, jobs_md, jobs_dd
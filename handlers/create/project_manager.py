@@ -9,11 +9,23 @@ from state.pipeline_state import clear_stop
 from state.checkpoint_manager import save_checkpoint, clear_checkpoint
 
 # === Config & helpers ===
-_PROJECTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "projects")
-_NAME_RE = re.compile(r'^[A-Za-z0-9 _-]+$')
 _current_project: Optional[str] = None
 
 from state.drafts_manager import DraftsManager
+from state.section_index import SectionIndex
+from state.project_store import (
+    _PROJECTS_DIR,
+    _ensure_projects_dir,
+    _project_path,
+    _validate_name,
+    _choose_plot_for_pipeline,
+    _tokenized_fields,
+    _tokenized_data,
+    list_projects,
+    read_project_data,
+    read_project_context,
+    write_project_context,
+)
 
 def get_current_project() -> Optional[str]:
     """Returnează numele proiectului curent sau None dacă nu există."""
@@ -31,30 +43,6 @@ def _format_header_html(project_name: Optional[str]) -> str:
     else:
         return "<div id='bk-project'>(No project loaded)</div>"
 
-def _ensure_projects_dir():
-    os.makedirs(_PROJECTS_DIR, exist_ok=True)
-
-def _project_path(name: str) -> str:
-    return os.path.join(_PROJECTS_DIR, f"{name}.json")
-
-def _validate_name(name: str):
-    if not name or not name.strip():
-        return "❌ Please enter a project name."
-    name = name.strip()
-    if not _NAME_RE.match(name):
-        return "❌ Invalid project name. Use letters, numbers, spaces, '-' or '_' only."
-    return None
-
-def list_projects():
-    _ensure_projects_dir()
-    names = [fn[:-5] for fn in os.listdir(_PROJECTS_DIR) if fn.lower().endswith(".json")]
-    names.sort(key=lambda s: s.lower())
-    return names
-
-# helper local (evităm import circular din handlers)
-def _choose_plot_for_pipeline(plot, refined):
-    return refined if (refined or "").strip() else plot
-
 # === Actions ===
 
 def save_project(
@@ -90,11 +78,13 @@ def save_project(
         expanded_plot = checkpoint.expanded_plot or ""
         chapters_overview = checkpoint.chapters_overview or ""
         chapters = checkpoint.chapters_full or []
+        tokenized = _tokenized_data(checkpoint)
     else:
         # Dacă checkpoint nu există, folosește valori goale
         expanded_plot = ""
         chapters_overview = ""
         chapters = []
+        tokenized = None
 
     data = {
         "project_name": project_name.strip(),
@@ -107,6 +97,8 @@ def save_project(
         "chapters_overview": chapters_overview,
         "chapters": chapters,
     }
+    if tokenized:
+        data["tokenized_overview"] = tokenized
 
     path = _project_path(project_name.strip())
     try:
@@ -173,11 +165,13 @@ def load_project(selected_name, current_status):
         pending_validation_index=None,
         next_chapter_index=None,
         status_log=[ts_prefix(f"📂 Project “{selected_name}” loaded.")],
+        **_tokenized_fields(data),
     )
     save_checkpoint(checkpoint)
     
     # Clear drafts on load
     DraftsManager().clear()
+    SectionIndex().clear()
     
     # Set current project
     set_current_project(selected_name)
@@ -292,6 +286,7 @@ def new_project(current_status):
     
     # Clear drafts on new project
     DraftsManager().clear()
+    SectionIndex().clear()
     
     # Reset current project
     set_current_project(None)
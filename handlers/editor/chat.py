@@ -1,6 +1,6 @@
 # ui/tabs/editor/chat.py
 import gradio as gr
-from pipeline.runner_validate import run_validate_pipeline
+from pipeline.validation_cache import schedule_validation, validate_section
 from handlers.editor.utils import append_status, should_show_add_fill_btn
 from state.drafts_manager import DraftsManager, DraftType
 from handlers.editor.constants import Components, States
@@ -180,6 +180,7 @@ def chat_handler(section, message, history, current_log, chat_type="Chapter"):
             # Edits were made - create draft and show status_row
             drafts_mgr = DraftsManager()
             drafts_mgr.add_chat(section, new_content)
+            schedule_validation(section, new_content)  # validare speculativă dacă draft-ul rămâne neschimbat
             
             # Calculate undo/redo visibility - check if undo stack exists for this CHAT draft
             # Note: redo is always False when creating a new draft, as redo stack is cleared on new creation
@@ -363,7 +364,7 @@ def validate_handler(section, current_log):
         gr.update(visible=False), # add_fill_btn - hide during validation
     )
     
-    msg, plan, validation_error = run_validate_pipeline(section, draft_to_validate)
+    msg, plan, validation_error = validate_section(section, draft_to_validate)
     final_log, final_status = append_status(new_log, f"✅ ({section}) Validation completed.")
     
     apply_interactive = not validation_error
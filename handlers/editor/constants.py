@@ -16,6 +16,14 @@ class Components(str, Enum):
     REWRITE_VALIDATE_BTN = "rewrite_validate_btn"
     REWRITE_DISCARD_BTN = "rewrite_discard_btn"
     REWRITE_FORCE_EDIT_BTN = "rewrite_force_edit_btn"
+    REGEN_SECTION = "regen_section"
+    REGEN_LEVEL_RADIO = "regen_level_radio"
+    REGEN_INSTRUCTIONS_TB = "regen_instructions_tb"
+    REGEN_BTN = "regen_btn"
+    REGEN_VALIDATE_BTN = "regen_validate_btn"
+    REGEN_DISCARD_BTN = "regen_discard_btn"
+    REGEN_FORCE_EDIT_BTN = "regen_force_edit_btn"
+    REGEN_KEEP_DRAFT_BTN = "regen_keep_draft_btn"
     CHAT_SECTION = "chat_section"
     VALIDATION_SECTION = "validation_section"
     CHATBOT = "chatbot"
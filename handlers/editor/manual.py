@@ -1,5 +1,5 @@
 import gradio as gr
-from pipeline.runner_validate import run_validate_pipeline
+from pipeline.validation_cache import validate_section
 from handlers.editor.utils import append_status, remove_highlight, should_show_add_fill_btn
 from handlers.editor.constants import Components, States
 from state.checkpoint_manager import get_section_content, save_section
@@ -65,7 +65,7 @@ def confirm_edit(section, draft, current_log):
     )
     
     # Apelează validarea (blocant) - folosim draft_clean (fără highlight-uri)
-    msg, plan, validation_error = run_validate_pipeline(section, draft_clean)
+    msg, plan, validation_error = validate_section(section, draft_clean)
     final_log, _ = append_status(new_log, f"✅ ({section}) Validation completed.")
     
     # Yield cu rezultatul validării
@@ -0,0 +1,187 @@
+import re
+import gradio as gr
+from dataclasses import replace
+from handlers.editor.regen_presets import REGEN_LEVELS
+from handlers.editor.rewrite import rewrite_validate
+from handlers.editor.utils import append_status, should_show_add_fill_btn
+from state.checkpoint_manager import get_checkpoint
+
+def _chapter_index(section):
+    """'Chapter 3' -> 3; None for any other section (Fills, Expanded Plot, Overview)."""
+    m = re.fullmatch(r"Chapter\s+(\d+)", section or "")
+    return int(m.group(1)) if m else None
+
+def _chapter_description(checkpoint, chapter_index):
+    """Description of the chapter from the saved tokenization, else from the programmatic split (no LLM)."""
+    from llm.overview_tokenizer.cache import get_cached_tokenization
+    from llm.overview_tokenizer.pipeline import split_overview
+
+    chapters = get_cached_tokenization(checkpoint)
+    if not chapters:
+        chapters, _ = split_overview(checkpoint.chapters_overview or "", checkpoint.num_chapters or 0)
+    if chapters and 0 < chapter_index <= len(chapters):
+        return chapters[chapter_index - 1]
+    return None
+
+def editor_regen(section, level, instructions):
+    """
+    Regenerate a whole chapter in place, keeping every other chapter untouched.
+    "From Scratch" writes a new chapter from its description; the preserve levels revise the current text.
+    Returns a dict with success status and text/message.
+    """
+    chapter_index = _chapter_index(section)
+    if chapter_index is None:
+        return {"success": False, "message": "Regen is available only for chapters."}
+
+    checkpoint = get_checkpoint()
+    if checkpoint is None or not checkpoint.chapters_full or chapter_index > len(checkpoint.chapters_full):
+        return {"success": False, "message": f"{section} does not exist in the checkpoint."}
+
+    from state.overall_state import get_current_section_content
+    from llm.chapter_writer import run_chapter_writer
+
+    # Writer-ul folosește chapters_full[:-1] ca istoric → contextul se oprește la capitolul regenerat,
+    # iar capitolele de după rămân neatinse.
+    context = replace(checkpoint, chapters_full=list(checkpoint.chapters_full[:chapter_index]))
+    description = _chapter_description(checkpoint, chapter_index)
+    instructions = (instructions or "").strip()
+    level_instruction = REGEN_LEVELS.get(level, "")
+
+    try:
+        if level_instruction:
+            feedback = level_instruction + (f"\n\nAdditional instructions: {instructions}" if instructions else "")
+            text = run_chapter_writer(
+                context,
+                chapter_index,
+                chapter_description=description,
+                feedback=feedback,
+                previous_output=get_current_section_content(section),
+            )
+        else:
+            if instructions:
+                description = (description or "") + f"\n\nAdditional instructions: {instructions}"
+            text = run_chapter_writer(context, chapter_index, chapter_description=description)
+    except Exception as e:
+        return {"success": False, "message": str(e)}
+
+    if not text or not text.strip():
+        return {"success": False, "message": "The writer returned an empty chapter."}
+    return {"success": True, "text": text}
+
+def regen_handler(section, level, instructions, current_log):
+    """Handle Regen button click - regenerate the chapter and show it in the viewer."""
+    from state.overall_state import get_current_section_content
+    original_text = get_current_section_content(section)
+
+    new_log, status_update = append_status(current_log, f"♻️ ({section}) Regenerating chapter ({level})...")
+
+    # Yield loading state
+    yield (
+        gr.update(visible=True, value="♻️ Regenerating chapter..."),  # viewer_md
+        gr.update(visible=False),  # regen_validate_btn
+        gr.update(visible=False),  # regen_discard_btn
+        gr.update(visible=False),  # regen_force_edit_btn
+        gr.update(visible=False),  # regen_keep_draft_btn
+        gr.update(interactive=False),  # regen_btn
+        status_update,
+        new_log,
+        gr.update(interactive=False),  # mode_radio - non-interactiv în timpul regenerării
+        gr.update(interactive=False),  # section_dropdown
+        gr.update(visible=False),  # add_fill_btn
+    )
+
+    result = editor_regen(section, level, instructions)
+
+    if result.get("success"):
+        final_log, final_status = append_status(new_log, f"✅ ({section}) Regeneration completed. Validate to adapt later chapters.")
+        yield (
+            gr.update(visible=True, value=result["text"]),  # viewer_md
+            gr.update(visible=True),   # regen_validate_btn
+            gr.update(visible=True),   # regen_discard_btn
+            gr.update(visible=True),   # regen_force_edit_btn
+            gr.update(visible=True),   # regen_keep_draft_btn
+            gr.update(interactive=True),  # regen_btn - poate fi apăsat din nou pentru altă variantă
+            final_status,
+            final_log,
+            gr.update(interactive=False),  # mode_radio - blocat cât timp există o regenerare nevalidată
+            gr.update(interactive=False),  # section_dropdown
+            gr.update(visible=False),  # add_fill_btn
+        )
+    else:
+        message = result.get("message", "Regeneration failed.")
+        final_log, final_status = append_status(new_log, f"❌ ({section}) Regeneration failed: {message}")
+        yield (
+            gr.update(visible=True, value=original_text),  # viewer_md
+            gr.update(visible=False),  # regen_validate_btn
+            gr.update(visible=False),  # regen_discard_btn
+            gr.update(visible=False),  # regen_force_edit_btn
+            gr.update(visible=False),  # regen_keep_draft_btn
+            gr.update(interactive=True),  # regen_btn
+            final_status,
+            final_log,
+            gr.update(interactive=True),  # mode_radio
+            gr.update(interactive=True),  # section_dropdown
+            gr.update(visible=should_show_add_fill_btn(section)),  # add_fill_btn
+        )
+
+def regen_discard(section, current_log):
+    """Discard the regenerated chapter - back to draft if exists, else checkpoint."""
+    from state.overall_state import get_current_section_content
+    clean_text = get_current_section_content(section) or "_Empty_"
+
+    new_log, status_update = append_status(current_log, f"🗑️ ({section}) Regeneration discarded.")
+    return (
+        gr.update(visible=True, value=clean_text),  # viewer_md
+        gr.update(visible=False),  # regen_validate_btn
+        gr.update(visible=False),  # regen_discard_btn
+        gr.update(visible=False),  # regen_force_edit_btn
+        gr.update(visible=False),  # regen_keep_draft_btn
+        gr.update(interactive=_chapter_index(section) is not None),  # regen_btn
+        status_update,  # status_strip
+        new_log,  # status_log
+        gr.update(interactive=True),  # mode_radio
+        gr.update(interactive=True),  # section_dropdown
+        gr.update(visible=should_show_add_fill_btn(section)),  # add_fill_btn
+    )
+
+def regen_validate(section, viewer_content, current_log):
+    """Validate the regenerated chapter; impact analysis decides which later chapters need adapting."""
+    yield from rewrite_validate(section, viewer_content, current_log, source="regen")
+
+def continue_edit(section, current_log, viewer_content=None):
+    """Return to Regen Section after validation, keeping the regenerated chapter in the viewer."""
+    from state.overall_state import get_current_section_content
+    new_log, status_update = append_status(current_log, f"🔁 ({section}) Continue editing.")
+    current_content = viewer_content or get_current_section_content(section)
+
+    return (
+        gr.update(visible=False),   # hide Validation Title
+        gr.update(visible=False),   # hide Validation Box
+        gr.update(visible=False),   # hide Validation Section
+        gr.update(visible=False),   # hide Apply Updates
+        gr.update(visible=False),   # hide Regenerate
+        gr.update(visible=False),   # hide Continue Editing
+        gr.update(visible=False),   # hide Discard2
+        gr.update(visible=False),   # hide Validate
+        gr.update(visible=False),   # hide Discard
+        gr.update(visible=False),   # hide Force Edit
+        gr.update(visible=False),   # hide Manual Section
+        gr.update(visible=False),   # hide Rewrite Section
+        gr.update(visible=True, value=current_content),  # show viewer_md with the regenerated chapter
+        gr.update(visible=False),   # hide editor_tb
+        gr.update(value="Regen", interactive=False), # keep Mode locked to Regen
+        gr.update(interactive=False), # keep Section locked
+        status_update,
+        new_log,
+        gr.update(visible=False),   # 17. hide Chat Section
+        gr.update(visible=False),   # 18. status_row (hidden while editing)
+        gr.update(visible=False),   # 19. hide manual keep draft
+        gr.update(visible=False),   # 20. hide Rewrite Keep Draft
+        gr.update(visible=False),   # 21. hide chat keep draft
+        gr.update(visible=False),   # 22. hide view actions row
+        None,  # 23. pending_plan - clear plan when going back
+        gr.update(visible=False),   # 24. btn_undo - hide (not in view mode)
+        gr.update(visible=False),   # 25. btn_redo - hide (not in view mode)
+        gr.update(visible=False),   # 26. add_fill_btn - hide when editing
+        gr.update(interactive=True), # chat_type_dropdown - re-enable
+    )
@@ -0,0 +1,6 @@
+REGEN_LEVELS = {
+    "From Scratch": "",
+    "Preserve Minimum": "Write a new version of this chapter. Keep only the essential plot events required by the chapter description; you are free to change scenes, structure, dialogue, and wording.",
+    "Preserve Medium": "Rewrite this chapter keeping its main scenes and plot events in the same order, but freely change the prose, dialogue, pacing, and the details inside each scene.",
+    "Preserve Majority": "Revise this chapter conservatively: keep most of the existing text, scenes, and dialogue, and change only what is needed to address the instructions and improve weak passages.",
+}
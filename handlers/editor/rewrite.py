@@ -1,5 +1,5 @@
 import gradio as gr
-from pipeline.runner_validate import run_validate_pipeline
+from pipeline.validation_cache import validate_section
 from handlers.editor.rewrite_presets import REWRITE_PRESETS
 from handlers.editor.utils import append_status, replace_text_with_highlight, remove_highlight, format_selected_preview, update_instructions_from_preset, should_show_add_fill_btn
 from handlers.editor.constants import Components, States
@@ -216,10 +216,10 @@ def rewrite_force_edit(section, viewer_content, current_log, create_epoch):
         gr.update(visible=add_fill_visible), # add_fill_btn - show again after force edit
     )
 
-def rewrite_validate(section, viewer_content, current_log):
+def rewrite_validate(section, viewer_content, current_log, source="rewrite"):
     """Validate rewritten text - remove highlight and start validation."""
     draft_clean = remove_highlight(viewer_content)
-    new_log, status_update = append_status(current_log, f"🔍 ({section}) Validation started (from rewrite).")
+    new_log, status_update = append_status(current_log, f"🔍 ({section}) Validation started (from {source}).")
     
     yield (
         "",  # validation_box (Markdown)
@@ -242,7 +242,7 @@ def rewrite_validate(section, viewer_content, current_log):
         gr.update(visible=False) # add_fill_btn - hide during validation
     )
     
-    msg, plan, validation_error = run_validate_pipeline(section, draft_clean)
+    msg, plan, validation_error = validate_section(section, draft_clean)
     final_log, _ = append_status(new_log, f"✅ ({section}) Validation completed.")
     
     apply_interactive = not validation_error
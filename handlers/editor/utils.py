@@ -341,6 +341,9 @@ def keep_draft_handler(section, content, status_log):
         drafts_mgr.add_user_draft(section, clean_content) # Explicitly save as USER draft
         
     drafts_mgr.remove(section, DraftType.CHAT.value) # Remove chat draft if exists, now saved
+
+    from pipeline.validation_cache import schedule_validation
+    schedule_validation(section, clean_content, delay=0) # Validate in background so Validate is instant
     
     msg = f"💾 Saved draft for **{section}**."
     new_log, status_update = append_status(status_log, msg)
@@ -1,17 +1,21 @@
 import gradio as gr
-from pipeline.runner_validate import run_validate_pipeline
+from pipeline.validation_cache import validate_section
 from utils.logger import merge_logs
 from handlers.editor.utils import append_status, remove_highlight, sort_drafts, should_show_add_fill_btn
 from handlers.editor.constants import Components, States
 from state.checkpoint_manager import save_section, get_checkpoint, get_section_content
 from state.drafts_manager import DraftsManager, DraftType
 from state.undo_manager import UndoManager
+from state.settings_manager import settings_manager
 
 _stop_flag = False
 
 def request_stop():
     global _stop_flag
     _stop_flag = True
+    # Pipeline-ul rulează ca job în background; oprim și job-ul, nu doar abonarea UI.
+    from pipeline.jobs import cancel_running_job, JOB_KIND_EDIT
+    cancel_running_job(JOB_KIND_EDIT)
     return gr.update(interactive=False)
 
 def clear_stop():
@@ -78,9 +82,9 @@ def editor_apply(section, draft, plan):
         fill_name = plan.get("fill_name")
         
         if impacted:
-            from pipeline.runner_edit import run_edit_pipeline_stream
+            from pipeline.jobs import edit_job_stream
             
-            for result in run_edit_pipeline_stream(
+            for result in edit_job_stream(
                 edited_section=edited_section,
                 diff_data=diff_data,
                 impact_data=impact_data,
@@ -570,11 +574,50 @@ def draft_accept_selected(current_section, original_selected, generated_selected
         gr.update(visible=add_fill_visible), # 20. add_fill_btn
     )
 
+def _regeneration_progress(pipeline_log, sections):
+    """Split the selected sections into (done, failed, pending) using the edit pipeline's per-section log lines."""
+    done, failed, pending = [], [], []
+    for name in sections:
+        if f"✅ {name} adapted." in pipeline_log:
+            done.append(name)
+        elif f"❌ {name} adaptation failed" in pipeline_log:
+            failed.append(name)
+        else:
+            pending.append(name)
+    return done, failed, pending
+
+def _failed_note(failed):
+    return f"❌ {', '.join(failed)} failed, previous draft kept"
+
+def _regeneration_outputs(panel_visible, original_drafts, generated_drafts, label, status_update, new_log, epoch,
+                          stop_visible, choices, keep_drafts_choices, running):
+    """Yield tuple for draft_regenerate_selected; while running, review actions are locked and nothing is ticked."""
+    actions = gr.update(interactive=not running)
+    return (
+        gr.update(visible=panel_visible),
+        gr.update(choices=original_drafts, value=[] if running else original_drafts, interactive=False), # original_draft_checkbox
+        gr.update(choices=generated_drafts, value=[] if running else generated_drafts, label=label, interactive=not running), # generated_drafts_list
+        status_update,
+        new_log,
+        epoch,
+        gr.update(visible=True), # status_row
+        stop_visible, # stop button
+        choices, # generated_drafts_choices_state
+        keep_drafts_choices, # keep_drafts_choices_state (Persist!)
+        actions, # btn_draft_accept_all
+        actions, # btn_draft_revert
+        actions, # btn_draft_accept_selected
+        actions, # btn_draft_regenerate
+        actions, # select_all_gen_btn
+        actions, # mark_keep_btn
+    )
+
 def draft_regenerate_selected(generated_selected, plan, section, current_log, create_epoch, keep_drafts_choices_state=None):
-    """Regenerate selected sections."""
-    # This is complex. We need to re-run the pipeline for these sections.
-    # We can reuse apply_updates logic but with a filtered plan.
-    
+    """
+    Regenerate selected sections.
+    Selected chapters are rewritten concurrently (Settings → Pipeline → Parallel Draft Regeneration);
+    the review panel stays visible and each draft is listed again as soon as it is ready.
+    """
     keep_drafts_choices = keep_drafts_choices_state or []
 
     if not plan or not isinstance(plan, dict):
@@ -587,14 +630,7 @@ def draft_regenerate_selected(generated_selected, plan, section, current_log, cr
     original_impacted = plan.get("impacted_sections", [])
     filtered_impacted = [s for s in original_impacted if s in generated_selected]
     
-    # Also include the edited section if selected (though usually it's the source)
-    # Actually, if we regenerate, we are regenerating the *impacted* ones based on the *edited* one.
-    # The edited section itself is usually fixed by the user.
-    # If the user selected the edited section to regenerate... well, we can't really "regenerate" the user's manual edit 
-    # unless we treat it as an AI task, but here we assume we are regenerating the *consequences*.
-    
-    # So we just run the pipeline again for the selected impacted sections.
-    
+    # The edited section itself is fixed by the user; we regenerate only the *consequences*.
     # We need to keep the unselected drafts!
     drafts_mgr = DraftsManager()
     
@@ -604,60 +640,51 @@ def draft_regenerate_selected(generated_selected, plan, section, current_log, cr
     new_log, status_update = append_status(current_log, f"🔄 Regenerating {len(filtered_impacted)} sections...")
     
     edited_section = plan.get("edited_section", section)
-    diff_data = plan.get("diff_data", {})
+    # Regenerate means "ask the model again": a locally renamed section would come back identical
+    diff_data = {k: v for k, v in (plan.get("diff_data") or {}).items() if k != "renames"}
     impact_data = plan.get("impact_data", {})
     fill_name = plan.get("fill_name")
+    try:
+        workers = int(settings_manager.get_pipeline_setting("regenerate_parallel_drafts") or 1)
+    except (TypeError, ValueError):
+        workers = 1
     
-    # Prepare initial UI updates
     # Use edited_section as the source of truth for the original draft
-    original_drafts = drafts_mgr.get_original_drafts()
-    generated_drafts = _get_generated_drafts_list(plan, edited_section)
+    all_drafts = _get_generated_drafts_list(plan, edited_section)
+    
+    def _progress_outputs(pipeline_log, status_update, stop_visible):
+        done, failed, pending = _regeneration_progress(pipeline_log, filtered_impacted)
+        ready = [s for s in all_drafts if s not in pending]
+        label = f"AI-Generated Drafts — regenerated {len(done)}/{len(filtered_impacted)}"
+        notes = ([f"⏳ {', '.join(pending)}"] if pending else []) + ([_failed_note(failed)] if failed else [])
+        if notes:
+            label += f" ({'; '.join(notes)})"
+        return _regeneration_outputs(
+            True, DraftsManager().get_original_drafts(), ready, label, status_update, new_log, current_epoch,
+            stop_visible, ready, keep_drafts_choices, running=True,
+        )
     
-    yield (
-        gr.update(visible=False), # Hide draft panel during regen
-        gr.update(choices=original_drafts, value=original_drafts), # original_draft_checkbox
-        gr.update(choices=generated_drafts, value=generated_drafts), # generated_drafts_list
-        status_update,
-        new_log,
-        current_epoch,
-        gr.update(visible=True), # status_row
-        gr.update(visible=True, interactive=True), # Show and ENABLE stop button
-        generated_drafts, # generated_drafts_choices_state
-        keep_drafts_choices # keep_drafts_choices_state (Persist!)
-    )
+    yield _progress_outputs("", status_update, gr.update(visible=True, interactive=True)) # Show and ENABLE stop button
+    pipeline_log = ""
     
-    from pipeline.runner_edit import run_edit_pipeline_stream
+    from pipeline.jobs import edit_job_stream
     
-    for result in run_edit_pipeline_stream(
+    for result in edit_job_stream(
         edited_section=edited_section,
         diff_data=diff_data,
         impact_data=impact_data,
         impacted_sections=filtered_impacted,
         fill_name=fill_name,
+        parallel_chapters=max(1, workers),
     ):
         if isinstance(result, tuple) and len(result) >= 9:
             expanded_plot, chapters_overview, chapters_full, current_text, dropdown, counter, status_log_text, validation_text, pipeline_drafts = result
             
+            pipeline_log = status_log_text or ""
             new_log = merge_logs(base_log, status_log_text)
             current_epoch += 1
             
-            # Update generated drafts list from plan (includes all impacted, even if not generated yet)
-            current_mgr = DraftsManager()
-            original_drafts = current_mgr.get_original_drafts()
-            generated_drafts = _get_generated_drafts_list(plan, edited_section)
-            
-            yield (
-                gr.update(visible=False),
-                gr.update(choices=original_drafts, value=original_drafts), # original_draft_checkbox
-                gr.update(choices=generated_drafts, value=generated_drafts), # generated_drafts_list
-                gr.update(value=new_log, visible=True),
-                new_log,
-                current_epoch,
-                gr.update(visible=True), # status_row
-                gr.update(visible=True), # Keep stop button visible
-                generated_drafts, # generated_drafts_choices_state
-                keep_drafts_choices # keep_drafts_choices_state (Persist!)
-            )
+            yield _progress_outputs(status_log_text or "", gr.update(value=new_log, visible=True), gr.update(visible=True))
             
             # Check stop after processing and saving results
             if should_stop():
@@ -672,22 +699,15 @@ def draft_regenerate_selected(generated_selected, plan, section, current_log, cr
          # No redundant "Regeneration complete" message, as pipeline already logs completion
          pass
     
-    # Final update - show panel again
-    current_mgr = DraftsManager()
-    original_drafts = current_mgr.get_original_drafts()
-    generated_drafts = _get_generated_drafts_list(plan, edited_section)
-
-    yield (
-        gr.update(visible=True), # Show panel again
-        gr.update(choices=original_drafts, value=original_drafts), # original_draft_checkbox
-        gr.update(choices=generated_drafts, value=generated_drafts), # generated_drafts_list
-        status_update,
-        new_log,
-        current_epoch,
-        gr.update(visible=True), # status_row
-        gr.update(visible=False), # Hide stop button
-        generated_drafts, # generated_drafts_choices_state
-        keep_drafts_choices # keep_drafts_choices_state (Persist!)
+    # Final update - unlock the panel; drafts that were not regenerated keep their previous version
+    label = "AI-Generated Drafts"
+    _, failed, _ = _regeneration_progress(pipeline_log, filtered_impacted)
+    if failed:
+        label += f" ({_failed_note(failed)})"
+        new_log, status_update = append_status(new_log, _failed_note(failed) + ".")
+    yield _regeneration_outputs(
+        True, DraftsManager().get_original_drafts(), all_drafts, label, status_update, new_log,
+        current_epoch, gr.update(visible=False), all_drafts, keep_drafts_choices, running=False,
     )
 
 def discard_from_validate(section, current_log):
@@ -852,7 +872,7 @@ def regenerate_dispatcher(section, text_to_validate, current_log):
     )
     
     # 2. Run Validation Logic
-    msg, plan, validation_error = run_validate_pipeline(section, text_to_validate)
+    msg, plan, validation_error = validate_section(section, text_to_validate)
     final_log, final_status = append_status(new_log, f"✅ ({section}) Validation completed.")
     
     # 3. Common "Done" State
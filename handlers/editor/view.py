@@ -92,7 +92,7 @@ def force_edit_draft_handler(section, status_log, create_sections_epoch):
 
 def validate_draft_handler(section, current_log):
     """Trigger validation using the USER draft content from View mode."""
-    from pipeline.runner_validate import run_validate_pipeline
+    from pipeline.validation_cache import validate_section
     
     from state.drafts_manager import DraftType
     
@@ -132,7 +132,7 @@ def validate_draft_handler(section, current_log):
     )
 
     # Run validation
-    msg, plan, validation_error = run_validate_pipeline(section, draft_content)
+    msg, plan, validation_error = validate_section(section, draft_content)
     final_log, final_status = append_status(new_log, f"✅ ({section}) Validation completed.")
     
     # Preparation for Validation Box
@@ -4,7 +4,8 @@ from .llm_tasks import (
     LLM_TASK_DEFAULTS,
     get_task_defaults,
     get_all_llm_tasks,
-    REASONING_EFFORT_OPTIONS
+    REASONING_EFFORT_OPTIONS,
+    CASCADE_TASKS
 )
 from .image_tasks import IMAGE_TASKS
 from .model import (
@@ -15,3 +16,9 @@ from .model import (
     IMAGE_PROVIDERS
 )
 from .providers import PROVIDER_CAPABILITIES
+from .pipeline_options import (
+    PipelineOption,
+    PIPELINE_OPTIONS,
+    get_pipeline_defaults,
+    get_pipeline_option,
+)
@@ -39,6 +39,14 @@ class TaskDefaults:
     retries: int = 3
 
 
+# Validators that can run a cascade: a cheap first-pass model, escalating to the task model when unsure.
+CASCADE_TASKS = [
+    LLMTaskName.CHAPTER_VALIDATOR.value,
+    LLMTaskName.OVERVIEW_VALIDATOR.value,
+    LLMTaskName.OVERVIEW_VALIDATOR_AFTER_EDIT.value,
+]
+
+
 REASONING_EFFORT_OPTIONS = [
     "Very High",
     "High",
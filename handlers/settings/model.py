@@ -13,6 +13,9 @@ class Model:
     api_key: str
     reasoning: bool = False
     is_default: bool = False
+    # Prețuri în USD per 1M token-uri (0 = gratuit / local); folosite de estimatorul de cost.
+    input_price: float = 0.0
+    output_price: float = 0.0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert model to dictionary for JSON serialization."""
@@ -30,7 +33,9 @@ class Model:
             url=data.get("url", ""),
             api_key=data.get("api_key", ""),
             reasoning=data.get("reasoning", False),
-            is_default=data.get("is_default", False)
+            is_default=data.get("is_default", False),
+            input_price=float(data.get("input_price", 0.0) or 0.0),
+            output_price=float(data.get("output_price", 0.0) or 0.0)
         )
     
     def get(self, key: str, default: Any = None) -> Any:
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class PipelineOption:
+    technical_name: str
+    display_name: str
+    default: Any
+    description: str = ""
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+
+PIPELINE_OPTIONS: List[PipelineOption] = [
+    PipelineOption(
+        "chapter_prechecks", "Chapter Pre-checks", True,
+        "Run fast local checks (error text, heading, length, duplication) before the LLM chapter validator. "
+        "Chapters that fail go straight to revision with the exact reason.",
+    ),
+    PipelineOption(
+        "chapter_precheck_skip_llm", "Skip LLM Validator on Strict Pass", False,
+        "Accept chapters that pass the strict pre-checks without calling the LLM chapter validator.",
+    ),
+    PipelineOption(
+        "chapter_precheck_min_word_ratio", "Minimum Word Ratio", 0.5,
+        "A chapter shorter than this fraction of the word target fails the pre-checks.",
+        minimum=0.0, maximum=1.0,
+    ),
+    PipelineOption(
+        "chapter_best_of_n", "Best-of-N Chapter Candidates", 1,
+        "Write this many candidates for each chapter (and each revision) in parallel, score them with the "
+        "pre-checks and the chapter validator, and keep the best one. 1 disables best-of-N.",
+        minimum=1, maximum=5,
+    ),
+    PipelineOption(
+        "chapter_best_of_n_temperature_spread", "Best-of-N Temperature Spread", 0.2,
+        "Candidates are written at the chapter writer temperature ± this spread.",
+        minimum=0.0, maximum=1.0,
+    ),
+    PipelineOption(
+        "speculative_overview_steps", "Speculative Tokenization & Chapter 1", True,
+        "While the overview is being validated, tokenize it and write chapter 1 in parallel. "
+        "The results are discarded (and their tokens wasted) if validation changes the overview.",
+    ),
+    PipelineOption(
+        "chapter_segment_words", "Segmented Writing: Words per Segment", 0,
+        "Write new chapters whose word target (pages per chapter × 500) clearly exceeds this size in "
+        "consecutive segments: a short beat plan, then one call per beat continuing from the previous one. "
+        "Chapter length is then no longer capped by the writer's max tokens. 0 disables segmented writing.",
+        minimum=0, maximum=10000,
+    ),
+    PipelineOption(
+        "chapter_parallel_scenes", "Experimental: Parallel Scenes", 0,
+        "Plan each new chapter as this many scenes (with an opening and closing state each), write the scenes "
+        "concurrently and stitch them with a short transition pass. Useful on backends that serve several "
+        "requests at once. 0 or 1 disables it; if planning fails the chapter is written in one call.",
+        minimum=0, maximum=8,
+    ),
+    PipelineOption(
+        "chapter_local_revision", "Localized Chapter Revision", False,
+        "The chapter validator quotes the passages it objects to; a failed chapter is then fixed by rewriting only "
+        "those paragraphs and splicing them back in. Falls back to a full revision when the issues cannot be anchored.",
+    ),
+    PipelineOption(
+        "edit_parallel_chapters", "Parallel Chapter Adaptation", 1,
+        "After an edit, adapt up to this many impacted chapters at the same time (once the Expanded Plot and "
+        "Chapters Overview are adapted). Each chapter then sees the earlier chapters as they were before "
+        "adaptation. 1 adapts them one by one.",
+        minimum=1, maximum=8,
+    ),
+    PipelineOption(
+        "edit_patch_operations", "Patch-based Edits", True,
+        "Let the chapter editor and the chat editor answer local changes (renames, a few sentences) with anchored "
+        "find/replace and insert-after operations instead of the whole text. Anchors are checked before applying; "
+        "if one does not match, the full text is requested instead.",
+    ),
+    PipelineOption(
+        "version_diff_prepass", "Local Diff Pre-pass", True,
+        "Compare the versions locally before validating an edit: whitespace, punctuation and capitalization-only "
+        "edits are accepted without an LLM call, and otherwise only the changed passages (with one paragraph of "
+        "context) are sent to the version diff instead of both full versions.",
+    ),
+    PipelineOption(
+        "rename_fast_path", "Zero-LLM Rename Fast Path", True,
+        "When an edit only renames names (e.g. \"Robert\" → \"Michael\", every occurrence), build the update plan "
+        "locally and rename the other sections with a whole-word replacement. Sections where the replacement is "
+        "ambiguous (the name is also a common word, or the new name already appears) are adapted by the LLM.",
+    ),
+    PipelineOption(
+        "impact_prefilter_margin", "Impact Pre-filter: Safety Margin", 2,
+        "Before impact analysis, rank the candidate chapters with a local word / named-entity index against the "
+        "terms changed by the edit and send only the relevant ones, plus this many chapters right after the edit. "
+        "-1 sends every candidate chapter.",
+        minimum=-1, maximum=20,
+    ),
+    PipelineOption(
+        "impact_shard_chapters", "Impact Analysis: Chapters per Shard", 10,
+        "When an edit has more candidate chapters than this, impact analysis runs as shards: Expanded Plot and "
+        "Chapters Overview first, then batches of this many chapters in parallel (each with the Chapters Overview "
+        "as compact context), merged into one plan. 0 always uses a single call.",
+        minimum=0, maximum=50,
+    ),
+    PipelineOption(
+        "regenerate_parallel_drafts", "Parallel Draft Regeneration", 4,
+        "Regenerate Selected (Draft Review) rewrites up to this many selected chapters at the same time, after the "
+        "Expanded Plot and Chapters Overview if those are selected too. Each draft shows up in the review list as "
+        "soon as it is ready. 1 regenerates them one by one.",
+        minimum=1, maximum=8,
+    ),
+    PipelineOption(
+        "speculative_validation", "Speculative Validation", False,
+        "Validate a draft in the background as soon as it is kept (Keep Draft), or once a chat edit has been left "
+        "unchanged for a few seconds. Pressing Validate then shows the result instantly if neither the draft nor "
+        "the rest of the book changed meanwhile. Spends tokens on drafts that may never be validated.",
+    ),
+    PipelineOption(
+        "validator_cascade_min_confidence", "Validator Cascade: Minimum Confidence", 70,
+        "Validators with a Cascade Model (Settings → Tasks) ask that model first. Its verdict is accepted when it "
+        "is well-formed and its self-reported confidence is at least this value; otherwise the task's own model decides.",
+        minimum=0, maximum=100,
+    ),
+]
+
+
+def get_pipeline_defaults() -> Dict[str, Any]:
+    """Default values for all pipeline options, keyed by technical name."""
+    return {option.technical_name: option.default for option in PIPELINE_OPTIONS}
+
+
+def get_pipeline_option(technical_name: str) -> Optional[PipelineOption]:
+    for option in PIPELINE_OPTIONS:
+        if option.technical_name == technical_name:
+            return option
+    return None
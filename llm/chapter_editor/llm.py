@@ -10,6 +10,7 @@ import json
 from typing import List, Optional
 from provider import provider_manager
 from utils.json_utils import extract_json_from_response
+from utils.edit_ops import EDIT_OPERATIONS_FORMAT, EditOperationError, apply_edit_operations
 from state.settings_manager import settings_manager
 
 _EDIT_CHAPTER_PROMPT = textwrap.dedent("""\
@@ -97,6 +98,11 @@ Specific Instructions:
 7. Target length: approximately the same as the original chapter (±10%).
 {infill_rules}
 
+{output_format}
+""").strip()
+
+
+_FULL_OUTPUT_FORMAT = textwrap.dedent("""\
 You must output a JSON object with the following structure:
 {{
   "is_breaking_change": true/false,
@@ -108,6 +114,34 @@ CRITICAL: The "adapted_chapter" field MUST contain the FULL chapter text, not ju
 Output ONLY the JSON object, no other text or explanations.
 """).strip()
 
+_PATCH_OUTPUT_FORMAT = textwrap.dedent("""\
+You must output a JSON object with the following structure:
+{{
+  "is_breaking_change": true/false,
+  "operations": [ ... ] or null,
+  "adapted_chapter": "the COMPLETE adapted Chapter {chapter_number} text" or null
+}}
+
+Choose ONE of the two forms:
+- LOCAL change (renames, a few sentences or paragraphs to adjust): return "operations" and set "adapted_chapter" to null.
+- STRUCTURAL change (events reordered, scenes added or removed, large parts rewritten): set "operations" to null and return the FULL chapter in "adapted_chapter" — never a partial text.
+
+{operations_format}
+
+Output ONLY the JSON object, no other text or explanations.
+""").strip()
+
+_PATCH_RETRY_MESSAGE = (
+    "Your operations could not be applied to the original chapter ({error}). "
+    "Return the same JSON object with \"operations\": null and the COMPLETE adapted chapter in \"adapted_chapter\"."
+)
+
+
+def _output_format(chapter_index: int) -> str:
+    if settings_manager.get_pipeline_setting("edit_patch_operations"):
+        return _PATCH_OUTPUT_FORMAT.format(chapter_number=chapter_index, operations_format=EDIT_OPERATIONS_FORMAT)
+    return _FULL_OUTPUT_FORMAT.format(chapter_number=chapter_index)
+
 
 def _join_previous_chapters(previous_texts: Optional[List[str]]) -> str:
     if not previous_texts:
@@ -139,6 +173,8 @@ def call_llm_edit_chapter(
     """
     Editează un capitol bazat pe impact și diff.
     AI-ul determină dacă e breaking change și adaptează în consecință.
+    Cu patch-uri activate (Settings → Pipeline), o schimbare locală vine ca operații ancorate,
+    aplicate local pe original_chapter; dacă o ancoră nu se verifică, se cere capitolul complet.
     """
     prev_joined = _join_previous_chapters(previous_chapters or [])
 
@@ -165,6 +201,7 @@ def call_llm_edit_chapter(
         genre=genre or "unspecified",
         chapter_number=chapter_index,
         infill_rules=infill_rules,
+        output_format=_output_format(chapter_index),
     )
     
     messages = [
@@ -197,12 +234,27 @@ def call_llm_edit_chapter(
         # Parse JSON response (suportă atât JSON pur cât și wrappat în tag-uri)
         try:
             result = extract_json_from_response(content)
-            return result.get("adapted_chapter", content)
         except (json.JSONDecodeError, ValueError):
             if attempt < retries:
                 continue
             return content
 
+        operations = result.get("operations")
+        if operations and not result.get("adapted_chapter"):
+            try:
+                return apply_edit_operations(original_chapter or "", operations)
+            except EditOperationError as e:
+                last_error = str(e)
+                if attempt < retries:
+                    # ancoră neverificată → aceeași conversație, cerem capitolul complet
+                    messages = messages[:2] + [
+                        {"role": "assistant", "content": content},
+                        {"role": "user", "content": _PATCH_RETRY_MESSAGE.format(error=last_error)},
+                    ]
+                    continue
+                return f"Error during chapter editing: {last_error}"
+        return result.get("adapted_chapter") or content
+
     return last_content or f"Error during chapter editing: {last_error or 'Unknown error'}"
 
 
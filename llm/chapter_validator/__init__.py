@@ -1,2 +1,3 @@
-from .llm import call_llm_validate_chapter
+from .llm import call_llm_validate_chapter, parse_validation_issues
 from .pipeline import run_chapter_validator
+from .prechecks import run_chapter_prechecks, PRECHECK_FAIL, PRECHECK_PASS, PRECHECK_UNSURE
@@ -6,9 +6,10 @@ apelează modelul, și întoarce (result, details).
 """
 
 
+import re
 import textwrap
-from typing import List, Tuple
-from provider import provider_manager
+from typing import Dict, List, Tuple
+from provider.cascade import get_validator_response
 from state.settings_manager import settings_manager
 
 
@@ -55,9 +56,25 @@ RESULT: NOT OK
 SUGGESTIONS:
 - bullet-point list of fixes.
 
-Keep the response concise and formatted exactly like shown above.
+Keep the response concise and formatted exactly like shown above.{anchors_instruction}
 """).strip()
 
+_ANCHORS_INSTRUCTION = textwrap.dedent("""
+
+
+When the result is NOT OK and the problems are confined to specific passages, add after SUGGESTIONS:
+
+ISSUES:
+- QUOTE: "a short sentence copied verbatim from the current chapter, inside the passage to fix"
+  FIX: what must change in that passage
+
+Use one entry per passage. Omit ISSUES when the problem concerns the chapter as a whole (structure, missing events, wrong direction).""")
+
+_ISSUE_RE = re.compile(
+    r"^\s*[-*]?\s*QUOTE\s*:\s*[\"“']?(?P<quote>.+?)[\"”']?\s*$\s*^\s*FIX\s*:\s*(?P<fix>.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
 
 def _summarize_previous(previous_texts: List[str], max_chars: int = 1200) -> str:
     if not previous_texts:
@@ -74,6 +91,30 @@ def _summarize_previous(previous_texts: List[str], max_chars: int = 1200) -> str
     return "\n".join(snippets) if snippets else "None"
 
 
+def parse_validation_issues(details: str) -> List[Dict[str, str]]:
+    """
+    Extrage din feedback-ul validatorului lista ISSUES: [{"quote": ..., "fix": ...}].
+    Listă goală dacă validatorul nu a ancorat problemele (sau feedback-ul vine din pre-check-uri).
+    """
+    _, found, block = (details or "").partition("ISSUES:")
+    if not found:
+        return []
+    return [
+        {"quote": m.group("quote").strip(), "fix": m.group("fix").strip()}
+        for m in _ISSUE_RE.finditer(block)
+        if m.group("quote").strip()
+    ]
+
+
+def _is_decisive(content: str) -> bool:
+    """Verdict clar pentru cascadă: exact unul din RESULT: OK / RESULT: NOT OK (NOT OK cu sugestii)."""
+    up = (content or "").upper()
+    is_ok, is_not_ok = "RESULT: OK" in up, "RESULT: NOT OK" in up
+    if is_ok == is_not_ok:
+        return False
+    return is_ok or "SUGGESTIONS" in up
+
+
 def call_llm_validate_chapter(
     expanded_plot: str,
     chapters_overview: str,
@@ -82,6 +123,7 @@ def call_llm_validate_chapter(
     current_index: int,
     genre: str,
     *,
+    with_anchors: bool = False,
     api_url: str = None,
     model_name: str = None,
     timeout: int = 300,
@@ -92,6 +134,7 @@ def call_llm_validate_chapter(
       ("NOT OK", details)    – când trebuie corectat
       ("UNKNOWN", raw)       – dacă formatul nu e recunoscut
       ("ERROR", message)     – dacă a eșuat requestul
+    with_anchors: cere și secțiunea ISSUES (citate exacte + fix) pentru revizia localizată.
     """
 
     previous_summary = _summarize_previous(previous_chapters or [])
@@ -104,6 +147,7 @@ def call_llm_validate_chapter(
         current_chapter=current_chapter or "",
         chapter_number=current_index,
         genre=genre or "unspecified",
+        anchors_instruction=_ANCHORS_INSTRUCTION if with_anchors else "",
     )
 
     messages = [
@@ -122,10 +166,7 @@ def call_llm_validate_chapter(
 
     for attempt in range(retries + 1):
         try:
-            content = provider_manager.get_llm_response(
-                task_name="chapter_validator",
-                messages=messages
-            )
+            content = get_validator_response("chapter_validator", messages, _is_decisive)
             last_content = content
         except Exception as e:
             last_error = str(e)
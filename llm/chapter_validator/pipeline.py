@@ -7,6 +7,7 @@ Nu modifică `context`; întoarce (result, details) iar runner-ul decide ce face
 
 from typing import Tuple
 from state.pipeline_context import PipelineContext
+from state.settings_manager import settings_manager
 from .llm import call_llm_validate_chapter
 
 def run_chapter_validator(
@@ -26,4 +27,5 @@ def run_chapter_validator(
         current_chapter=current_text or "",
         current_index=chapter_index,
         genre=context.genre or "",
+        with_anchors=bool(settings_manager.get_pipeline_setting("chapter_local_revision")),
     )
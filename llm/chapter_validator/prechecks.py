@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+# llm/chapter_validator/prechecks.py
+"""
+Verificări locale (fără LLM) pentru un capitol, rulate înaintea validatorului LLM.
+
+Întoarce unul din:
+  ("FAIL", motiv)   – capitol clar stricat → direct la revizie, cu motivul exact
+  ("PASS", detalii) – a trecut verificările stricte (validatorul LLM poate fi sărit)
+  ("UNSURE", detalii) – nimic evident greșit, dar nici suficient pentru a sări LLM-ul
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from state.pipeline_context import PipelineContext
+from llm.chapter_writer.llm import word_target_range
+
+PRECHECK_FAIL = "FAIL"
+PRECHECK_PASS = "PASS"
+PRECHECK_UNSURE = "UNSURE"
+
+_ERROR_PREFIXES = (
+    "error during chapter generation",
+    "error during chapter revision",
+    "error: model returned empty content",
+    "error:",
+)
+_MIN_DUPLICATE_PARAGRAPH_CHARS = 80
+_MAX_DUPLICATE_RATIO = 0.15
+_STRICT_MAX_WORD_RATIO = 1.6
+
+
+def _clean_title(text: str) -> str:
+    text = re.sub(r"^#+\s*", "", (text or "").strip())
+    text = re.sub(r"^chapter\s+\d+\s*[:.\-–—]?\s*", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"[*_`\"“”'‘’]", "", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _normalize_title(text: str) -> str:
+    return _clean_title(text).lower()
+
+
+_CHAPTER_PREFIX = re.compile(r"^chapter\s+\d+\b\s*", re.IGNORECASE)
+_TITLE_SEPARATOR = re.compile(r"^[:.\-–—]\s*")
+_EMPHASIZED = re.compile(r"^(\*{1,2}|_|[\"“‘'])(.+?)(\*{1,2}|_|[\"”’'])")
+_TITLE_END = re.compile(r"\s+[—–-]\s+|\*\*description", re.IGNORECASE)
+_MAX_TITLE_WORDS = 12
+
+
+def _leading_title(text: str) -> Optional[str]:
+    """Titlul de la începutul textului: porțiunea evidențiată (*Title*, "Title") sau textul până la ' — '."""
+    text = text.strip()
+    emphasized = _EMPHASIZED.match(text)
+    title = emphasized.group(2) if emphasized else _TITLE_END.split(text, 1)[0]
+    title = _clean_title(title)
+    return title if title and len(title.split()) <= _MAX_TITLE_WORDS else None
+
+
+def _after_separator(text: str) -> Optional[str]:
+    """Titlul de după 'Chapter N' — doar dacă urmează un separator recunoscut (':', '.', '-', '–', '—')."""
+    separator = _TITLE_SEPARATOR.match(text)
+    return _leading_title(text[separator.end():]) if separator else None
+
+
+def expected_title(chapter_description: Optional[str]) -> Optional[str]:
+    """
+    Titlul capitolului, din prima linie a descrierii tokenizate. Forme recunoscute:
+    '#### Chapter 3: *Title*', '#### Title', '**Chapter 3 – Title** — ...', 'Chapter 3: Title'.
+    Orice altceva (ex: 'Chapter 3 The Broken Gate: Mara finds...') → None (verdict UNSURE, nu FAIL).
+    """
+    line = next((l.strip() for l in (chapter_description or "").splitlines() if l.strip()), "")
+    is_heading = line.startswith("#")
+    text = re.sub(r"^#+\s*", "", line)
+
+    bold = re.match(r"^\*\*(.+?)\*\*(.*)$", text)
+    if bold:
+        inner, rest = bold.group(1).strip(), bold.group(2)
+        if inner.lower().startswith("description"):
+            return None
+        prefix = _CHAPTER_PREFIX.match(inner)
+        if not prefix:
+            return _leading_title(inner)
+        if inner[prefix.end():]:
+            return _after_separator(inner[prefix.end():])
+        return _after_separator(rest.strip())  # '**Chapter 3**: Title'
+
+    prefix = _CHAPTER_PREFIX.match(text)
+    if prefix:
+        return _after_separator(text[prefix.end():])
+    if is_heading:
+        return _leading_title(text)
+    return None
+
+
+def _heading(chapter_text: str) -> Optional[str]:
+    for line in chapter_text.splitlines():
+        if line.strip():
+            return line.strip() if line.lstrip().startswith("#") else None
+    return None
+
+
+def _paragraphs(text: str) -> List[str]:
+    return [re.sub(r"\s+", " ", p).strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+
+
+def _duplicated_ratio(chapter_text: str, previous_chapters: List[str]) -> float:
+    """Fracția (în caractere) din paragrafele lungi care se repetă în capitol sau apar într-un capitol anterior."""
+    paragraphs = [p for p in _paragraphs(chapter_text) if len(p) >= _MIN_DUPLICATE_PARAGRAPH_CHARS]
+    if not paragraphs:
+        return 0.0
+    seen_before = set()
+    for previous in previous_chapters or []:
+        seen_before.update(p for p in _paragraphs(previous) if len(p) >= _MIN_DUPLICATE_PARAGRAPH_CHARS)
+    seen, duplicated = set(), 0
+    for p in paragraphs:
+        if p in seen or p in seen_before:
+            duplicated += len(p)
+        seen.add(p)
+    return duplicated / sum(len(p) for p in paragraphs)
+
+
+def _fail(issues: List[str]) -> Tuple[str, str]:
+    """Același format ca validatorul LLM, ca feedback-ul să poată merge direct în revizie."""
+    return PRECHECK_FAIL, "RESULT: NOT OK\nSUGGESTIONS:\n" + "\n".join(f"- {issue}" for issue in issues)
+
+
+def run_chapter_prechecks(
+    context: PipelineContext,
+    chapter_index: int,
+    chapter_description: Optional[str] = None,
+    min_word_ratio: float = 0.5,
+) -> Tuple[str, str]:
+    """Verifică local capitolul `chapter_index` (1-based)."""
+    chapters = context.chapters_full or []
+    text = chapters[chapter_index - 1] if 0 < chapter_index <= len(chapters) else ""
+    stripped = (text or "").strip()
+
+    if not stripped:
+        return _fail(["The chapter is empty. Write the full chapter."])
+    lowered = stripped[:200].lower()
+    if any(lowered.startswith(prefix) for prefix in _ERROR_PREFIXES):
+        return _fail([f"The stored chapter text is an error message, not prose: “{stripped[:160]}”. Write the full chapter."])
+
+    issues = []
+    strict = True
+
+    heading = _heading(stripped)
+    title = expected_title(chapter_description)
+    if heading is None:
+        issues.append("The chapter must start with its title as a Markdown H2 heading (`## <Title>`).")
+    elif title:
+        got, wanted = _normalize_title(heading), title.lower()
+        if got != wanted and wanted not in got:
+            issues.append(f"The chapter heading “{heading.lstrip('#').strip()}” does not match the required title “{title}”. Use the title exactly as written in the chapter description.")
+    else:
+        strict = False  # nu avem titlul așteptat → nu putem confirma
+
+    words = len(stripped.split())
+    low, high = word_target_range(context.anpc)
+    target = (low + high) // 2
+    if words < int(low * min_word_ratio):
+        issues.append(f"The chapter has only {words} words; the target is about {target} words. Expand it to full length.")
+    elif words < low or words > high * _STRICT_MAX_WORD_RATIO:
+        strict = False
+
+    ratio = _duplicated_ratio(stripped, chapters[:max(0, chapter_index - 1)])
+    if ratio > _MAX_DUPLICATE_RATIO:
+        issues.append(f"About {ratio:.0%} of the chapter repeats paragraphs verbatim (within the chapter or from previous chapters). Remove the duplicated passages and replace them with new content.")
+    elif ratio > 0:
+        strict = False
+
+    if issues:
+        return _fail(issues)
+    if strict:
+        return PRECHECK_PASS, f"Pre-checks passed: heading matches, {words} words (target {low}–{high}), no duplicated passages."
+    return PRECHECK_UNSURE, f"Pre-checks found no blocking issues ({words} words)."
@@ -1,2 +1,2 @@
 from .llm import call_llm_generate_chapter, call_llm_revise_chapter
-from .pipeline import run_chapter_writer
+from .pipeline import run_chapter_writer, chapter_segment_count, chapter_scene_count, write_chapter_scenes, revise_chapter_passages
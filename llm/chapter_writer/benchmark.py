@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+# llm/chapter_writer/benchmark.py
+"""
+Compară scrierea unui capitol într-un singur apel (`call_llm_generate_chapter`) cu modul
+experimental pe scene în paralel: latență, număr de cuvinte și rata de trecere la validatorul LLM.
+
+Capitolele sunt rescrise pe contextul unui proiect salvat (capitolele anterioare rămân cele din
+proiect); nimic nu este salvat. Apelurile LLM sunt reale — pentru repetare fără cost, rulați o dată
+cu PLOTKING_RECORD=cale.jsonl.gz și apoi cu PLOTKING_REPLAY=cale.jsonl.gz.
+
+    python -m llm.chapter_writer.benchmark projects/NAME.json [--chapters 1,2] [--scenes 3] [--runs 1]
+"""
+
+import sys
+import json
+import time
+import argparse
+from dataclasses import replace
+from statistics import mean
+
+from state.pipeline_context import PipelineContext
+from state import llm_cassette
+from llm.chapter_validator import run_chapter_validator
+from llm.overview_tokenizer.cache import get_cached_tokenization
+from llm.overview_tokenizer.pipeline import split_overview
+from .llm import call_llm_generate_chapter
+from .pipeline import write_chapter_scenes
+
+
+def _load_context(path: str) -> PipelineContext:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    tokenized = data.get("tokenized_overview") or {}
+    return PipelineContext(
+        plot=data.get("plot_refined") or data.get("plot_original") or "",
+        expanded_plot=data.get("expanded_plot") or "",
+        chapters_overview=data.get("chapters_overview") or "",
+        chapters_full=list(data.get("chapters") or []),
+        genre=data.get("genre") or "",
+        anpc=int(data.get("avg_pages_per_chapter") or 0),
+        num_chapters=int(data.get("num_chapters") or 0),
+        tokenized_overview=tokenized.get("chapters") if isinstance(tokenized, dict) else None,
+        tokenized_overview_hash=tokenized.get("hash") if isinstance(tokenized, dict) else None,
+    )
+
+
+def _descriptions(context: PipelineContext):
+    chapters = get_cached_tokenization(context)
+    if not chapters:
+        chapters, _ = split_overview(context.chapters_overview or "", context.num_chapters)
+    return chapters or []
+
+
+def _single(context: PipelineContext, chapter_index: int, description):
+    return call_llm_generate_chapter(
+        expanded_plot=context.expanded_plot or "",
+        chapters_overview=context.chapters_overview or "",
+        chapter_index=chapter_index,
+        previous_chapters=context.chapters_full[:chapter_index - 1],
+        chapter_description=description,
+        genre=context.genre,
+        anpc=context.anpc,
+    )
+
+
+def _scenes(scenes: int):
+    def _write(context: PipelineContext, chapter_index: int, description):
+        # writer-ul folosește chapters_full[:-1] ca istoric: același istoric ca _single, plus locul capitolului scris
+        trial = replace(context, chapters_full=list(context.chapters_full[:chapter_index - 1]) + [""])
+        return write_chapter_scenes(trial, chapter_index, scenes, chapter_description=description)
+    return _write
+
+
+def _measure(name, writer, context, chapter_index, description, runs, verbose):
+    rows = []
+    for run in range(runs):
+        started = time.perf_counter()
+        text = writer(context, chapter_index, description)
+        elapsed = time.perf_counter() - started
+        if not text:
+            rows.append({"elapsed": elapsed, "words": 0, "result": "FAILED"})
+        else:
+            trial = replace(context, chapters_full=list(context.chapters_full[:chapter_index - 1]) + [text])
+            result, _ = run_chapter_validator(trial, chapter_index)
+            rows.append({"elapsed": elapsed, "words": len(text.split()), "result": result})
+        if verbose:
+            r = rows[-1]
+            print(f"  Chapter {chapter_index} [{name} #{run + 1}]: {r['elapsed']:.1f}s, {r['words']} words, {r['result']}")
+    return rows
+
+
+def _summary(name, rows) -> str:
+    if not rows:
+        return f"{name}: no runs"
+    passed = sum(r["result"] == "OK" for r in rows)
+    return (f"{name}: {mean(r['elapsed'] for r in rows):.1f}s mean latency, "
+            f"{mean(r['words'] for r in rows):.0f} words, validator pass {passed}/{len(rows)} ({passed / len(rows):.0%})")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark single-call vs parallel-scene chapter writing.")
+    parser.add_argument("project", help="Project JSON file (projects/NAME.json).")
+    parser.add_argument("--chapters", default="1", help="Comma-separated chapter numbers to rewrite (default: 1).")
+    parser.add_argument("--scenes", type=int, default=3, help="Scenes per chapter for the parallel mode.")
+    parser.add_argument("--runs", type=int, default=1, help="Runs per chapter and mode.")
+    parser.add_argument("--verbose", action="store_true", help="Print every run.")
+    args = parser.parse_args(argv)
+
+    llm_cassette.configure_from_env()
+    context = _load_context(args.project)
+    if not context.chapters_overview:
+        print(f"{args.project} has no chapters overview.")
+        return 1
+    descriptions = _descriptions(context)
+    chapters = [int(c) for c in args.chapters.split(",") if c.strip()]
+    chapters = [c for c in chapters if 0 < c <= max(context.num_chapters, 1) and c - 1 <= len(context.chapters_full)]
+    if not chapters:
+        print("No valid chapters to benchmark (earlier chapters must exist in the project).")
+        return 1
+
+    single_rows, scene_rows = [], []
+    for chapter_index in chapters:
+        description = descriptions[chapter_index - 1] if chapter_index <= len(descriptions) else None
+        single_rows += _measure("single", _single, context, chapter_index, description, args.runs, args.verbose)
+        scene_rows += _measure(f"{args.scenes} scenes", _scenes(args.scenes), context, chapter_index, description, args.runs, args.verbose)
+
+    print(_summary("Single call", single_rows))
+    print(_summary(f"Parallel scenes ({args.scenes})", scene_rows))
+    single_latency = mean(r["elapsed"] for r in single_rows)
+    scene_latency = mean(r["elapsed"] for r in scene_rows)
+    if scene_latency:
+        print(f"Speed-up: {single_latency / scene_latency:.2f}×")
+    summary = llm_cassette.stop()
+    if summary["mode"] != llm_cassette.MODE_OFF:
+        print(llm_cassette.format_summary(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,12 @@ Nu au dependențe de runner sau context; primesc totul ca argumente.
 """
 
 
+import re
 import textwrap
 import random
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from provider import provider_manager
+from utils.json_utils import extract_json_from_response
 
 
 _CHAPTER_PROMPT = textwrap.dedent("""\
@@ -161,11 +163,17 @@ def _join_previous_chapters(previous_texts: Optional[List[str]]) -> str:
     return "\n\n".join(parts)
 
 
-def _compute_word_target(anpc: Optional[int]) -> int:
+def word_target_range(anpc: Optional[int]) -> Tuple[int, int]:
+    """Intervalul din care se alege ținta de cuvinte pentru un capitol."""
     if anpc and anpc > 0:
         base_words = anpc * 500
-        return int(random.uniform(base_words * 0.75, base_words * 1.25))
-    return random.randint(2500, 3500)
+        return int(base_words * 0.75), int(base_words * 1.25)
+    return 2500, 3500
+
+
+def _compute_word_target(anpc: Optional[int]) -> int:
+    low, high = word_target_range(anpc)
+    return random.randint(low, high)
 
 
 
@@ -218,7 +226,8 @@ def call_llm_generate_chapter(
     try:
         content = provider_manager.get_llm_response(
             task_name="chapter_writer",
-            messages=messages
+            messages=messages,
+            temperature=temperature,
         )
         if not content:
             return "Error: model returned empty content"
@@ -280,10 +289,441 @@ def call_llm_revise_chapter(
     try:
         content = provider_manager.get_llm_response(
             task_name="chapter_writer",
-            messages=messages
+            messages=messages,
+            temperature=temperature,
         )
         if not content:
             return "Error: model returned empty content"
         return content.strip()
     except Exception as e:
         return f"Error during chapter revision: {e}"
+
+
+# ---------- Scriere segmentată (capitole mai lungi decât o singură completare) ----------
+
+_BEATS_PROMPT = textwrap.dedent("""\
+You are planning **Chapter {chapter_number}** of a long-form {genre} story before it is written.
+
+- **Global Story Summary (authoritative plot):**
+\"\"\"{expanded_plot}\"\"\"
+{chapter_context_block}
+
+Split this chapter into exactly **{segments}** consecutive beats, in story order.
+Each beat is one short paragraph (2–3 sentences) describing what happens in that part of the chapter.
+Together the beats must cover the whole chapter description and nothing that belongs to other chapters.
+
+Output **only** the numbered list, one beat per line:
+1. ...
+2. ...
+""").strip()
+
+_SEGMENTED_CHAPTER_PROMPT = textwrap.dedent("""\
+You are an expert **long-form fiction writer**. Chapter {chapter_number} is too long for a single response,
+so it is written in **{segments} consecutive segments**, one per beat of the plan below.
+
+Inputs:
+- **Global Story Summary (authoritative plot):**
+\"\"\"{expanded_plot}\"\"\"
+{chapter_context_block}
+- **Previously Written Chapters (if any, may be empty):**
+\"\"\"{previous_chapters_summary}\"\"\"
+- **GENRE** (to guide tone, pacing, and atmosphere):
+\"\"\"{genre}\"\"\"
+- **Beat plan for Chapter {chapter_number}:**
+{beats}
+
+Rules for every segment:
+1. Write **only** the beat you are asked for, as continuous narrative prose; do not summarize other beats and do not skip ahead.
+2. Continue **seamlessly** from the end of the previous segment — same scene, tense, point of view, and voice; never repeat its last sentences.
+3. Keep continuity with the previous chapters and the Global Story Summary; do not include events that belong to later chapters.
+4. Only the first segment starts with the chapter title as a **Markdown H2 heading** (`##`), using the title exactly as given.
+5. Only the last segment closes the chapter; other segments stop at a natural point inside the chapter.
+6. Output **only** the story text of the segment — no notes, labels, or commentary.
+""").strip()
+
+_SEGMENT_INSTRUCTION = textwrap.dedent("""\
+Write **segment {segment}/{segments}** (beat {segment}: {beat}) — around **{word_target} words**.
+{continuation}
+""").strip()
+
+_SEGMENT_TAIL_WORDS = 600
+_SEGMENT_ATTEMPTS = 2  # încercarea inițială + o reîncercare
+
+
+def _parse_beats(text: str, segments: int) -> List[str]:
+    """Lista numerotată a planului → beats; dacă modelul nu respectă formatul, se folosesc beats generice."""
+    beats = [m.group(1).strip() for m in re.finditer(r"^\s*\d+[.)]\s+(.+)$", text or "", re.MULTILINE)]
+    if len(beats) >= segments:
+        return beats[:segments]
+    return [f"part {i + 1} of {segments} of the chapter description, in order" for i in range(segments)]
+
+
+def _tail(text: str, words: int = _SEGMENT_TAIL_WORDS) -> str:
+    parts = text.split()
+    return text if len(parts) <= words else "… " + " ".join(parts[-words:])
+
+
+def call_llm_plan_chapter_beats(
+    expanded_plot: str,
+    chapters_overview: str,
+    chapter_index: int,
+    segments: int,
+    *,
+    chapter_description: Optional[str] = None,
+    genre: Optional[str] = None,
+) -> List[str]:
+    """Planifică `segments` beats pentru capitol (un apel scurt)."""
+    context_block, _, _ = _build_chapter_context_block(chapter_description, chapters_overview or "", chapter_index)
+    prompt = _BEATS_PROMPT.format(
+        chapter_number=chapter_index,
+        genre=genre or "fiction",
+        expanded_plot=expanded_plot or "",
+        chapter_context_block=context_block,
+        segments=segments,
+    )
+    messages = [
+        {"role": "system", "content": "You are a professional fiction ghostwriter ensuring perfect narrative coherence."},
+        {"role": "user", "content": prompt},
+    ]
+    try:
+        content = provider_manager.get_llm_response(task_name="chapter_writer", messages=messages)
+    except Exception:
+        content = ""
+    return _parse_beats(content, segments)
+
+
+def iter_generate_chapter_segments(
+    expanded_plot: str,
+    chapters_overview: str,
+    chapter_index: int,
+    previous_chapters: Optional[List[str]] = None,
+    *,
+    segments: int,
+    chapter_description: Optional[str] = None,
+    genre: Optional[str] = None,
+    anpc: Optional[int] = None,
+    temperature: Optional[float] = None,
+) -> Iterator[Tuple[int, int, str]]:
+    """
+    Scrie capitolul în `segments` segmente consecutive: planifică beats, apoi cere câte un segment
+    pe rând, fiecare continuând din finalul celui anterior.
+    Mesajele încep cu același prefix (system + context + plan), așa că provider-ii cu prompt caching
+    îl refolosesc; doar ultimul mesaj (segmentul cerut + finalul textului) diferă.
+    Yield-uiește (segment, segments, textul de până acum) după fiecare segment; ultimul yield e capitolul complet.
+    Un segment eșuat (excepție sau răspuns gol) este reîncercat de _SEGMENT_ATTEMPTS ori; dacă tot eșuează,
+    generatorul se oprește fără ultimul yield — capitolul e incomplet, iar apelantul revine la un singur apel.
+    """
+    word_target = _compute_word_target(anpc)
+    beats = call_llm_plan_chapter_beats(
+        expanded_plot,
+        chapters_overview,
+        chapter_index,
+        segments,
+        chapter_description=chapter_description,
+        genre=genre,
+    )
+    context_block, _, _ = _build_chapter_context_block(chapter_description, chapters_overview or "", chapter_index)
+    prefix = _SEGMENTED_CHAPTER_PROMPT.format(
+        chapter_number=chapter_index,
+        segments=segments,
+        expanded_plot=expanded_plot or "",
+        chapter_context_block=context_block,
+        previous_chapters_summary=_join_previous_chapters(previous_chapters or []),
+        genre=genre or "unspecified",
+        beats="\n".join(f"{i + 1}. {beat}" for i, beat in enumerate(beats)),
+    )
+    base_messages = [
+        {"role": "system", "content": "You are a professional fiction ghostwriter ensuring perfect narrative coherence."},
+        {"role": "user", "content": prefix},
+    ]
+
+    written: List[str] = []
+    for i, beat in enumerate(beats):
+        if written:
+            continuation = f"The chapter so far ends with:\n\"\"\"{_tail(written[-1])}\"\"\"\nContinue directly from there."
+        else:
+            continuation = "This is the first segment: start with the chapter title."
+        if i == len(beats) - 1:
+            continuation += "\nThis is the last segment: bring the chapter to its natural close."
+        instruction = _SEGMENT_INSTRUCTION.format(
+            segment=i + 1,
+            segments=len(beats),
+            beat=beat,
+            word_target=max(1, word_target // len(beats)),
+            continuation=continuation,
+        )
+        content = None
+        for _ in range(_SEGMENT_ATTEMPTS):
+            try:
+                content = provider_manager.get_llm_response(
+                    task_name="chapter_writer",
+                    messages=base_messages + [{"role": "user", "content": instruction}],
+                    temperature=temperature,
+                )
+            except Exception:
+                content = None
+            if content and content.strip():
+                break
+        if not content or not content.strip():
+            return
+        written.append(content.strip())
+        yield i + 1, len(beats), "\n\n".join(written)
+
+
+# ---------- Scene în paralel (experimental) ----------
+
+_SCENE_PLAN_PROMPT = textwrap.dedent("""\
+You are planning **Chapter {chapter_number}** of a long-form {genre} story so that its scenes can be written independently.
+
+- **Global Story Summary (authoritative plot):**
+\"\"\"{expanded_plot}\"\"\"
+{chapter_context_block}
+
+Split this chapter into exactly **{scenes}** consecutive scenes, in story order, covering the whole chapter description.
+For every scene give:
+- "summary": what happens in the scene (2–3 sentences);
+- "opening_state": where things stand when the scene starts (place, time, who is present, what they know/feel);
+- "closing_state": where things stand when the scene ends.
+The closing_state of each scene must match the opening_state of the next one.
+
+Return **only** JSON:
+{{"scenes": [{{"summary": "...", "opening_state": "...", "closing_state": "..."}}]}}
+""").strip()
+
+_SCENE_CHAPTER_PROMPT = textwrap.dedent("""\
+You are an expert **long-form fiction writer**. Chapter {chapter_number} is written scene by scene, by several writers
+at the same time, following the scene plan below. You will be asked to write **one** of these scenes.
+
+Inputs:
+- **Global Story Summary (authoritative plot):**
+\"\"\"{expanded_plot}\"\"\"
+{chapter_context_block}
+- **Previously Written Chapters (if any, may be empty):**
+\"\"\"{previous_chapters_summary}\"\"\"
+- **GENRE** (to guide tone, pacing, and atmosphere):
+\"\"\"{genre}\"\"\"
+- **Scene plan for Chapter {chapter_number}:**
+{scene_plan}
+
+Rules:
+1. Write **only** the requested scene as continuous narrative prose. Start exactly from its opening state and stop exactly at its closing state.
+2. Do not narrate events of other scenes; the other writers cover them.
+3. Keep continuity with the previous chapters and the Global Story Summary; do not include events that belong to later chapters.
+4. Only scene 1 starts with the chapter title as a **Markdown H2 heading** (`##`), using the title exactly as given.
+5. Only the last scene closes the chapter.
+6. Output **only** the story text of the scene — no notes, labels, or commentary.
+""").strip()
+
+_SCENE_INSTRUCTION = "Write **scene {scene}/{scenes}** now — around **{word_target} words**."
+
+_TRANSITION_PROMPT = textwrap.dedent("""\
+Two consecutive scenes of a chapter were written separately. Check the seam between them.
+
+End of the previous scene:
+\"\"\"{previous_tail}\"\"\"
+
+Start of the next scene:
+\"\"\"{next_head}\"\"\"
+
+If the next scene already follows naturally, output exactly: NONE
+Otherwise output only a short bridging passage (1–3 sentences, same voice and tense) to insert between them.
+""").strip()
+
+
+def _format_scene_plan(scenes: List[Dict[str, str]]) -> str:
+    lines = []
+    for i, scene in enumerate(scenes):
+        lines.append(
+            f"{i + 1}. {scene.get('summary', '')}\n"
+            f"   - Opening state: {scene.get('opening_state', '')}\n"
+            f"   - Closing state: {scene.get('closing_state', '')}"
+        )
+    return "\n".join(lines)
+
+
+def _cap_scene_plan(plan: List[Dict[str, str]], scenes: int) -> List[Dict[str, str]]:
+    """
+    Modelul poate întoarce mai multe scene decât s-au cerut; cele în plus sunt unite în ultima scenă
+    permisă (rezumatele concatenate, starea de final a ultimei), ca numărul de apeluri paralele
+    și ținta de cuvinte per scenă să rămână cele din Settings.
+    """
+    if len(plan) <= scenes:
+        return plan
+    kept, extra = plan[:scenes - 1], plan[scenes - 1:]
+    merged = dict(extra[0])
+    merged["summary"] = " ".join(str(s.get("summary", "")).strip() for s in extra)
+    merged["closing_state"] = extra[-1].get("closing_state", merged.get("closing_state", ""))
+    return kept + [merged]
+
+
+def call_llm_plan_chapter_scenes(
+    expanded_plot: str,
+    chapters_overview: str,
+    chapter_index: int,
+    scenes: int,
+    *,
+    chapter_description: Optional[str] = None,
+    genre: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Planul de scene (summary + opening/closing state). Listă goală dacă planul nu poate fi citit."""
+    context_block, _, _ = _build_chapter_context_block(chapter_description, chapters_overview or "", chapter_index)
+    prompt = _SCENE_PLAN_PROMPT.format(
+        chapter_number=chapter_index,
+        genre=genre or "fiction",
+        expanded_plot=expanded_plot or "",
+        chapter_context_block=context_block,
+        scenes=scenes,
+    )
+    messages = [
+        {"role": "system", "content": "You are a professional fiction ghostwriter ensuring perfect narrative coherence."},
+        {"role": "user", "content": prompt},
+    ]
+    try:
+        data = extract_json_from_response(provider_manager.get_llm_response(task_name="chapter_writer", messages=messages) or "")
+    except Exception:
+        return []
+    plan = [s for s in (data.get("scenes") or []) if isinstance(s, dict) and s.get("summary")]
+    return _cap_scene_plan(plan, scenes) if len(plan) >= 2 else []
+
+
+def build_scene_messages(
+    expanded_plot: str,
+    chapters_overview: str,
+    chapter_index: int,
+    previous_chapters: Optional[List[str]],
+    scene_plan: List[Dict[str, str]],
+    *,
+    chapter_description: Optional[str] = None,
+    genre: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    """Prefixul comun tuturor scenelor (identic → poate fi servit din prompt cache)."""
+    context_block, _, _ = _build_chapter_context_block(chapter_description, chapters_overview or "", chapter_index)
+    prompt = _SCENE_CHAPTER_PROMPT.format(
+        chapter_number=chapter_index,
+        expanded_plot=expanded_plot or "",
+        chapter_context_block=context_block,
+        previous_chapters_summary=_join_previous_chapters(previous_chapters or []),
+        genre=genre or "unspecified",
+        scene_plan=_format_scene_plan(scene_plan),
+    )
+    return [
+        {"role": "system", "content": "You are a professional fiction ghostwriter ensuring perfect narrative coherence."},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def call_llm_write_scene(
+    base_messages: List[Dict[str, str]],
+    scene: int,
+    scenes: int,
+    word_target: int,
+    *,
+    temperature: Optional[float] = None,
+) -> str:
+    """Scrie scena `scene` (1-based). Aruncă excepție la eșec (apelantul decide fallback-ul)."""
+    content = provider_manager.get_llm_response(
+        task_name="chapter_writer",
+        messages=base_messages + [{"role": "user", "content": _SCENE_INSTRUCTION.format(
+            scene=scene, scenes=scenes, word_target=word_target)}],
+        temperature=temperature,
+    )
+    if not content or not content.strip():
+        raise ValueError(f"model returned empty content for scene {scene}")
+    return content.strip()
+
+
+def call_llm_scene_transition(previous_scene: str, next_scene: str) -> str:
+    """Pasaj scurt de legătură între două scene ("" dacă nu e nevoie sau apelul eșuează)."""
+    prompt = _TRANSITION_PROMPT.format(
+        previous_tail=_tail(previous_scene, 150),
+        next_head=" ".join(next_scene.split()[:150]),
+    )
+    messages = [
+        {"role": "system", "content": "You are a meticulous fiction editor."},
+        {"role": "user", "content": prompt},
+    ]
+    try:
+        content = (provider_manager.get_llm_response(task_name="chapter_writer", messages=messages) or "").strip()
+    except Exception:
+        return ""
+    return "" if not content or content.strip("`*. ").upper() == "NONE" else content
+
+
+def scene_word_target(anpc: Optional[int], scenes: int) -> int:
+    return max(1, _compute_word_target(anpc) // max(1, scenes))
+
+
+# --- Revizie localizată: doar pasajele indicate de validator ---
+
+_PASSAGE_REVISION_PROMPT = textwrap.dedent("""\
+You are a meticulous fiction editor revising **Chapter {chapter_number}** of a {genre} story.
+The chapter is good overall; only the passages listed below must change.
+
+- **Global Story Summary (authoritative plot):**
+\"\"\"{expanded_plot}\"\"\"
+{chapter_context_block}
+- **Full current chapter (for context only — do not rewrite it):**
+\"\"\"{chapter_text}\"\"\"
+
+- **Validator feedback:**
+\"\"\"{feedback}\"\"\"
+
+### Passages to revise
+{passages}
+
+Rewrite each listed passage so that its fix is applied, keeping the voice, tense and length, and so that it still
+connects naturally with the text before and after it. Change nothing else.
+
+Return **only** JSON:
+{{"passages": [{{"id": 1, "text": "the revised passage"}}]}}
+""").strip()
+
+
+def call_llm_revise_passages(
+    expanded_plot: str,
+    chapters_overview: str,
+    chapter_index: int,
+    chapter_text: str,
+    passages: List[Dict[str, str]],
+    feedback: str,
+    *,
+    chapter_description: Optional[str] = None,
+    genre: Optional[str] = None,
+    temperature: Optional[float] = None,
+) -> Optional[Dict[int, str]]:
+    """
+    Rescrie doar pasajele date ([{"id", "text", "fix"}]) într-un singur apel.
+    Returnează {id: text revizuit} pentru toate pasajele, sau None dacă răspunsul nu le acoperă pe toate.
+    """
+    context_block, _, _ = _build_chapter_context_block(chapter_description, chapters_overview or "", chapter_index)
+    listed = "\n\n".join(
+        f"[{p['id']}] FIX: {p['fix']}\n\"\"\"{p['text']}\"\"\"" for p in passages
+    )
+    prompt = _PASSAGE_REVISION_PROMPT.format(
+        chapter_number=chapter_index,
+        genre=genre or "fiction",
+        expanded_plot=expanded_plot or "",
+        chapter_context_block=context_block,
+        chapter_text=chapter_text,
+        feedback=feedback or "",
+        passages=listed,
+    )
+    messages = [
+        {"role": "system", "content": "You are a professional fiction ghostwriter ensuring perfect narrative coherence."},
+        {"role": "user", "content": prompt},
+    ]
+    try:
+        data = extract_json_from_response(
+            provider_manager.get_llm_response(task_name="chapter_writer", messages=messages, temperature=temperature) or ""
+        )
+    except Exception:
+        return None
+    revised = {}
+    for item in data.get("passages") or []:
+        try:
+            revised[int(item.get("id"))] = (item.get("text") or "").strip()
+        except (AttributeError, TypeError, ValueError):
+            continue
+    if any(not revised.get(p["id"]) for p in passages):
+        return None
+    return revised
@@ -6,9 +6,201 @@ Nu face logging și, by design, **NU** modifică `context.chapters_full` — ret
 iar runner-ul decide cum îl inserează/înlocuiește.
 """
 
-from typing import Optional, List
+import re
+import math
+import threading
+from difflib import SequenceMatcher
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, List, Tuple
 from state.pipeline_context import PipelineContext
-from .llm import call_llm_generate_chapter, call_llm_revise_chapter
+from state.settings_manager import settings_manager
+from state.llm_telemetry import attribute_calls_to
+from .llm import (
+    call_llm_generate_chapter,
+    call_llm_revise_chapter,
+    iter_generate_chapter_segments,
+    call_llm_plan_chapter_scenes,
+    build_scene_messages,
+    call_llm_write_scene,
+    call_llm_scene_transition,
+    scene_word_target,
+    call_llm_revise_passages,
+)
+
+_PARAGRAPH_BREAK_RE = re.compile(r"(\n\s*\n)")
+_ANCHOR_MIN_MATCH = 0.8
+
+
+def chapter_segment_count(anpc: Optional[int]) -> int:
+    """
+    Numărul de segmente pentru un capitol nou (Settings → Pipeline → words per segment; 0 = dezactivat).
+    Segmentarea pornește doar când ținta (ANPC × 500 cuvinte) depășește clar un segment.
+    """
+    try:
+        segment_words = int(settings_manager.get_pipeline_setting("chapter_segment_words") or 0)
+    except (TypeError, ValueError):
+        return 1
+    target_words = (anpc or 0) * 500
+    if segment_words <= 0 or target_words <= segment_words * 1.25:
+        return 1
+    return math.ceil(target_words / segment_words)
+
+
+def chapter_scene_count() -> int:
+    """Numărul de scene scrise în paralel (Settings → Pipeline, experimental; 0/1 = dezactivat)."""
+    try:
+        return max(1, int(settings_manager.get_pipeline_setting("chapter_parallel_scenes") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def write_chapter_scenes(
+    context: PipelineContext,
+    chapter_index: int,
+    scenes: int,
+    *,
+    chapter_description: Optional[str] = None,
+    temperature: Optional[float] = None,
+    on_segment: Optional[Callable[[int, int, str], None]] = None,
+) -> Optional[str]:
+    """
+    Scrie capitolul ca scene independente, în paralel: plan de scene (opening/closing state),
+    apoi toate scenele simultan pe același prefix de prompt, apoi o trecere scurtă de tranziție
+    la fiecare îmbinare (tot în paralel). Returnează None dacă planul sau o scenă eșuează —
+    apelantul revine la scrierea într-un singur apel.
+    """
+    prev_list: List[str] = context.chapters_full[:-1] if context.chapters_full else []
+    plan = call_llm_plan_chapter_scenes(
+        context.expanded_plot or "",
+        context.chapters_overview or "",
+        chapter_index,
+        scenes,
+        chapter_description=chapter_description,
+        genre=context.genre,
+    )
+    if not plan:
+        return None
+
+    base_messages = build_scene_messages(
+        context.expanded_plot or "",
+        context.chapters_overview or "",
+        chapter_index,
+        prev_list,
+        plan,
+        chapter_description=chapter_description,
+        genre=context.genre,
+    )
+    word_target = scene_word_target(context.anpc, len(plan))
+    owner = threading.get_ident()
+    done = {}
+    lock = threading.Lock()
+
+    def _scene(scene: int) -> str:
+        with attribute_calls_to(owner):
+            text = call_llm_write_scene(base_messages, scene, len(plan), word_target, temperature=temperature)
+        if on_segment:
+            with lock:
+                done[scene] = text
+                # progres: câte scene sunt gata + textul lor, în ordinea din plan
+                on_segment(len(done), len(plan), "\n\n".join(done[k] for k in sorted(done)))
+        return text
+
+    def _transition(pair) -> str:
+        with attribute_calls_to(owner):
+            return call_llm_scene_transition(*pair)
+
+    with ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix="scene") as pool:
+        try:
+            texts = list(pool.map(_scene, range(1, len(plan) + 1)))
+        except Exception:
+            return None
+        bridges = list(pool.map(_transition, zip(texts, texts[1:])))
+
+    parts = [texts[0]]
+    for bridge, text in zip(bridges, texts[1:]):
+        if bridge:
+            parts.append(bridge)
+        parts.append(text)
+    return "\n\n".join(parts)
+
+
+def _normalize(text: str) -> str:
+    text = (text or "").lower().translate(str.maketrans("“”„’‘", "\"\"\"''"))
+    return " ".join(re.sub(r"[*_`]", "", text).split())
+
+
+def _locate_anchor(paragraphs: List[str], quote: str) -> Optional[int]:
+    """
+    Indexul paragrafului care conține citatul (exact după normalizare, altfel cea mai lungă potrivire ≥ 80%).
+    None dacă citatul se potrivește la fel de bine în mai multe paragrafe — nu ghicim care trebuie rescris.
+    """
+    needle = _normalize(quote)
+    if not needle:
+        return None
+    normalized = [_normalize(p) for p in paragraphs]
+    exact = [i for i, para in enumerate(normalized) if needle in para]
+    if exact:
+        return exact[0] if len(exact) == 1 else None
+    best, best_size, tied = None, 0, False
+    for i, para in enumerate(normalized):
+        size = SequenceMatcher(None, para, needle, autojunk=False).find_longest_match(0, len(para), 0, len(needle)).size
+        if size > best_size:
+            best, best_size, tied = i, size, False
+        elif size == best_size and size:
+            tied = True
+    return best if best_size >= _ANCHOR_MIN_MATCH * len(needle) and not tied else None
+
+
+def revise_chapter_passages(
+    context: PipelineContext,
+    chapter_index: int,
+    previous_output: str,
+    feedback: str,
+    issues: List[Dict[str, str]],
+    *,
+    chapter_description: Optional[str] = None,
+    temperature: Optional[float] = None,
+) -> Optional[Tuple[str, int]]:
+    """
+    Revizie localizată: rescrie doar paragrafele care conțin citatele din ISSUES și le pune la loc,
+    restul capitolului rămânând identic. Returnează (text, paragrafe revizuite) sau None când revizia
+    trebuie făcută pe tot capitolul (fără ancore, citat negăsit, prea multe paragrafe, răspuns incomplet).
+    """
+    if not issues or not previous_output:
+        return None
+    parts = _PARAGRAPH_BREAK_RE.split(previous_output)
+    paragraphs = parts[::2]  # separatorii (indici impari) rămân neatinși
+
+    fixes: Dict[int, List[str]] = {}
+    for issue in issues:
+        index = _locate_anchor(paragraphs, issue.get("quote", ""))
+        if index is None:
+            return None
+        fixes.setdefault(index, []).append(issue.get("fix") or "")
+    if len(fixes) > max(1, len(paragraphs) // 2):
+        return None
+
+    passages = [
+        {"id": n, "text": paragraphs[index], "fix": "; ".join(f for f in fixes[index] if f)}
+        for n, index in enumerate(sorted(fixes), start=1)
+    ]
+    revised = call_llm_revise_passages(
+        context.expanded_plot or "",
+        context.chapters_overview or "",
+        chapter_index,
+        previous_output,
+        passages,
+        feedback,
+        chapter_description=chapter_description,
+        genre=context.genre,
+        temperature=temperature,
+    )
+    if not revised:
+        return None
+    for n, index in enumerate(sorted(fixes), start=1):
+        parts[index * 2] = revised[n]
+    return "".join(parts), len(passages)
+
 
 def run_chapter_writer(
     context: PipelineContext,
@@ -17,12 +209,17 @@ def run_chapter_writer(
     chapter_description: Optional[str] = None,
     feedback: Optional[str] = None,
     previous_output: Optional[str] = None,
+    temperature: Optional[float] = None,
+    on_segment: Optional[Callable[[int, int, str], None]] = None,
 ) -> str:
     """
     Returnează textul capitolului (nou sau revizuit), fără efecte secundare asupra contextului.
     - chapter_index este 1-based (conform prompturilor existente).
     - chapter_description: if provided, uses this specific description instead of full overview.
     - dacă `feedback` și `previous_output` sunt date => revizie; altfel generație nouă.
+    - temperature: suprascrie temperatura task-ului (ex: eșantionare best-of-N).
+    - on_segment(segment, segments, text): apelat după fiecare segment când capitolul nou
+      este scris segmentat sau pe scene în paralel; revizia rămâne un singur apel.
     """
     prev_list: List[str] = context.chapters_full[:-1] if context.chapters_full else []
 
@@ -37,8 +234,43 @@ def run_chapter_writer(
             chapter_description=chapter_description,
             genre=context.genre,
             anpc=context.anpc,
+            temperature=temperature,
         )
 
+    scenes = chapter_scene_count()
+    if scenes > 1:
+        text = write_chapter_scenes(
+            context,
+            chapter_index,
+            scenes,
+            chapter_description=chapter_description,
+            temperature=temperature,
+            on_segment=on_segment,
+        )
+        if text:
+            return text
+
+    segments = chapter_segment_count(context.anpc)
+    if segments > 1:
+        text, complete = "", False
+        for segment, total, text in iter_generate_chapter_segments(
+            expanded_plot=context.expanded_plot or "",
+            chapters_overview=context.chapters_overview or "",
+            chapter_index=chapter_index,
+            previous_chapters=prev_list,
+            segments=segments,
+            chapter_description=chapter_description,
+            genre=context.genre,
+            anpc=context.anpc,
+            temperature=temperature,
+        ):
+            if on_segment:
+                on_segment(segment, total, text)
+            complete = segment == total
+        if complete:
+            return text
+        # un segment a eșuat și după reîncercare: un capitol trunchiat ar trece drept complet → un singur apel
+
     return call_llm_generate_chapter(
         expanded_plot=context.expanded_plot or "",
         chapters_overview=context.chapters_overview or "",
@@ -47,4 +279,5 @@ def run_chapter_writer(
         chapter_description=chapter_description,
         genre=context.genre,
         anpc=context.anpc,
+        temperature=temperature,
     )
@@ -9,6 +9,7 @@ import textwrap
 import json
 from typing import List, Optional, Dict, Any
 from utils.json_utils import extract_json_from_response
+from utils.edit_ops import EDIT_OPERATIONS_FORMAT, EditOperationError, apply_edit_operations
 from provider import provider_manager
 from state.settings_manager import settings_manager
 
@@ -72,6 +73,29 @@ Failure to follow these rules will cause the request to be rejected.
 """).strip()
 
 
+# ---------------------------------------
+# PATCH EDITS (Settings → Pipeline → Patch-based Edits)
+# ---------------------------------------
+_PATCH_ENFORCER = textwrap.dedent("""
+EXCEPTION TO RULES 2, 3, 4 AND 7 — LOCAL EDITS:
+
+When the requested change is local (a rename, a few words, sentences or paragraphs),
+do NOT reproduce the content. Instead set "new_content": null and add a third field:
+{
+  "new_content": null,
+  "operations": [ ... ],
+  "response": "Chat-style reply to the user."
+}
+Use "new_content" with the COMPLETE content only for large or structural changes.
+
+""").strip() + "\n" + EDIT_OPERATIONS_FORMAT
+
+_PATCH_RETRY_MESSAGE = (
+    "Your operations could not be applied to the current content ({error}). "
+    "Answer again with the COMPLETE updated content in \"new_content\" and no \"operations\"."
+)
+
+
 # ---------------------------------------
 # PLOT KING MAIN SYSTEM PROMPT
 # ---------------------------------------
@@ -157,12 +181,16 @@ def call_llm_chat(
 ) -> Dict[str, Any]:
     """
     Calls the LLM with the Plot King persona.
+    With patch edits enabled, local changes come back as anchored operations and are applied
+    here to current_content, so callers always receive the full text in "new_content".
     """
+    patch_edits = bool(settings_manager.get_pipeline_setting("edit_patch_operations"))
 
     # Build message sequence
     messages = [
         {"role": "system", "content": _JSON_ENFORCER},
         {"role": "system", "content": _PLOT_KING_SYSTEM_PROMPT.format(section_name=section_name)},
+        *([{"role": "system", "content": _PATCH_ENFORCER}] if patch_edits else []),
         {"role": "assistant", "content": f"INITIAL CONTENT (reference):\n{initial_content}"},
         {"role": "assistant", "content": f"CURRENT CONTENT (active draft):\n{current_content}"},
     ]
@@ -202,13 +230,11 @@ def call_llm_chat(
         # Try to extract JSON using your custom extractor
         try:
             result = extract_json_from_response(content)
-            return result
         except Exception:
             # Fallback: attempt last-JSON-block extraction
             try:
                 last_json = content[content.rfind("{"):]
                 result = json.loads(last_json)
-                return result
             except Exception:
                 if attempt < retries:
                     continue
@@ -217,6 +243,22 @@ def call_llm_chat(
                     "response": content
                 }
 
+        operations = result.pop("operations", None)
+        if operations and not result.get("new_content"):
+            try:
+                result["new_content"] = apply_edit_operations(current_content or "", operations)
+            except EditOperationError as e:
+                last_error = str(e)
+                if attempt < retries:
+                    messages = messages + [
+                        {"role": "assistant", "content": content},
+                        {"role": "user", "content": _PATCH_RETRY_MESSAGE.format(error=last_error)},
+                    ]
+                    continue
+                result["new_content"] = None
+                result["response"] = f"Plot King tripped over a narrative cable! Error: {last_error}"
+        return result
+
     return {
         "new_content": None,
         "response": last_content or f"Plot King tripped over a narrative cable! Error: {last_error or 'Unknown error'}"
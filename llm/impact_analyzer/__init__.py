@@ -1 +1,2 @@
 from .llm import call_llm_impact_analysis
+from .pipeline import run_impact_analysis, impact_shard_size
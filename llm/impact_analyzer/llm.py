@@ -22,7 +22,7 @@ Inputs you receive:
 \"\"\"{edited_section_content}\"\"\"
 - SUMMARY OF CHANGES:
 \"\"\"{diff_summary}\"\"\"
-- POTENTIAL IMPACTED SECTIONS ({candidate_count}):
+{context_block}- POTENTIAL IMPACTED SECTIONS ({candidate_count}):
 {candidate_sections}
 - POTENTIALLY IMPACTED SECTION NAMES (use only these exact names in references): {candidate_names}
 
@@ -127,6 +127,7 @@ def call_llm_impact_analysis(
     candidate_sections: List[Tuple[str, str]],
     is_infill: bool = False,
     total_chapters: int = 0,
+    context_note: str = "",
     api_url: str = None,
     model_name: str = None,
     timeout: int = 300,
@@ -139,6 +140,9 @@ def call_llm_impact_analysis(
       ("IMPACT_DETECTED", data, impacted_sections)
       ("UNKNOWN", {"raw": content}, [])
       ("ERROR", {"error": message}, [])
+
+    context_note: context compact pentru analiza pe shard-uri (nu este candidat), ex. Chapters Overview
+    și ce s-a decis deja pentru Expanded Plot / Chapters Overview.
     """
 
 
@@ -191,6 +195,10 @@ Changes: New Chapter Created
         infill_rule=infill_rule,
         infill_chapter_rule=infill_chapter_rule,
         infill_example=infill_example,
+        context_block=(
+            f"- BOOK CONTEXT (for reference only; these are NOT candidates):\n\"\"\"{context_note}\"\"\"\n"
+            if context_note else ""
+        ),
     )
 
     messages = [
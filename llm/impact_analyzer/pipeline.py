@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# llm/impact_analyzer/pipeline.py
+"""
+Analiza de impact pe shard-uri (map-reduce) pentru cărți lungi.
+Un singur prompt cu tot textul cărții este lent și poate depăși contextul; aici:
+  1. Expanded Plot + Chapters Overview sunt analizate primele (un apel);
+  2. capitolele candidate sunt împărțite în loturi analizate în paralel, fiecare cu editarea,
+     rezumatul diff-ului și un context compact (Chapters Overview + deciziile de la pasul 1);
+  3. rezultatele sunt combinate în formatul obișnuit (result, data, impacted_sections).
+Sub pragul din Settings → Pipeline rămâne un singur apel.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+from state.settings_manager import settings_manager
+from state.llm_telemetry import attribute_calls_to
+from .llm import call_llm_impact_analysis
+
+_OUTLINE_SECTIONS = ("Expanded Plot", "Chapters Overview")
+
+
+def impact_shard_size() -> int:
+    """Capitole per shard (0 = analiză într-un singur apel)."""
+    try:
+        return max(0, int(settings_manager.get_pipeline_setting("impact_shard_chapters") or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _context_note(candidates: List[Tuple[str, str]], outline_data: Dict[str, Any]) -> str:
+    overview = next((content for name, content in candidates if name == "Chapters Overview"), "")
+    decided = [
+        f"- {entry['name']}: {entry.get('reason', '')}"
+        for entry in (outline_data or {}).get("impacted_sections", [])
+    ]
+    parts = []
+    if overview:
+        parts.append(f"Chapters Overview (current):\n{overview.strip()}")
+    parts.append(
+        "Planned outline updates:\n" + "\n".join(decided) if decided else "Planned outline updates: none."
+    )
+    return "\n\n".join(parts)
+
+
+def _merge(results: List[Tuple[Tuple[str, Dict[str, Any], List[str]], List[str]]]) -> Tuple[str, Dict[str, Any], List[str]]:
+    """
+    results: (rezultatul unui apel, numele candidate trimise în acel apel). Din fiecare apel se păstrează
+    doar secțiunile proprii (un shard de capitole poate marca din nou "Chapters Overview", ex: la infill),
+    iar o secțiune apare o singură dată — prima decizie (cea a pasului pe outline) câștigă.
+    """
+    for (result, data, _), _ in results:
+        if result not in {"NO_IMPACT", "IMPACT_DETECTED"}:
+            return result, data, []
+    entries, impacted = [], []
+    for (_, data, names), allowed in results:
+        reasons = {entry.get("name"): entry for entry in (data.get("impacted_sections") or [])}
+        for name in names:
+            if name in allowed and name not in impacted:
+                impacted.append(name)
+                entries.append(reasons.get(name) or {"name": name, "reason": ""})
+    if not impacted:
+        return "NO_IMPACT", {"result": "NO_IMPACT", "message": "No other sections require updates.", "impacted_sections": []}, []
+    return "IMPACT_DETECTED", {"result": "IMPACT_DETECTED", "impacted_sections": entries}, impacted
+
+
+def run_impact_analysis(
+    *,
+    section_name: str,
+    edited_section_content: str,
+    diff_summary: str,
+    candidate_sections: List[Tuple[str, str]],
+    is_infill: bool = False,
+    total_chapters: int = 0,
+) -> Tuple[str, Dict[str, Any], List[str]]:
+    """
+    Aceeași semnătură și același rezultat ca call_llm_impact_analysis, dar shard-uit când
+    numărul de capitole candidate depășește pragul. Un shard eșuat (ERROR / UNKNOWN) face
+    ca întreaga analiză să raporteze acel rezultat — un plan parțial nu este folosit.
+    """
+    common = dict(
+        section_name=section_name,
+        edited_section_content=edited_section_content,
+        diff_summary=diff_summary,
+        is_infill=is_infill,
+        total_chapters=total_chapters,
+    )
+    shard_size = impact_shard_size()
+    outline = [(n, c) for n, c in candidate_sections if n in _OUTLINE_SECTIONS]
+    chapters = [(n, c) for n, c in candidate_sections if n not in _OUTLINE_SECTIONS]
+    if not shard_size or len(chapters) <= shard_size:
+        return call_llm_impact_analysis(candidate_sections=candidate_sections, **common)
+
+    results = []
+    outline_data: Dict[str, Any] = {}
+    if outline:
+        outline_result = call_llm_impact_analysis(candidate_sections=outline, **common)
+        if outline_result[0] not in {"NO_IMPACT", "IMPACT_DETECTED"}:
+            return outline_result
+        results.append((outline_result, [n for n, _ in outline]))
+        outline_data = outline_result[1]
+
+    note = _context_note(candidate_sections, outline_data)
+    shards = [chapters[i:i + shard_size] for i in range(0, len(chapters), shard_size)]
+    owner = threading.get_ident()
+
+    def _analyze(shard):
+        with attribute_calls_to(owner):
+            return call_llm_impact_analysis(candidate_sections=shard, context_note=note, **common)
+
+    with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="impact") as pool:
+        results += [(result, [n for n, _ in shard]) for result, shard in zip(pool.map(_analyze, shards), shards)]
+    return _merge(results)
@@ -1,4 +1,5 @@
 from .llm import call_llm_tokenize_overview
-from .pipeline import run_overview_tokenizer
+from .pipeline import run_overview_tokenizer, split_overview, tokenizer_hit_rate, describe_hit_rate
+from .cache import overview_hash, get_cached_tokenization, store_tokenization, update_tokenization
 
 
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# llm/overview_tokenizer/benchmark.py
+"""
+Măsoară parser-ul programatic, fără apeluri LLM, pe două surse:
+
+- acuratețe: fixture-uri etichetate manual (benchmark_fixtures.json) — pentru fiecare overview,
+  prima linie a fiecărui capitol, sau null când overview-ul nu are titluri și trebuie lăsat
+  tokenizer-ului LLM. Tokenizările salvate în proiecte nu sunt folosite ca referință: ele
+  provin chiar din acest parser (referință circulară);
+- acoperire: un corpus de overview-uri reale (ex: projects/) — câte ar fi tăiate fără LLM.
+
+    python -m llm.overview_tokenizer.benchmark [projects] [--fixtures FILE] [--verbose]
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import Counter
+
+from llm.overview_tokenizer.pipeline import split_overview
+
+FIXTURES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_fixtures.json")
+
+
+def _load_corpus(path: str):
+    if not os.path.exists(path):
+        return
+    files = [path] if os.path.isfile(path) else [
+        os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".json")
+    ]
+    for file_path in files:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        overview = data.get("chapters_overview") or ""
+        num_chapters = int(data.get("num_chapters") or 0)
+        if not overview.strip() or overview.strip() == "(Empty)" or num_chapters <= 0:
+            continue
+        yield os.path.basename(file_path), overview, num_chapters
+
+
+def _load_fixtures(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("fixtures", [])
+
+
+def _first_lines(chapters):
+    return [chapter.strip().split("\n", 1)[0].strip() for chapter in chapters]
+
+
+def _score_fixtures(path: str, verbose: bool) -> None:
+    correct = 0
+    fixtures = _load_fixtures(path)
+    for fixture in fixtures:
+        chapters, grammar = split_overview(fixture["chapters_overview"], fixture["num_chapters"])
+        expected = fixture.get("starts")
+        ok = (not chapters) if expected is None else (bool(chapters) and _first_lines(chapters) == expected)
+        correct += int(ok)
+        if verbose:
+            got = grammar or "LLM fallback"
+            print(f"  {'✅' if ok else '❌'} {fixture['name']}: {got}")
+    if fixtures:
+        print(f"Accuracy vs hand-labelled fixtures: {correct}/{len(fixtures)} ({correct / len(fixtures):.0%}) correct.")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure the programmatic overview parser on real overviews.")
+    parser.add_argument("corpus", nargs="?", default="projects", help="Directory (or file) with project JSON files.")
+    parser.add_argument("--fixtures", default=FIXTURES_FILE, help="Hand-labelled fixtures used to score accuracy.")
+    parser.add_argument("--verbose", action="store_true", help="Print the result for every overview.")
+    args = parser.parse_args(argv)
+
+    _score_fixtures(args.fixtures, args.verbose)
+
+    total = hits = 0
+    grammars = Counter()
+    for name, overview, num_chapters in _load_corpus(args.corpus):
+        total += 1
+        chapters, grammar = split_overview(overview, num_chapters)
+        if chapters:
+            hits += 1
+            grammars[grammar] += 1
+        if args.verbose:
+            print(f"{name}: {f'✅ {grammar}' if chapters else '❌ no grammar matched'}")
+
+    if not total:
+        print(f"No overviews found in {args.corpus}.")
+        return 1
+    print(f"Programmatic split: {hits}/{total} overviews ({hits / total:.0%}); {total - hits} would need the LLM tokenizer.")
+    for grammar, count in grammars.most_common():
+        print(f"  {grammar}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# llm/overview_tokenizer/cache.py
+"""
+Tokenizarea overview-ului (lista de descrieri per capitol) este păstrată în PipelineContext
+și în fișierul proiectului, legată de hash-ul textului din care a fost extrasă. Cât timp
+overview-ul nu se schimbă, runner-ul o refolosește fără regex / LLM.
+
+Când overview-ul este editat (Editor → save_section), lista este actualizată incremental:
+doar descrierea capitolului atins de editare este re-tăiată din textul nou.
+"""
+
+import hashlib
+from typing import List, Optional
+
+from state.pipeline_context import PipelineContext
+from .pipeline import _try_programmatic_split
+
+
+def overview_hash(chapters_overview: Optional[str]) -> str:
+    return hashlib.sha256((chapters_overview or "").encode("utf-8")).hexdigest()
+
+
+def get_cached_tokenization(context: PipelineContext) -> Optional[List[str]]:
+    """Descrierile salvate, dacă aparțin overview-ului curent și au numărul corect de capitole."""
+    chapters = context.tokenized_overview
+    if not chapters or context.tokenized_overview_hash != overview_hash(context.chapters_overview):
+        return None
+    if context.num_chapters and len(chapters) != context.num_chapters:
+        return None
+    return list(chapters)
+
+
+def store_tokenization(context: PipelineContext, chapters: Optional[List[str]]) -> None:
+    if chapters:
+        context.tokenized_overview = list(chapters)
+        context.tokenized_overview_hash = overview_hash(context.chapters_overview)
+    else:
+        context.tokenized_overview = None
+        context.tokenized_overview_hash = None
+
+
+def _chunk_starts(overview: str, chapters: List[str]) -> Optional[List[int]]:
+    """
+    Poziția de start a fiecărei descrieri în overview. Fiecare capitol „deține” textul până la
+    startul următorului (așa taie și tokenizer-ul). None dacă descrierile nu sunt exact textul dintre starturi.
+    """
+    starts, pos = [], 0
+    for chunk in chapters:
+        start = overview.find(chunk, pos)
+        if start < 0:
+            return None
+        starts.append(start)
+        pos = start + len(chunk)
+    bounds = starts[1:] + [len(overview)]
+    if any(overview[start:end].strip() != chunk for start, end, chunk in zip(starts, bounds, chapters)):
+        return None
+    return starts
+
+
+def _owner(starts: List[int], position: int) -> int:
+    """Indexul capitolului care deține caracterul de la `position` (-1 = textul dinaintea primului capitol)."""
+    owner = -1
+    for i, start in enumerate(starts):
+        if start <= position:
+            owner = i
+    return owner
+
+
+def _reslice(old: str, new: str, chapters: List[str]) -> Optional[List[str]]:
+    """Re-taie doar capitolul atins de diferența dintre `old` și `new`; None dacă editarea traversează capitole."""
+    starts = _chunk_starts(old, chapters)
+    if starts is None:
+        return None
+
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    changed_start, changed_end = prefix, len(old) - suffix
+    delta = len(new) - len(old)
+
+    if changed_start == changed_end:
+        # inserare: textul nou se lipește de caracterul dinaintea lui
+        first = last = _owner(starts, changed_start - 1)
+    else:
+        first, last = _owner(starts, changed_start), _owner(starts, changed_end - 1)
+    if first != last:
+        return None
+    if first < 0:
+        return list(chapters)  # editare doar în textul dinaintea primului capitol
+
+    start = starts[first]
+    end = starts[first + 1] + delta if first + 1 < len(starts) else len(new)
+    chunk = new[start:end].strip()
+    if not chunk:
+        return None
+    updated = list(chapters)
+    updated[first] = chunk
+    return updated
+
+
+def update_tokenization(context: PipelineContext, new_overview: Optional[str]) -> None:
+    """
+    Actualizează tokenizarea pentru un overview nou (înainte ca acesta să fie scris în context).
+    Dacă nu se poate actualiza sigur, tokenizarea este ștearsă și va fi refăcută la următorul run.
+    """
+    old_chapters = get_cached_tokenization(context)
+    if old_chapters is None:
+        store_tokenization(context, None)
+        return
+
+    success, chapters = _try_programmatic_split(new_overview or "", len(old_chapters))
+    if not success:
+        chapters = _reslice(context.chapters_overview or "", new_overview or "", old_chapters)
+
+    context.tokenized_overview = chapters or None
+    context.tokenized_overview_hash = overview_hash(new_overview) if chapters else None
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# llm/overview_tokenizer/parser.py
+"""
+Parser programatic, pe straturi, pentru overview-ul de capitole.
+
+Fiecare gramatică recunoaște un stil de titlu de capitol (Markdown, bold, „Chapter N”
+simplu, listă numerotată, titluri fără număr). Se încearcă pe rând, de la cea mai strictă
+la cea mai permisivă; o gramatică este acceptată doar dacă găsește exact `num_chapters`
+titluri și, când titlurile sunt numerotate, numerotarea este continuă 1..N.
+Tokenizer-ul LLM rămâne doar pentru overview-urile pe care nicio gramatică nu le acceptă.
+"""
+
+import re
+from typing import Callable, List, Optional, Tuple
+
+_UNITS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9,
+    "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15,
+    "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+_TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90}
+_ROMAN = {"i": 1, "v": 5, "x": 10, "l": 50, "c": 100}
+# doar forma canonică (I..CCCXCIX): "IIII", "VX", "IC" nu sunt numere romane valide
+_CANONICAL_ROMAN = re.compile(r"c{0,3}(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})")
+
+_WORD_NUMBER = (
+    r"(?:(?:" + "|".join(_TENS) + r")(?:[\s\-](?:" + "|".join(k for k in _UNITS if _UNITS[k] < 10) + r"))?"
+    r"|" + "|".join(sorted(_UNITS, key=len, reverse=True)) + r")"
+)
+_NUMBER = r"(\d{1,3}|[ivxlc]{1,7}|" + _WORD_NUMBER + r")"
+_SEPARATOR = r"(?=\s*(?:[:.\-–—)]|\*|_|$|\s))"
+_DECOR = r"[\s*_`]*"
+
+
+def parse_number(token: str) -> Optional[int]:
+    """'12' / 'XII' / 'twelve' / 'twenty-one' → int (None dacă nu e un număr)."""
+    token = (token or "").strip().lower()
+    if token.isdigit():
+        return int(token)
+    if re.fullmatch(r"[ivxlc]+", token):
+        if not _CANONICAL_ROMAN.fullmatch(token):
+            return None
+        total, previous = 0, 0
+        for ch in reversed(token):
+            value = _ROMAN[ch]
+            total = total - value if value < previous else total + value
+            previous = max(previous, value)
+        return total or None
+    parts = re.split(r"[\s\-]+", token)
+    if len(parts) == 1:
+        return _UNITS.get(parts[0], _TENS.get(parts[0]))
+    if len(parts) == 2 and parts[0] in _TENS and _UNITS.get(parts[1], 10) < 10:
+        return _TENS[parts[0]] + _UNITS[parts[1]]
+    return None
+
+
+class HeadingGrammar:
+    """Un stil de titlu: regex pe linie (cu grupul 1 = numărul capitolului, dacă există)."""
+
+    def __init__(self, name: str, pattern: str, numbered: bool = True, accept: Optional[Callable[[str], bool]] = None):
+        self.name = name
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        self.numbered = numbered
+        self.accept = accept
+
+    def find(self, lines: List[str]) -> List[Tuple[int, Optional[int]]]:
+        """(index linie 0-based, număr capitol) pentru fiecare linie care arată ca un titlu."""
+        found = []
+        for i, line in enumerate(lines):
+            match = self.regex.match(line)
+            if not match or (self.accept and not self.accept(line)):
+                continue
+            found.append((i, parse_number(match.group(1)) if self.numbered else None))
+        return found
+
+
+def _short_line(line: str) -> bool:
+    return len(line.strip()) <= 120
+
+
+GRAMMARS: List[HeadingGrammar] = [
+    # #### Chapter 3: Title / ## **Chapter Three – Title** / ### Chapter III
+    HeadingGrammar("markdown chapter heading", r"^\s{0,3}#{1,6}" + _DECOR + r"chapter\s+" + _NUMBER + _SEPARATOR),
+    # **Chapter 3 – Title** / __Chapter Three__ / *Chapter 3:* Title
+    HeadingGrammar("bold chapter heading", r"^\s{0,3}(?:\*{1,2}|_{1,2})\s*chapter\s+" + _NUMBER + _SEPARATOR),
+    # Chapter 3: Title / Chapter Three — Title (linie scurtă, ca să nu prindem proză)
+    HeadingGrammar("plain chapter line", r"^\s{0,3}chapter\s+" + _NUMBER + r"\s*(?:[:.\-–—]|$)", accept=_short_line),
+    # 1. **Chapter 1: Title** / - **Chapter 1** (listă care conține cuvântul Chapter)
+    HeadingGrammar("list chapter item", r"^\s{0,3}(?:\d{1,3}[.)]|[-*+])\s+" + _DECOR + r"chapter\s+" + _NUMBER + _SEPARATOR),
+    # ## 3. Title / ### III – Title / ## Part 3: Title
+    HeadingGrammar("numbered markdown heading", r"^\s{0,3}#{1,6}" + _DECOR + r"(?:part\s+)?" + _NUMBER + r"\s*[:.\-–—)]"),
+    # 3. **Title** — listă numerotată de nivel superior, cu titlu bold
+    HeadingGrammar("numbered bold list", r"^(\d{1,3})[.)]\s+\*\*[^*]+\*\*"),
+    # 3. Title — listă numerotată de nivel superior (linie scurtă)
+    HeadingGrammar("numbered list", r"^(\d{1,3})[.)]\s+\S", accept=_short_line),
+]
+
+# fără număr: toate titlurile Markdown de un anumit nivel (ultima încercare, doar la potrivire exactă)
+_UNNUMBERED_LEVELS = [HeadingGrammar(f"h{n} headings", r"^\s{0,3}#{%d}(?!#)\s*(\S.*)$" % n, numbered=False) for n in range(1, 7)]
+
+
+def _continuous(numbers: List[Optional[int]]) -> bool:
+    return all(n == i + 1 for i, n in enumerate(numbers))
+
+
+def find_chapter_starts(chapters_overview: str, num_chapters: int) -> Tuple[Optional[List[int]], Optional[str]]:
+    """
+    Caută liniile de început ale capitolelor (1-based, ca la tokenizer-ul LLM).
+    Returnează (line_indices, numele gramaticii) sau (None, None).
+    """
+    if not chapters_overview or num_chapters <= 0:
+        return None, None
+    lines = chapters_overview.split("\n")
+
+    for grammar in GRAMMARS:
+        found = grammar.find(lines)
+        if len(found) < num_chapters:
+            continue
+        numbers = [n for _, n in found]
+        if len(found) == num_chapters and _continuous(numbers):
+            return [i + 1 for i, _ in found], grammar.name
+        # titluri în plus (ex: „Chapter 3” citat în descrieri): păstrăm prima secvență continuă 1..N
+        picked, expected = [], 1
+        for i, n in found:
+            if n == expected:
+                picked.append(i + 1)
+                expected += 1
+        if len(picked) == num_chapters and expected - 1 == num_chapters and len(found) - len(picked) <= num_chapters // 2:
+            return picked, grammar.name
+
+    for grammar in _UNNUMBERED_LEVELS:
+        found = grammar.find(lines)
+        if len(found) == num_chapters:
+            return [i + 1 for i, _ in found], grammar.name
+
+    return None, None
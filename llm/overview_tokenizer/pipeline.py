@@ -2,11 +2,15 @@
 # llm/overview_tokenizer/pipeline.py
 
 import re
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+from state.llm_telemetry import count_event, get_event_counts
 from .llm import call_llm_tokenize_overview
+from .parser import find_chapter_starts
 
+HIT_RATE_GROUP = "overview_tokenizer"
 
-def _try_programmatic_split(chapters_overview: str, num_chapters: int) -> Tuple[bool, List[str]]:
+
+def _legacy_split(chapters_overview: str, num_chapters: int) -> Tuple[bool, List[str]]:
     """
     Attempt to split chapters_overview using regex on the chapter heading pattern.
     
@@ -32,6 +36,48 @@ def _try_programmatic_split(chapters_overview: str, num_chapters: int) -> Tuple[
     return False, []
 
 
+def split_overview(chapters_overview: str, num_chapters: int) -> Tuple[List[str], Optional[str]]:
+    """
+    Split programatic: întâi formatul clasic `#### Chapter N: *Title*`, apoi gramaticile
+    din parser.py. Returnează (chapters, numele gramaticii) sau ([], None).
+    """
+    if not chapters_overview or num_chapters <= 0:
+        return [], None
+
+    success, chapters = _legacy_split(chapters_overview, num_chapters)
+    if success:
+        return chapters, "chapter heading with italic title"
+
+    line_indices, grammar = find_chapter_starts(chapters_overview, num_chapters)
+    if line_indices:
+        chapters = _split_by_line_indices(chapters_overview, line_indices)
+        if len(chapters) == num_chapters and all(chapters):
+            return chapters, grammar
+    return [], None
+
+
+def _try_programmatic_split(chapters_overview: str, num_chapters: int) -> Tuple[bool, List[str]]:
+    chapters, _ = split_overview(chapters_overview, num_chapters)
+    return bool(chapters), chapters
+
+
+def tokenizer_hit_rate() -> Dict[str, int]:
+    """Câte overview-uri au fost tokenizate programatic / cu LLM / deloc (persistat în telemetrie)."""
+    counts = get_event_counts(HIT_RATE_GROUP)
+    return {method: counts.get(method, 0) for method in ("programmatic", "llm", "failed")}
+
+
+def describe_hit_rate() -> str:
+    counts = tokenizer_hit_rate()
+    total = sum(counts.values())
+    if not total:
+        return "No overviews tokenized yet."
+    return (
+        f"Programmatic split hit rate: {counts['programmatic']}/{total} ({counts['programmatic'] / total:.0%}); "
+        f"{counts['llm']} LLM fallback(s), {counts['failed']} failed."
+    )
+
+
 def _split_by_line_indices(chapters_overview: str, line_indices: List[int]) -> List[str]:
     """
     Split the overview into chapters based on line indices.
@@ -83,8 +129,10 @@ def run_overview_tokenizer(
     if not chapters_overview or num_chapters <= 0:
         return [], "failed"
     
-    success, chapters = _try_programmatic_split(chapters_overview, num_chapters)
-    if success:
+    chapters, grammar = split_overview(chapters_overview, num_chapters)
+    if chapters:
+        count_event(HIT_RATE_GROUP, "programmatic")
+        count_event(HIT_RATE_GROUP + ".grammar", grammar)
         return chapters, "programmatic"
     
     llm_result = call_llm_tokenize_overview(chapters_overview, num_chapters)
@@ -93,8 +141,10 @@ def run_overview_tokenizer(
         line_indices = [item["line_index"] for item in llm_result]
         chapters = _split_by_line_indices(chapters_overview, line_indices)
         if len(chapters) == num_chapters:
+            count_event(HIT_RATE_GROUP, "llm")
             return chapters, "llm"
     
+    count_event(HIT_RATE_GROUP, "failed")
     return [], "failed"
 
 
@@ -3,7 +3,7 @@
 
 import textwrap
 from typing import Tuple
-from provider import provider_manager
+from provider.cascade import get_validator_response
 from state.settings_manager import settings_manager
 
 PROMPT_TEMPLATE = textwrap.dedent("""
@@ -89,9 +89,10 @@ def call_llm_validate_overview(
 
     for attempt in range(retries + 1):
         try:
-            content = provider_manager.get_llm_response(
-                task_name="overview_validator",
-                messages=messages
+            content = get_validator_response(
+                "overview_validator",
+                messages,
+                lambda text: text.strip().upper().startswith(("OK", "NOT OK")),
             )
             last_content = content
         except Exception as e:
@@ -2,7 +2,7 @@
 import json
 import textwrap
 from typing import Tuple, Dict, Any
-from provider import provider_manager
+from provider.cascade import get_validator_response
 from state.settings_manager import settings_manager
 
 _VALIDATOR_PROMPT = textwrap.dedent("""\
@@ -51,6 +51,15 @@ Respond with a single JSON object and nothing else:
 """).strip()
 
 
+def _is_decisive(content: str) -> bool:
+    """Verdict clar pentru cascadă: JSON valid cu secțiunile numbering / deleted / added."""
+    try:
+        parsed = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return False
+    return isinstance(parsed, dict) and all(isinstance(parsed.get(k), dict) for k in ("numbering", "deleted", "added"))
+
+
 def call_llm_overview_validator_after_edit(
     new_overview: str,
     diff_summary: str,
@@ -86,10 +95,7 @@ def call_llm_overview_validator_after_edit(
 
     for attempt in range(retries + 1):
         try:
-            content = provider_manager.get_llm_response(
-                task_name="overview_validator_after_edit",
-                messages=messages
-            )
+            content = get_validator_response("overview_validator_after_edit", messages, _is_decisive)
         except Exception as e:
             last_error = str(e)
             if attempt < retries:
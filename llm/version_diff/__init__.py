@@ -1,2 +1,3 @@
 from .llm import call_llm_version_diff
+from .prepass import classify_change, CHANGE_COSMETIC, CHANGE_HUNKS, CHANGE_FULL, COSMETIC_MESSAGE
 
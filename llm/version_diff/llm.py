@@ -8,11 +8,17 @@ apelează modelul, și întoarce (result, diff_details).
 
 import json
 import textwrap
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, List, Optional
 from provider import provider_manager
 from state.settings_manager import settings_manager
 
 
+_HUNKS_NOTE = (
+    "\nOnly the CHANGED PASSAGES are shown below, each with one paragraph of surrounding context; "
+    "passages are separated by [...] and everything between them is identical in both versions.\n"
+)
+_HUNK_SEPARATOR = "\n\n[...]\n\n"
+
 _DIFF_PROMPT = textwrap.dedent("""\
 You are an analytical text comparison system designed to identify meaningful differences between two versions of the same section.
 
@@ -21,7 +27,7 @@ Compare the ORIGINAL VERSION and MODIFIED VERSION of a section and identify all
 
 Section Type: {section_type}
 Genre: {genre}
-
+{scope_note}
 ORIGINAL VERSION:
 \"\"\"{original_version}\"\"\"
 
@@ -69,6 +75,7 @@ def call_llm_version_diff(
     modified_version: str,
     genre: str = "",
     *,
+    changed_hunks: Optional[List[Tuple[str, str]]] = None,
     api_url: str = None,
     model_name: str = None,
     timeout: int = 300,
@@ -81,7 +88,13 @@ def call_llm_version_diff(
       ("CHANGES_DETECTED", data) – modificări semnificative detectate (data conține cheia "changes")
       ("UNKNOWN", {"raw": content})              – dacă formatul nu e recunoscut
       ("ERROR", {"error": message})            – dacă a eșuat requestul
+
+    changed_hunks: [(pasaj original, pasaj modificat)] din pre-pass-ul local; când e dat,
+    modelul primește doar pasajele modificate în locul versiunilor complete.
     """
+    if changed_hunks:
+        original_version = _HUNK_SEPARATOR.join(old for old, _ in changed_hunks)
+        modified_version = _HUNK_SEPARATOR.join(new for _, new in changed_hunks)
 
 
     prompt = _DIFF_PROMPT.format(
@@ -89,6 +102,7 @@ def call_llm_version_diff(
         original_version=original_version or "",
         modified_version=modified_version or "",
         genre=genre or "unspecified",
+        scope_note=_HUNKS_NOTE if changed_hunks else "",
     )
 
 
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# llm/version_diff/prepass.py
+"""
+Pre-pass local (fără LLM) înaintea comparatorului de versiuni.
+
+classify_change(original, modified) întoarce unul din:
+  ("COSMETIC", [])   – doar spații, punctuație sau majuscule → NO_CHANGES fără apel LLM
+  ("HUNKS", hunks)   – doar pasajele modificate, cu context, de trimis modelului
+  ("FULL", [])       – editarea acoperă mare parte din text → se trimit versiunile complete
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import List, Tuple
+
+CHANGE_COSMETIC = "COSMETIC"
+CHANGE_HUNKS = "HUNKS"
+CHANGE_FULL = "FULL"
+
+COSMETIC_MESSAGE = "Only whitespace, punctuation or capitalization changed."
+
+_CONTEXT_PARAGRAPHS = 1
+_MAX_HUNK_RATIO = 0.6
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCTUATION_RE.sub(" ", (text or "").lower()).split())
+
+
+def _paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in re.split(r"\n\s*\n|\n", text or "") if p.strip()]
+
+
+def classify_change(original: str, modified: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """Hunks: [(pasaj original, pasaj modificat)], fiecare cu câte un paragraf de context în jur."""
+    if _normalize(original) == _normalize(modified):
+        return CHANGE_COSMETIC, []
+
+    a, b = _paragraphs(original), _paragraphs(modified)
+    # paragrafele care diferă doar cosmetic sunt considerate egale
+    opcodes = SequenceMatcher(None, [_normalize(p) for p in a], [_normalize(p) for p in b], autojunk=False).get_opcodes()
+    ranges = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        start_a, end_a = max(0, i1 - _CONTEXT_PARAGRAPHS), min(len(a), i2 + _CONTEXT_PARAGRAPHS)
+        start_b, end_b = max(0, j1 - _CONTEXT_PARAGRAPHS), min(len(b), j2 + _CONTEXT_PARAGRAPHS)
+        if ranges and start_a <= ranges[-1][1] and start_b <= ranges[-1][3]:
+            ranges[-1] = (ranges[-1][0], end_a, ranges[-1][2], end_b)
+        else:
+            ranges.append((start_a, end_a, start_b, end_b))
+
+    hunks = [("\n\n".join(a[s_a:e_a]), "\n\n".join(b[s_b:e_b])) for s_a, e_a, s_b, e_b in ranges]
+    sent = sum(len(old) + len(new) for old, new in hunks)
+    if not hunks or sent > _MAX_HUNK_RATIO * (len(original or "") + len(modified or "")):
+        return CHANGE_FULL, []
+    return CHANGE_HUNKS, hunks
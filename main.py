@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 import gradio as gr
 from ui.interface import create_interface
+from pipeline.jobs import start_job_workers
+from state.llm_cassette import configure_from_env
 
 if __name__ == "__main__":
+    configure_from_env()
     demo = create_interface()
+    start_job_workers()
     demo.launch(server_name="0.0.0.0", server_port=7860)
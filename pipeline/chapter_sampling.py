@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# pipeline/chapter_sampling.py
+"""
+Best-of-N pentru capitole: în loc de scriere → validare → rescriere secvențială,
+se scriu N candidați în paralel (la temperaturi diferite), fiecare este punctat imediat
+(pre-check-uri locale + validatorul LLM) și se păstrează cel mai bun.
+Latența unei runde devine ~ o scriere + o validare, în loc de până la
+MAX_VALIDATION_ATTEMPTS × (scriere + validare).
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional
+
+from state.pipeline_context import PipelineContext
+from state.settings_manager import settings_manager
+from state.llm_telemetry import attribute_calls_to
+from llm.chapter_writer import run_chapter_writer
+from llm.chapter_writer.llm import word_target_range
+from llm.chapter_validator import run_chapter_validator, run_chapter_prechecks, PRECHECK_FAIL, PRECHECK_PASS
+
+_MIN_TEMPERATURE = 0.0
+_MAX_TEMPERATURE = 2.0
+_RESULT_RANK = {"OK": 2, "UNKNOWN": 1, "ERROR": 1, "NOT OK": 0}
+
+
+@dataclass
+class ChapterCandidate:
+    text: str
+    temperature: Optional[float]
+    result: str = "UNKNOWN"
+    details: str = ""
+    precheck: Optional[str] = None
+    llm_validated: bool = False
+
+    def score(self, anpc: Optional[int]) -> tuple:
+        """Cheie de sortare: rezultatul validării, apoi pre-check-urile, apoi apropierea de ținta de cuvinte."""
+        low, high = word_target_range(anpc)
+        words = len(self.text.split())
+        distance = 0 if low <= words <= high else min(abs(words - low), abs(words - high))
+        precheck_rank = {PRECHECK_PASS: 2, PRECHECK_FAIL: 0}.get(self.precheck, 1)
+        return (_RESULT_RANK.get(self.result, 1), precheck_rank, -distance)
+
+
+def best_of_n_count() -> int:
+    """Numărul de candidați din Settings → Pipeline (1 = dezactivat)."""
+    try:
+        return max(1, int(settings_manager.get_pipeline_setting("chapter_best_of_n") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def candidate_temperatures(n: int) -> List[Optional[float]]:
+    """N temperaturi distribuite simetric în jurul temperaturii task-ului chapter_writer."""
+    base = settings_manager.get_task_params("chapter_writer").get("temperature")
+    if base is None or n <= 1:
+        return [None] * n
+    spread = float(settings_manager.get_pipeline_setting("chapter_best_of_n_temperature_spread") or 0.0)
+    offsets = [spread * (i - (n - 1) / 2) / max(1, (n - 1) / 2) for i in range(n)]
+    return [round(min(_MAX_TEMPERATURE, max(_MIN_TEMPERATURE, float(base) + off)), 3) for off in offsets]
+
+
+def _score_candidate(
+    state: PipelineContext,
+    chapter_index: int,
+    chapter_description: Optional[str],
+    candidate: ChapterCandidate,
+) -> ChapterCandidate:
+    """Punctează candidatul pe o copie a contextului în care el ocupă poziția capitolului."""
+    trial = replace(state, chapters_full=list(state.chapters_full[:chapter_index - 1]) + [candidate.text])
+
+    if settings_manager.get_pipeline_setting("chapter_prechecks"):
+        candidate.precheck, pre_details = run_chapter_prechecks(
+            trial,
+            chapter_index,
+            chapter_description,
+            min_word_ratio=float(settings_manager.get_pipeline_setting("chapter_precheck_min_word_ratio")),
+        )
+        if candidate.precheck == PRECHECK_FAIL:
+            candidate.result, candidate.details = "NOT OK", pre_details
+            return candidate
+        if candidate.precheck == PRECHECK_PASS and settings_manager.get_pipeline_setting("chapter_precheck_skip_llm"):
+            candidate.result, candidate.details = "OK", pre_details
+            return candidate
+
+    candidate.result, candidate.details = run_chapter_validator(trial, chapter_index)
+    candidate.llm_validated = True
+    return candidate
+
+
+def sample_best_chapter(
+    state: PipelineContext,
+    chapter_index: int,
+    n: int,
+    *,
+    chapter_description: Optional[str] = None,
+    feedback: Optional[str] = None,
+    previous_output: Optional[str] = None,
+) -> List[ChapterCandidate]:
+    """
+    Scrie (sau revizuiește, dacă feedback + previous_output) N candidați în paralel și îi punctează.
+    Nu modifică `state`; returnează candidații sortați descrescător (primul = cel ales).
+    Contextul trebuie să arate ca pentru un apel normal al writer-ului (capitolul curent
+    neadăugat încă la generare, respectiv deja adăugat la revizie).
+    """
+    owner = threading.get_ident()
+
+    def _write_and_score(temperature: Optional[float]) -> ChapterCandidate:
+        with attribute_calls_to(owner):
+            text = run_chapter_writer(
+                state,
+                chapter_index,
+                chapter_description=chapter_description,
+                feedback=feedback,
+                previous_output=previous_output,
+                temperature=temperature,
+            )
+            return _score_candidate(state, chapter_index, chapter_description, ChapterCandidate(text, temperature))
+
+    temperatures = candidate_temperatures(n)
+    with ThreadPoolExecutor(max_workers=len(temperatures), thread_name_prefix="best-of-n") as pool:
+        candidates = list(pool.map(_write_and_score, temperatures))
+
+    candidates.sort(key=lambda c: c.score(state.anpc), reverse=True)
+    return candidates
+
+
+def describe_candidates(candidates: List[ChapterCandidate]) -> str:
+    """Rezumat scurt pentru log: rezultat + temperatură + cuvinte, în ordinea scorului."""
+    parts = []
+    for c in candidates:
+        temp = f"t={c.temperature}" if c.temperature is not None else "t=default"
+        parts.append(f"{c.result} ({temp}, {len(c.text.split())} words)")
+    return "; ".join(parts)
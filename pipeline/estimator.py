@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+# pipeline/estimator.py
+"""
+Estimator de cost / durată pentru un create run, înainte de a apăsa Generate.
+
+Modelează pipeline-ul (expand → overview → validări overview → N × write / validate)
+cu modelele alese în Settings pentru fiecare task. Throughput-ul (token/s), token-urile
+per cuvânt, rata de eșec și numărul mediu de apeluri per capitol sunt luate din
+telemetria istorică (state/llm_telemetry); fără istoric se folosesc valori implicite.
+Token-urile sunt estimate din caractere, deci și costul este aproximativ.
+"""
+
+from typing import Dict, List, Optional
+
+from pipeline.constants import RUN_MODE_CHOICES
+from state.settings_manager import settings_manager
+from state.llm_telemetry import get_task_stats, get_model_stats, get_runs
+
+WORDS_PER_PAGE = 500
+DEFAULT_CHAPTER_WORDS = 3000
+DEFAULT_TOKENS_PER_WORD = 1.35
+DEFAULT_TOKENS_PER_SEC = 25.0
+DEFAULT_OVERVIEW_VALIDATIONS = 1.5
+DEFAULT_CALLS_PER_CHAPTER = {"chapter_writer": 1.3, "chapter_validator": 1.3}
+
+# Valori implicite (token-uri per apel) pentru task-urile care nu au încă telemetrie.
+_DEFAULT_CALL_SHAPE = {
+    "plot_expander": {"prompt": 900, "output": 1500},
+    "overview_generator": {"prompt": 2200, "output": 0},  # output calculat din numărul de capitole
+    "overview_validator": {"prompt": 0, "output": 350},  # prompt = overview + plot
+    "chapter_writer": {"prompt": 3000, "output": 0},  # + capitolele anterioare, output din anpc
+    "chapter_validator": {"prompt": 1200, "output": 350},  # + capitolul curent
+}
+_OVERVIEW_TOKENS_PER_CHAPTER = 220
+_MIN_RUNS_FOR_HISTORY = 1
+
+
+# ------- Calibrare din telemetrie -------
+
+def _avg_per_call(task_name: str, field: str) -> Optional[float]:
+    stats = get_task_stats(task_name)
+    if not stats:
+        return None
+    ok_calls = stats["calls"] - stats["failed"]
+    if ok_calls <= 0 or not stats.get(field):
+        return None
+    return stats[field] / ok_calls
+
+
+def _tokens_per_word() -> float:
+    stats = get_task_stats("chapter_writer")
+    if stats and stats.get("output_words"):
+        return stats["output_tokens"] / stats["output_words"]
+    return DEFAULT_TOKENS_PER_WORD
+
+
+def _model_profile(model_name: Optional[str]) -> Dict:
+    """Throughput (token-uri output / secundă LLM) și rata de eșec observate pentru un model."""
+    profile = {"tokens_per_sec": DEFAULT_TOKENS_PER_SEC, "failure_rate": 0.0, "measured": False}
+    stats = get_model_stats(model_name) if model_name else None
+    if not stats or stats["calls"] <= 0:
+        return profile
+    if stats["llm_seconds"] > 0 and stats["output_tokens"] > 0:
+        profile["tokens_per_sec"] = stats["output_tokens"] / stats["llm_seconds"]
+        profile["measured"] = True
+    profile["failure_rate"] = min(0.9, stats["failed"] / stats["calls"])
+    return profile
+
+
+def _historical_multipliers() -> Dict[str, float]:
+    """Apeluri medii per capitol (retry-uri de validare incluse) și runde de validare overview."""
+    multipliers = dict(DEFAULT_CALLS_PER_CHAPTER)
+    multipliers["overview_validator"] = DEFAULT_OVERVIEW_VALIDATIONS
+
+    runs = [r for r in get_runs() if r.get("actual")]
+    chapter_runs = [r for r in runs if r["actual"].get("chapters", 0) > 0]
+    if len(chapter_runs) >= _MIN_RUNS_FOR_HISTORY:
+        chapters = sum(r["actual"]["chapters"] for r in chapter_runs)
+        for task in DEFAULT_CALLS_PER_CHAPTER:
+            calls = sum(r["actual"].get("calls_by_task", {}).get(task, 0) for r in chapter_runs)
+            if calls:
+                multipliers[task] = calls / chapters
+
+    overview_runs = [r for r in runs if r["actual"].get("calls_by_task", {}).get("overview_validator")]
+    if len(overview_runs) >= _MIN_RUNS_FOR_HISTORY:
+        multipliers["overview_validator"] = (
+            sum(r["actual"]["calls_by_task"]["overview_validator"] for r in overview_runs) / len(overview_runs)
+        )
+    return multipliers
+
+
+# ------- Model de pipeline -------
+
+def _step(task_name: str, calls: float, prompt_tokens: float, output_tokens: float) -> Dict:
+    """Un pas din pipeline, cu costul / durata calculate pe modelul asignat task-ului."""
+    model = settings_manager.get_model_for_task(task_name)
+    profile = _model_profile(model.name if model else None)
+    # Încercările eșuate consumă timp (până la timeout / eroare) dar nu produc output util.
+    attempts = calls / (1.0 - profile["failure_rate"])
+    seconds = output_tokens / profile["tokens_per_sec"] / (1.0 - profile["failure_rate"])
+    cost = 0.0
+    if model:
+        cost = (prompt_tokens * model.input_price + output_tokens * model.output_price) / 1_000_000
+    return {
+        "task": task_name,
+        "model": model.name if model else "—",
+        "calls": attempts,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "seconds": seconds,
+        "cost": cost,
+        "measured": profile["measured"],
+        "priced": bool(model and (model.input_price or model.output_price)),
+    }
+
+
+def _chapter_words(anpc) -> int:
+    try:
+        pages = int(anpc or 0)
+    except (TypeError, ValueError):
+        pages = 0
+    return pages * WORDS_PER_PAGE if pages > 0 else DEFAULT_CHAPTER_WORDS
+
+
+def estimate_create_run(
+    num_chapters,
+    anpc=None,
+    run_mode: Optional[str] = None,
+    chapters_done: int = 0,
+    has_expanded: bool = False,
+    has_overview: bool = False,
+) -> Dict:
+    """
+    Estimează apelurile, token-urile, durata și costul unui create run.
+    Pașii deja făcuți (plot extins, overview, capitole existente) nu sunt incluși.
+    """
+    try:
+        num_chapters = max(0, int(num_chapters or 0))
+    except (TypeError, ValueError):
+        num_chapters = 0
+    steps: List[Dict] = []
+
+    if run_mode == RUN_MODE_CHOICES["START_EMPTY"]:
+        return _summarize_estimate(steps, num_chapters, 0, chapters_done)
+
+    multipliers = _historical_multipliers()
+    tokens_per_word = _tokens_per_word()
+    chapter_tokens = _chapter_words(anpc) * tokens_per_word
+
+    def shape(task, key):
+        measured = _avg_per_call(task, "prompt_tokens" if key == "prompt" else "output_tokens")
+        return measured if measured is not None else _DEFAULT_CALL_SHAPE[task][key]
+
+    expanded_tokens = _avg_per_call("plot_expander", "output_tokens") or _DEFAULT_CALL_SHAPE["plot_expander"]["output"]
+    overview_tokens = _avg_per_call("overview_generator", "output_tokens") or num_chapters * _OVERVIEW_TOKENS_PER_CHAPTER
+
+    if not has_expanded:
+        steps.append(_step("plot_expander", 1, shape("plot_expander", "prompt"), expanded_tokens))
+
+    if not has_overview:
+        validations = multipliers["overview_validator"]
+        # Fiecare validare NOT OK declanșează o regenerare a overview-ului.
+        generations = 1 + max(0.0, validations - 1)
+        steps.append(_step(
+            "overview_generator", generations,
+            generations * (shape("overview_generator", "prompt") + expanded_tokens),
+            generations * overview_tokens,
+        ))
+        steps.append(_step(
+            "overview_validator", validations,
+            validations * (expanded_tokens + overview_tokens + _DEFAULT_CALL_SHAPE["chapter_validator"]["prompt"]),
+            validations * shape("overview_validator", "output"),
+        ))
+
+    chapters_to_write = 0 if run_mode == RUN_MODE_CHOICES["OVERVIEW"] else max(0, num_chapters - chapters_done)
+    if chapters_to_write:
+        writer_calls = multipliers["chapter_writer"]
+        validator_calls = multipliers["chapter_validator"]
+        base_prompt = _DEFAULT_CALL_SHAPE["chapter_writer"]["prompt"] + expanded_tokens + overview_tokens
+        # Writer-ul primește textul complet al capitolelor anterioare → prompt-ul crește liniar.
+        previous_total = sum(i * chapter_tokens for i in range(chapters_done, chapters_done + chapters_to_write))
+        steps.append(_step(
+            "chapter_writer", chapters_to_write * writer_calls,
+            writer_calls * (chapters_to_write * base_prompt + previous_total),
+            chapters_to_write * writer_calls * chapter_tokens,
+        ))
+        steps.append(_step(
+            "chapter_validator", chapters_to_write * validator_calls,
+            chapters_to_write * validator_calls * (shape("chapter_validator", "prompt") + chapter_tokens),
+            chapters_to_write * validator_calls * shape("chapter_validator", "output"),
+        ))
+
+    return _summarize_estimate(steps, num_chapters, chapters_to_write, chapters_done)
+
+
+def estimate_for_context(context) -> Dict:
+    """Estimarea pentru restul unui run pornit dintr-un PipelineContext (nou sau reluat)."""
+    return estimate_create_run(
+        context.num_chapters,
+        context.anpc,
+        context.run_mode,
+        chapters_done=len(context.chapters_full or []),
+        has_expanded=bool((context.expanded_plot or "").strip()),
+        has_overview=bool((context.chapters_overview or "").strip()),
+    )
+
+
+def _summarize_estimate(steps: List[Dict], num_chapters: int, chapters_to_write: int, chapters_done: int) -> Dict:
+    return {
+        "steps": steps,
+        "chapters": chapters_to_write,
+        "chapters_done": chapters_done,
+        "num_chapters": num_chapters,
+        "calls": sum(s["calls"] for s in steps),
+        "prompt_tokens": sum(s["prompt_tokens"] for s in steps),
+        "output_tokens": sum(s["output_tokens"] for s in steps),
+        "seconds": sum(s["seconds"] for s in steps),
+        "cost": sum(s["cost"] for s in steps),
+        "measured": bool(steps) and all(s["measured"] for s in steps),
+        "priced": bool(steps) and all(s["priced"] for s in steps),
+    }
+
+
+# ------- Formatare -------
+
+def _fmt_duration(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    hours, rem = divmod(seconds, 3600)
+    minutes = rem // 60
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {seconds % 60:02d}s"
+
+
+def _fmt_cost(cost: float, priced: bool) -> str:
+    if not priced and cost == 0:
+        return "n/a"
+    return f"${cost:,.2f}"
+
+
+def format_estimate_markdown(estimate: Dict) -> str:
+    if not estimate["steps"]:
+        return "_Nothing to generate — no LLM calls expected._"
+    lines = [
+        f"**Estimate:** ~{_fmt_duration(estimate['seconds'])} · {_fmt_cost(estimate['cost'], estimate['priced'])} · "
+        f"{estimate['calls']:.0f} LLM calls · ~{estimate['prompt_tokens'] / 1000:,.0f}k in / "
+        f"{estimate['output_tokens'] / 1000:,.0f}k out tokens",
+        "",
+        "| Step | Model | Calls | Time | Cost |",
+        "|---|---|---|---|---|",
+    ]
+    for s in estimate["steps"]:
+        lines.append(
+            f"| {s['task']} | {s['model']} | {s['calls']:.1f} | {_fmt_duration(s['seconds'])} | {_fmt_cost(s['cost'], s['priced'])} |"
+        )
+    notes = []
+    if not estimate["measured"]:
+        notes.append("some models have no telemetry yet (default throughput used)")
+    if not estimate["priced"]:
+        notes.append("set model prices in Settings → Models for cost")
+    if notes:
+        lines.append("")
+        lines.append(f"_Note: {'; '.join(notes)}._")
+    return "\n".join(lines)
+
+
+def format_comparison_markdown(run: Optional[Dict]) -> str:
+    """Estimat vs real pentru o rulare înregistrată (vezi pipeline.jobs.run_create_job)."""
+    if not run or not run.get("estimate") or not run.get("actual"):
+        return "_No finished run recorded yet._"
+    est, act = run["estimate"], run["actual"]
+
+    def ratio(a, e):
+        return f"{(a / e):.2f}×" if e else "—"
+
+    lines = [
+        f"**Last run** ({run.get('finished_at', '')}) — estimated vs actual",
+        "",
+        "| Metric | Estimated | Actual | Actual / Est. |",
+        "|---|---|---|---|",
+        f"| Duration | {_fmt_duration(est['seconds'])} | {_fmt_duration(act['seconds'])} | {ratio(act['seconds'], est['seconds'])} |",
+        f"| LLM calls | {est['calls']:.0f} | {act['calls']} | {ratio(act['calls'], est['calls'])} |",
+        f"| Output tokens | {est['output_tokens']:,.0f} | {act['output_tokens']:,} | {ratio(act['output_tokens'], est['output_tokens'])} |",
+        f"| Cost | {_fmt_cost(est['cost'], est.get('priced', False))} | {_fmt_cost(act['cost'], est.get('priced', False))} | {ratio(act['cost'], est['cost'])} |",
+        f"| Chapters | {est['chapters']} | {act['chapters']} | |",
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# pipeline/events.py
+"""
+Protocol incremental între runner-ele de pipeline și UI.
+
+Runner-ele nu mai yield-uiesc la fiecare pas toată cartea (plot extins, overview,
+toate capitolele, tot log-ul), ci un lot de evenimente tipizate: "capitolul 7 adăugat",
+"linie nouă de log", "secțiunea X înlocuită". EventEmitter calculează evenimentele
+comparând referințele din PipelineContext cu ce s-a emis deja; PipelineView le aplică
+în UI și trimite în Gradio doar componentele modificate (restul sunt gr.update()).
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+from state.pipeline_context import PipelineContext
+
+
+class EventKind(Enum):
+    SECTION_REPLACED = "section_replaced"    # key: expanded / overview / validation
+    SECTION_APPENDED = "section_appended"    # key: validation (doar textul adăugat)
+    CHAPTER_APPENDED = "chapter_appended"    # index 1-based
+    CHAPTER_REPLACED = "chapter_replaced"    # index 1-based
+    CHAPTERS_RESET = "chapters_reset"        # lista completă (start / refresh)
+    LOG_LINE = "log_line"
+    LOG_RESET = "log_reset"                  # lista completă de linii
+    COUNTER = "counter"
+    SHOW_CHAPTER = "show_chapter"            # selectează capitolul în viewer
+    DRAFTS = "drafts"                        # DraftsManager (edit pipeline)
+    TOKENIZED = "tokenized"                  # key: hash overview, value: descrierile per capitol
+    STEP = "step"                            # key: numele pasului din graf, value: status (pipeline/step_graph.py)
+
+
+@dataclass
+class PipelineEvent:
+    kind: EventKind
+    key: Optional[str] = None
+    index: Optional[int] = None
+    value: Any = None
+
+
+SECTION_KEYS = ("expanded", "overview", "validation")
+
+_UNSET = object()
+
+
+def _section_values(state: PipelineContext):
+    return (
+        ("expanded", state.expanded_plot or ""),
+        ("overview", state.chapters_overview or ""),
+        ("validation", state.validation_text or ""),
+    )
+
+
+class EventEmitter:
+    """
+    Transformă starea curentă a unui run în evenimente, față de ultima emitere.
+    Comparațiile sunt pe referințe (O(1) per secțiune, O(nr. capitole) pentru listă),
+    deci costul unui emit nu crește cu lungimea textului.
+    """
+
+    def __init__(self, log: Optional[List[str]] = None):
+        # log explicit (ex: edit_log) sau, implicit, state.status_log
+        self._log = log
+        self._log_ref = None
+        self._log_len = 0
+        self._sections = {key: _UNSET for key in SECTION_KEYS}
+        self._chapters: Optional[List[str]] = None
+        self._counter = _UNSET
+        self._tokenized_hash = None
+
+    def emit(
+        self,
+        state: PipelineContext,
+        counter: Optional[str] = None,
+        show_chapter: Optional[int] = None,
+        drafts: Any = None,
+    ) -> List[PipelineEvent]:
+        events: List[PipelineEvent] = []
+
+        for key, value in _section_values(state):
+            prev = self._sections[key]
+            if prev is _UNSET:
+                events.append(PipelineEvent(EventKind.SECTION_REPLACED, key=key, value=value))
+            elif prev is value or prev == value:
+                continue
+            elif key == "validation" and prev and value.startswith(prev):
+                events.append(PipelineEvent(EventKind.SECTION_APPENDED, key=key, value=value[len(prev):]))
+            else:
+                events.append(PipelineEvent(EventKind.SECTION_REPLACED, key=key, value=value))
+            self._sections[key] = value
+
+        chapters = state.chapters_full or []
+        prev_chapters = self._chapters
+        if prev_chapters is None or len(chapters) < len(prev_chapters):
+            events.append(PipelineEvent(EventKind.CHAPTERS_RESET, value=list(chapters)))
+        else:
+            for i, (old, new) in enumerate(zip(prev_chapters, chapters)):
+                if old is not new:
+                    events.append(PipelineEvent(EventKind.CHAPTER_REPLACED, index=i + 1, value=new))
+            for i in range(len(prev_chapters), len(chapters)):
+                events.append(PipelineEvent(EventKind.CHAPTER_APPENDED, index=i + 1, value=chapters[i]))
+        self._chapters = list(chapters)
+
+        log = self._log if self._log is not None else state.status_log
+        if log is not self._log_ref or len(log) < self._log_len:
+            events.append(PipelineEvent(EventKind.LOG_RESET, value=list(log)))
+        else:
+            for line in log[self._log_len:]:
+                events.append(PipelineEvent(EventKind.LOG_LINE, value=line))
+        self._log_ref = log
+        self._log_len = len(log)
+
+        if state.tokenized_overview_hash and state.tokenized_overview_hash != self._tokenized_hash:
+            events.append(PipelineEvent(EventKind.TOKENIZED, key=state.tokenized_overview_hash, value=list(state.tokenized_overview or [])))
+            self._tokenized_hash = state.tokenized_overview_hash
+
+        if counter is not None and counter != self._counter:
+            events.append(PipelineEvent(EventKind.COUNTER, value=counter))
+            self._counter = counter
+        if show_chapter is not None:
+            events.append(PipelineEvent(EventKind.SHOW_CHAPTER, index=show_chapter))
+        if drafts is not None:
+            events.append(PipelineEvent(EventKind.DRAFTS, value=drafts))
+        return events
+
+
+def snapshot_events(
+    expanded: str = "",
+    overview: str = "",
+    chapters: Optional[List[str]] = None,
+    log: Optional[List[str]] = None,
+    validation: str = "",
+    counter: Optional[str] = None,
+) -> List[PipelineEvent]:
+    """Un lot complet (reset) — pentru ieșiri timpurii / erori, fără EventEmitter."""
+    events = [
+        PipelineEvent(EventKind.SECTION_REPLACED, key="expanded", value=expanded or ""),
+        PipelineEvent(EventKind.SECTION_REPLACED, key="overview", value=overview or ""),
+        PipelineEvent(EventKind.SECTION_REPLACED, key="validation", value=validation or ""),
+        PipelineEvent(EventKind.CHAPTERS_RESET, value=list(chapters or [])),
+        PipelineEvent(EventKind.LOG_RESET, value=list(log or [])),
+    ]
+    if counter is not None:
+        events.append(PipelineEvent(EventKind.COUNTER, value=counter))
+    return events
+
+
+def last_counter(events: Iterable[PipelineEvent]) -> Optional[str]:
+    counter = None
+    for event in events:
+        if event.kind == EventKind.COUNTER:
+            counter = event.value
+    return counter
+
+
+class PipelineView:
+    """
+    Starea UI reconstruită din evenimente. render() returnează tuple-ul de output-uri
+    Gradio, cu valori doar pentru componentele modificate de la ultimul render.
+    """
+
+    def __init__(self):
+        self.sections = {key: "" for key in SECTION_KEYS}
+        self.chapters: List[str] = []
+        self.log: List[str] = []
+        self.counter: str = ""
+        self.drafts: Any = None
+        self.tokenized: Optional[PipelineEvent] = None
+        self.steps: Dict[str, str] = {}  # pas → ultimul status (progresul grafului)
+        self._log_text = ""
+        self._show_chapter: Optional[int] = None
+        self._rendered_choices = -1
+        self._dirty = set()
+
+    def apply(self, events: Iterable[PipelineEvent]) -> "PipelineView":
+        for event in events:
+            kind = event.kind
+            if kind == EventKind.SECTION_REPLACED:
+                self.sections[event.key] = event.value
+                self._dirty.add(event.key)
+            elif kind == EventKind.SECTION_APPENDED:
+                self.sections[event.key] += event.value
+                self._dirty.add(event.key)
+            elif kind == EventKind.CHAPTER_APPENDED:
+                self.chapters.append(event.value)
+                self._dirty.add("chapters")
+            elif kind == EventKind.CHAPTER_REPLACED:
+                if 0 < event.index <= len(self.chapters):
+                    self.chapters[event.index - 1] = event.value
+                    self._dirty.add("chapters")
+            elif kind == EventKind.CHAPTERS_RESET:
+                self.chapters = list(event.value)
+                self._dirty.add("chapters")
+            elif kind == EventKind.LOG_LINE:
+                self.log.append(event.value)
+                self._log_text = f"{self._log_text}\n{event.value}" if self._log_text else event.value
+                self._dirty.add("log")
+            elif kind == EventKind.LOG_RESET:
+                self.log = list(event.value)
+                self._log_text = "\n".join(self.log)
+                self._dirty.add("log")
+            elif kind == EventKind.COUNTER:
+                self.counter = event.value
+                self._dirty.add("counter")
+            elif kind == EventKind.SHOW_CHAPTER:
+                self._show_chapter = event.index
+            elif kind == EventKind.DRAFTS:
+                self.drafts = event.value
+            elif kind == EventKind.TOKENIZED:
+                self.tokenized = event
+            elif kind == EventKind.STEP:
+                self.steps[event.key] = event.value
+        return self
+
+    def snapshot_events(self) -> List[PipelineEvent]:
+        """Lotul minim echivalent cu toate evenimentele aplicate (compactare job-uri terminate)."""
+        events = snapshot_events(
+            self.sections["expanded"],
+            self.sections["overview"],
+            self.chapters,
+            self.log,
+            self.sections["validation"],
+            self.counter or None,
+        )
+        if self.drafts is not None:
+            events.append(PipelineEvent(EventKind.DRAFTS, value=self.drafts))
+        if self.tokenized is not None:
+            events.append(self.tokenized)
+        events += [PipelineEvent(EventKind.STEP, key=name, value=status) for name, status in self.steps.items()]
+        return events
+
+    def render(self) -> tuple:
+        """
+        (expanded, overview, chapters_state, current_text, dropdown, counter, status_log, validation)
+        — aceeași ordine ca ieșirile create pipeline-ului din UI.
+        """
+        import gradio as gr  # import local: runner-ele și CLI-ul folosesc evenimentele fără Gradio
+
+        dirty = self._dirty
+        count = len(self.chapters)
+
+        current_text = gr.update()
+        dropdown = gr.update()
+        if self._show_chapter is not None and 0 < self._show_chapter <= count:
+            dropdown = gr.update(choices=self._choices(), value=f"Chapter {self._show_chapter}")
+            current_text = self.chapters[self._show_chapter - 1]
+            self._rendered_choices = count
+        elif count != self._rendered_choices:
+            if count == 0:
+                dropdown = gr.update(choices=[], value=None)
+                current_text = ""
+            else:
+                dropdown = gr.update(choices=self._choices())
+            self._rendered_choices = count
+        self._show_chapter = None
+
+        output = (
+            self.sections["expanded"] if "expanded" in dirty else gr.update(),
+            self.sections["overview"] if "overview" in dirty else gr.update(),
+            list(self.chapters) if "chapters" in dirty else gr.update(),
+            current_text,
+            dropdown,
+            self.counter if "counter" in dirty else gr.update(),
+            self._log_text if "log" in dirty else gr.update(),
+            self.sections["validation"] if "validation" in dirty else gr.update(),
+        )
+        self._dirty = set()
+        return output
+
+    def render_edit(self) -> tuple:
+        """
+        Ieșirile edit pipeline-ului: consumatorii din Editor folosesc doar log-ul (6)
+        și DraftsManager (8), deci acestea sunt mereu prezente.
+        """
+        output = self.render()
+        return output[:6] + (self._log_text, output[7], self.drafts)
+
+    def _choices(self) -> List[str]:
+        return [f"Chapter {i+1}" for i in range(len(self.chapters))]
+
+
+def compact_events(batches: List[List[PipelineEvent]]) -> List[List[PipelineEvent]]:
+    """Înlocuiește istoricul de loturi al unui job terminat cu un singur lot echivalent."""
+    view = PipelineView()
+    for batch in batches:
+        view.apply(batch)
+    return [view.snapshot_events()]
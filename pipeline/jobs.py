@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+# pipeline/jobs.py
+"""
+Tipurile de job-uri rulate în background (create / edit) peste JobManager.
+UI-ul nu mai ține pipeline-ul în viață: trimite un job și se abonează la progres.
+"""
+
+import time
+import threading
+from collections import Counter
+from typing import Optional
+
+from state.job_manager import JobManager, JobStatus
+from state.pipeline_context import PipelineContext
+from state.checkpoint_manager import get_checkpoint, save_checkpoint
+from state.llm_telemetry import call_count, get_calls, summarize_calls, record_run
+from state import llm_cassette
+from state.settings_manager import settings_manager
+from pipeline.runner_create import generate_book_outline_stream
+from pipeline.runner_edit import run_edit_pipeline_stream
+from pipeline.estimator import estimate_create_run
+from pipeline.events import EventKind, PipelineView, snapshot_events, last_counter, compact_events
+from utils.timestamp import ts_prefix
+from utils.logger import log_ui
+
+JOB_KIND_CREATE = "create"
+JOB_KIND_EDIT = "edit"
+
+
+# ------- Helpers -------
+
+def resume_point_for(context: PipelineContext):
+    """
+    Decide de unde se reia un proiect parțial generat.
+    Returnează "expanded" / "overview" / index capitol (1-based) sau None dacă e complet.
+    """
+    if not (context.expanded_plot or "").strip():
+        return "expanded"
+    if not (context.chapters_overview or "").strip():
+        return "overview"
+    if len(context.chapters_full or []) < (context.num_chapters or 0):
+        return len(context.chapters_full or []) + 1
+    return None
+
+
+def _events_progress(events) -> Optional[str]:
+    return last_counter(events or [])
+
+
+_CONTENT_EVENTS = (EventKind.CHAPTER_APPENDED, EventKind.CHAPTER_REPLACED, EventKind.CHAPTERS_RESET, EventKind.TOKENIZED)
+
+
+def _changes_content(events) -> bool:
+    """Lotul modifică plot-ul extins, overview-ul sau capitolele (deci merită autosalvat)."""
+    for event in events:
+        if event.kind in _CONTENT_EVENTS:
+            return True
+        if event.kind == EventKind.SECTION_REPLACED and event.key in ("expanded", "overview"):
+            return True
+    return False
+
+
+def _queued_output(job_id: str, status_log: str = ""):
+    """Output placeholder afișat cât timp job-ul așteaptă în coadă."""
+    import gradio as gr  # doar pentru UI — CLI-ul (batch.py) importă modulul fără Gradio
+
+    msg = ts_prefix(f"⏳ Job {job_id} queued — waiting for the worker...")
+    log = (status_log + "\n" + msg) if status_log else msg
+    return gr.update(), gr.update(), gr.update(), gr.update(), gr.update(), f"_Queued (job {job_id})_", log, gr.update()
+
+
+def _estimate_for_start(context: PipelineContext, refresh_from=None, run_mode: Optional[str] = None) -> dict:
+    """Estimarea pentru pașii pe care run-ul îi va executa efectiv (ținând cont de refresh point)."""
+    has_expanded = bool((context.expanded_plot or "").strip())
+    has_overview = bool((context.chapters_overview or "").strip())
+    chapters_done = len(context.chapters_full or [])
+    if refresh_from == "expanded":
+        has_expanded, has_overview, chapters_done = False, False, 0
+    elif refresh_from == "overview":
+        has_overview, chapters_done = False, 0
+    elif isinstance(refresh_from, int):
+        chapters_done = min(chapters_done, refresh_from - 1)
+    return estimate_create_run(
+        context.num_chapters,
+        context.anpc,
+        run_mode or context.run_mode,
+        chapters_done=chapters_done,
+        has_expanded=has_expanded,
+        has_overview=has_overview,
+    )
+
+
+def _record_create_run(label: str, estimate: dict, telemetry_start: int, started: float, chapters_written: int) -> None:
+    """Compară estimarea cu realitatea (apeluri din thread-ul curent) și o persistă pentru recalibrare."""
+    if llm_cassette.is_replaying():
+        return  # latențele / costurile redate nu trebuie să recalibreze estimatorul
+    calls = get_calls(telemetry_start, thread_id=threading.get_ident())
+    if not calls:
+        return
+    usage = summarize_calls(calls)
+    prices = {m.name: m for m in settings_manager.get_models()}
+    cost = 0.0
+    for c in calls:
+        model = prices.get(c["model"])
+        if model:
+            cost += (c["prompt_tokens"] * model.input_price + c["output_tokens"] * model.output_price) / 1_000_000
+    record_run({
+        "label": label,
+        "estimate": {k: v for k, v in estimate.items() if k != "steps"},
+        "actual": {
+            "calls": usage["calls"],
+            "failed": usage["failed"],
+            "prompt_tokens": usage["prompt_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "llm_seconds": usage["llm_seconds"],
+            "seconds": time.time() - started,
+            "cost": cost,
+            "chapters": max(0, chapters_written),
+            "calls_by_task": dict(Counter(c["task"] for c in calls)),
+        },
+    })
+
+
+# ------- Job runners -------
+
+def run_create_job(spec: dict):
+    """
+    Rulează generarea unei cărți; autosalvează în proiect dacă job-ul e legat de unul.
+    Checkpoint-ul global (starea tab-ului Create) se scrie doar pentru job-urile pornite din UI.
+    """
+    from state.project_store import read_project_context
+
+    project_name = spec.get("project_name")
+    source = spec.get("source", "new")
+    persist = save_checkpoint if spec.get("ui_owned") else None
+
+    if project_name and (source == "project" or spec.get("resume")):
+        context = read_project_context(project_name)
+        if context is None:
+            raise ValueError(f"Project “{project_name}” not found.")
+        refresh_from = resume_point_for(context)
+        if refresh_from is None:
+            log_ui(context.status_log, f"ℹ️ Project “{project_name}” is already complete.")
+            if persist:
+                persist(context)
+            yield snapshot_events(
+                expanded=context.expanded_plot,
+                overview=context.chapters_overview,
+                chapters=context.chapters_full,
+                log=context.status_log,
+                counter=f"✅ All {len(context.chapters_full)} chapters already complete.",
+            )
+            return
+        stream = generate_book_outline_stream(checkpoint=context, refresh_from=refresh_from, persist=persist)
+        start_context = context
+    elif source == "checkpoint":
+        checkpoint = get_checkpoint()
+        if not checkpoint:
+            yield snapshot_events(log=["⚠️ No checkpoint found."], counter="_No checkpoint_")
+            return
+        stream = generate_book_outline_stream(
+            checkpoint=checkpoint,
+            refresh_from=spec.get("refresh_from"),
+            persist=persist,
+        )
+        start_context = checkpoint
+        refresh_from = spec.get("refresh_from")
+    else:
+        stream = generate_book_outline_stream(
+            spec.get("plot"),
+            spec.get("num_chapters"),
+            spec.get("genre"),
+            spec.get("anpc"),
+            spec.get("run_mode"),
+            persist=persist,
+        )
+        start_context = PipelineContext(
+            num_chapters=spec.get("num_chapters") or 0,
+            anpc=spec.get("anpc"),
+            run_mode=spec.get("run_mode"),
+        )
+        refresh_from = None
+
+    estimate = _estimate_for_start(start_context, refresh_from)
+    chapters_before = estimate["chapters_done"]
+    chapters_after = len(start_context.chapters_full or [])
+    telemetry_start = call_count()
+    started = time.time()
+
+    view = PipelineView()
+    try:
+        for events in stream:
+            yield events
+            view.apply(events)
+            chapters_after = len(view.chapters)
+            if project_name and _changes_content(events):
+                _autosave_project(project_name, spec, view)
+    finally:
+        _record_create_run(project_name or spec.get("source", "new"), estimate, telemetry_start, started, chapters_after - chapters_before)
+
+
+def _autosave_project(project_name: str, spec: dict, view: PipelineView) -> None:
+    """Scrie progresul (plot extins, overview, capitole) în fișierul proiectului."""
+    from state.project_store import write_project_context
+
+    expanded, overview = view.sections["expanded"], view.sections["overview"]
+    if not (expanded or overview or view.chapters):
+        return
+    tokenized = view.tokenized
+    write_project_context(
+        project_name,
+        PipelineContext(
+            plot=spec.get("plot") or "",
+            genre=spec.get("genre") or "",
+            num_chapters=spec.get("num_chapters") or 0,
+            anpc=spec.get("anpc") or 0,
+            expanded_plot=expanded,
+            chapters_overview=overview,
+            chapters_full=list(view.chapters),
+            tokenized_overview=tokenized.value if tokenized else None,
+            tokenized_overview_hash=tokenized.key if tokenized else None,
+        ),
+    )
+
+
+def _run_edit_job(spec: dict):
+    yield from run_edit_pipeline_stream(
+        edited_section=spec.get("edited_section"),
+        diff_data=spec.get("diff_data") or {},
+        impact_data=spec.get("impact_data") or {},
+        impacted_sections=spec.get("impacted_sections") or [],
+        fill_name=spec.get("fill_name"),
+        parallel_chapters=spec.get("parallel_chapters"),
+    )
+
+
+def _create_resumable(spec: dict) -> bool:
+    """
+    Doar job-urile legate de un proiect se pot relua după restart (progresul e autosalvat în proiect).
+    Un job din checkpoint sau o carte nouă fără proiect ar reporni de la zero, deci devin INTERRUPTED.
+    """
+    return bool(spec.get("project_name"))
+
+
+def _register_job_runners():
+    manager = JobManager()
+    manager.register_runner(
+        JOB_KIND_CREATE, run_create_job,
+        resumable=_create_resumable, progress_fn=_events_progress, compact_fn=compact_events,
+    )
+    # Edit-ul depinde de DraftsManager (în memorie), deci nu poate fi reluat după restart.
+    manager.register_runner(
+        JOB_KIND_EDIT, _run_edit_job,
+        resumable=False, progress_fn=_events_progress, compact_fn=compact_events,
+    )
+
+
+_register_job_runners()
+
+
+def start_job_workers() -> None:
+    """Reîncarcă coada persistentă și pornește worker-ii pentru job-urile rămase."""
+    JobManager().restore()
+
+
+# ------- Public API: submit + subscribe -------
+
+def submit_create_job(
+    plot: Optional[str] = None,
+    num_chapters: Optional[int] = None,
+    genre: Optional[str] = None,
+    anpc: Optional[str] = None,
+    run_mode: Optional[str] = None,
+    checkpoint: Optional[PipelineContext] = None,
+    refresh_from=None,
+    project_name: Optional[str] = None,
+    ui_owned: bool = False,
+) -> str:
+    """
+    Trimite un create run ca job. Dacă se dă checkpoint, job-ul pornește din checkpoint-ul curent.
+    ui_owned: job-ul tab-ului Create — doar el își salvează progresul în checkpoint-ul global.
+    """
+    if project_name and checkpoint is None and plot is None:
+        spec = {"source": "project", "project_name": project_name}
+        label = f"Project “{project_name}”"
+    elif checkpoint is not None:
+        spec = {"source": "checkpoint", "refresh_from": refresh_from}
+        label = f"Refresh from {refresh_from}" if refresh_from else "Resume"
+    else:
+        spec = {
+            "source": "new",
+            "plot": plot,
+            "num_chapters": num_chapters,
+            "genre": genre,
+            "anpc": anpc,
+            "run_mode": run_mode,
+            "project_name": project_name,
+        }
+        label = "New book"
+    if ui_owned:
+        spec["ui_owned"] = True
+    return JobManager().submit(JOB_KIND_CREATE, spec, label=label)
+
+
+def job_stream(job_id: str, status_log: str = ""):
+    """
+    Abonare la un create job: aplică loturile de evenimente pe un PipelineView și
+    trimite în UI doar componentele modificate. Cât timp job-ul e în coadă afișează un placeholder.
+    """
+    manager = JobManager()
+    job = manager.get(job_id)
+    if job and job.status == JobStatus.QUEUED.value and job.kind == JOB_KIND_CREATE:
+        yield _queued_output(job_id, status_log)
+    view = PipelineView()
+    for batches in manager.subscribe(job_id):
+        for events in batches:
+            view.apply(events)
+        yield view.render()
+
+
+def create_job_stream(
+    plot: Optional[str] = None,
+    num_chapters: Optional[int] = None,
+    genre: Optional[str] = None,
+    anpc: Optional[str] = None,
+    run_mode: Optional[str] = None,
+    checkpoint: Optional[PipelineContext] = None,
+    refresh_from=None,
+):
+    """
+    Punctul de intrare al UI-ului pentru create pipeline: aceeași semnătură ca
+    generate_book_outline_stream, dar rularea are loc în worker, nu în generatorul Gradio,
+    iar output-urile sunt tuple-uri Gradio incrementale (doar componentele modificate).
+    """
+    job_id = submit_create_job(plot, num_chapters, genre, anpc, run_mode, checkpoint, refresh_from, ui_owned=True)
+    yield from job_stream(job_id)
+
+
+def edit_job_stream(
+    edited_section: str,
+    diff_data: dict,
+    impact_data: dict,
+    impacted_sections: list,
+    fill_name: str = None,
+    parallel_chapters: int = None,
+):
+    """Înlocuitor pentru run_edit_pipeline_stream: rulează edit pipeline-ul ca job."""
+    job_id = JobManager().submit(
+        JOB_KIND_EDIT,
+        {
+            "edited_section": edited_section,
+            "diff_data": diff_data,
+            "impact_data": impact_data,
+            "impacted_sections": impacted_sections,
+            "fill_name": fill_name,
+            "parallel_chapters": parallel_chapters,
+        },
+        label=f"Edit after {edited_section}",
+    )
+    view = PipelineView()
+    for batches in JobManager().subscribe(job_id):
+        for events in batches:
+            view.apply(events)
+        yield view.render_edit()
+
+
+def cancel_ui_create_job() -> bool:
+    """Stop-ul tab-ului Create: anulează job-ul pornit din UI (în coadă sau în rulare), nu job-urile de proiect."""
+    manager = JobManager()
+    for job in manager.list_jobs(JOB_KIND_CREATE):
+        if job.is_active and job.spec.get("ui_owned"):
+            return manager.cancel(job.job_id)
+    return False
+
+
+def cancel_running_job(kind: str) -> bool:
+    """Cere oprirea job-ului care rulează pentru un anumit tip (folosit de butoanele Stop)."""
+    job = JobManager().get_running_job(kind)
+    if not job:
+        return False
+    return JobManager().cancel(job.job_id)
@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 # pipeline/runner_create.py
 
-import gradio as gr
-from typing import Optional
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Callable, Optional, Tuple
 
 from state.pipeline_context import PipelineContext
 from pipeline.constants import RUN_MODE_CHOICES
+from pipeline.events import EventEmitter, snapshot_events
+from pipeline.step_graph import Step, run_step_graph
 from state.pipeline_state import is_stop_requested, clear_stop
 from state.checkpoint_manager import save_checkpoint
 
@@ -13,9 +18,13 @@ from state.checkpoint_manager import save_checkpoint
 from llm.plot_expander import run_plot_expander
 from llm.overview_generator import run_overview_generator
 from llm.overview_validator import run_overview_validator
-from llm.overview_tokenizer import run_overview_tokenizer
-from llm.chapter_writer import run_chapter_writer
-from llm.chapter_validator import run_chapter_validator
+from llm.overview_tokenizer import run_overview_tokenizer, get_cached_tokenization, store_tokenization, describe_hit_rate
+from llm.chapter_writer import run_chapter_writer, chapter_segment_count, chapter_scene_count, revise_chapter_passages
+from llm.chapter_validator import run_chapter_validator, run_chapter_prechecks, parse_validation_issues, PRECHECK_FAIL, PRECHECK_PASS
+from state.settings_manager import settings_manager
+from pipeline.chapter_sampling import sample_best_chapter, best_of_n_count, describe_candidates
+from state.llm_telemetry import attribute_calls_to
+from provider.cascade import describe_cascade
 
 # Utils: logging cu timestamp
 from utils.logger import log_ui
@@ -23,6 +32,9 @@ from typing import List
 
 MAX_VALIDATION_ATTEMPTS = 3
 
+# unde ajunge starea run-ului la fiecare punct de salvare (None = nicăieri, ex: job-uri de fundal)
+Persist = Optional[Callable[[PipelineContext], None]]
+
 
 # ------- Small helpers (rămân locale runner-ului) -------
 
@@ -32,21 +44,13 @@ def vtext_add(section: str, validation_text: str) -> str:
     validation_text = validation_text.rstrip("\n")
     return validation_text + "\n\n" + section
 
-def maybe_pause_pipeline(step_label: str, state: PipelineContext):
+def maybe_pause_pipeline(step_label: str, state: PipelineContext, emitter: EventEmitter, persist: Persist = save_checkpoint):
     if not is_stop_requested():
         return False
-    save_checkpoint(state)
+    if persist:
+        persist(state)
     log_ui(state.status_log, f"🛑 Stop requested — pipeline paused after {step_label}.")
-    yield (
-        state.expanded_plot,
-        state.chapters_overview,
-        state.chapters_full,
-        gr.update(),
-        gr.update(choices=state.choices) if state.choices is not None else gr.update(),
-        "_Paused_",
-        "\n".join(state.status_log),
-        state.validation_text,
-    )
+    yield emitter.emit(state, "_Paused_")
     return True
 
 def apply_refresh_point(state: PipelineContext, refresh_from):
@@ -77,319 +81,513 @@ def _tokenize_chapters(state: PipelineContext) -> List[str]:
     """
     Run tokenization on chapters_overview and log the result.
     Returns list of chapter descriptions, or empty list if tokenization failed.
+    Tokenizarea salvată pentru același overview este refolosită; una nouă este salvată în context.
     """
+    cached = get_cached_tokenization(state)
+    if cached is not None:
+        _log_tokenization(state, "cached")
+        return cached
+
     log_ui(state.status_log, "📑 Tokenizing chapters overview...")
     
     tokenized_chapters, method = run_overview_tokenizer(
         state.chapters_overview or "",
         state.num_chapters
     )
-    
+    store_tokenization(state, tokenized_chapters)
+    _log_tokenization(state, method)
+    return tokenized_chapters
+
+
+def _log_tokenization(state: PipelineContext, method: str) -> None:
+    if method == "cached":
+        log_ui(state.status_log, "📑 Reusing saved chapters tokenization (overview unchanged).")
+        return
     if method == "programmatic":
         log_ui(state.status_log, "✅ Chapters tokenized successfully (programmatic split).")
     elif method == "llm":
         log_ui(state.status_log, "✅ Chapters tokenized successfully (LLM-based split).")
     else:
         log_ui(state.status_log, "⚠️ Chapter tokenization failed — using full overview.")
-    
-    return tokenized_chapters
+    log_ui(state.status_log, f"📊 {describe_hit_rate()}")
 
 
-# ------- Public API: exact semnături folosite de UI -------
-
-def _generate_book_outline_stream_impl(state: PipelineContext):
+def _write_chapter(
+    state: PipelineContext,
+    chapter_index: int,
+    chapter_description: Optional[str],
+    best_of_n: int,
+    feedback: Optional[str] = None,
+    previous_output: Optional[str] = None,
+):
     """
-    Implementarea comună a pipeline-ului de generare.
-    Primește un PipelineContext complet inițializat.
+    Scrie / revizuiește capitolul, simplu sau best-of-N. Nu loghează (poate rula speculativ în alt thread).
+    Returnează (text, candidates) — candidates e None fără best-of-N.
     """
-    # Protecție input gol
-    if not state.plot.strip():
-        yield (
-            "Please enter a plot description.",
-            "",
-            [],
-            "",
-            gr.update(choices=[], value=None),
-            "_No chapters yet_",
-            "⚠️ No input provided.",
-            "",
+    if best_of_n > 1:
+        candidates = sample_best_chapter(
+            state,
+            chapter_index,
+            best_of_n,
+            chapter_description=chapter_description,
+            feedback=feedback,
+            previous_output=previous_output,
         )
-        return
+        return candidates[0].text, candidates
+    text = run_chapter_writer(
+        state,
+        chapter_index,
+        chapter_description=chapter_description,
+        feedback=feedback,
+        previous_output=previous_output,
+    )
+    return text, None
 
-    # Step 1: Expand plot (modularizat)
-    if state.expanded_plot is None:
-        log_ui(state.status_log, "📝 Step 1: Expanding plot...")
-        yield "", "", [], "", gr.update(choices=[], value=None), "_No chapters yet_", "\n".join(state.status_log), state.validation_text
 
-        state = run_plot_expander(state)
-        log_ui(state.status_log, "✅ Plot expanded.")
-        yield state.expanded_plot, "", [], "", gr.update(choices=[], value=None), "_Ready for chapters..._", "\n".join(state.status_log), state.validation_text
+def _revise_locally(state: PipelineContext, chapter_index: int, chapter_description: Optional[str], details: str):
+    """
+    Revizie localizată (Settings → Pipeline): doar paragrafele ancorate de validator.
+    Returnează (text, paragrafe revizuite) sau None → revizie completă.
+    """
+    if not settings_manager.get_pipeline_setting("chapter_local_revision"):
+        return None
+    return revise_chapter_passages(
+        state,
+        chapter_index,
+        state.chapters_full[-1],
+        details,
+        parse_validation_issues(details),
+        chapter_description=chapter_description,
+    )
 
-        if (yield from maybe_pause_pipeline("plot expansion", state)):
-            return
 
-    # Step 2: Generate chapters overview (modularizat)
-    if state.chapters_overview is None:
-        log_ui(state.status_log, "📘 Step 2: Generating chapter overview...")
-        yield state.expanded_plot, "", [], "", gr.update(choices=[], value=None), "_Generating overview..._", "\n".join(state.status_log), state.validation_text
+def _write_chapter_streaming(
+    state: PipelineContext,
+    chapter_index: int,
+    chapter_description: Optional[str],
+    best_of_n: int,
+    emitter: EventEmitter,
+):
+    """
+    Ca _write_chapter pentru un capitol nou, dar când capitolul este scris segmentat (sau pe scene)
+    yield-uiește progresul după fiecare segment (writer-ul rulează într-un thread separat).
+    Folosire: text, candidates = yield from _write_chapter_streaming(...)
+    """
+    if best_of_n > 1 or (chapter_segment_count(state.anpc) <= 1 and chapter_scene_count() <= 1):
+        return _write_chapter(state, chapter_index, chapter_description, best_of_n)
+
+    progress = queue.Queue()
+    owner = threading.get_ident()
+
+    def _write():
+        with attribute_calls_to(owner):
+            return run_chapter_writer(
+                state,
+                chapter_index,
+                chapter_description=chapter_description,
+                on_segment=lambda segment, total, text: progress.put((segment, total, len(text.split()))),
+            )
 
-        state = run_overview_generator(state)
-        log_ui(state.status_log, "✅ Chapters overview generated.")
-        yield state.expanded_plot, state.chapters_overview, [], "", gr.update(choices=[], value=None), "_Overview ready_", "\n".join(state.status_log), state.validation_text
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="segmented") as pool:
+        future = pool.submit(_write)
+        while not (future.done() and progress.empty()):
+            try:
+                segment, total, words = progress.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            log_ui(state.status_log, f"🧱 Chapter {chapter_index}: segment {segment}/{total} written ({words} words so far).")
+            yield emitter.emit(state, f"Generating chapter {chapter_index} — segment {segment}/{total}...")
+    return future.result(), None
 
-        if (yield from maybe_pause_pipeline("chapter overview generation", state)):
-            return
 
-    # Step 3: Validate overview (modularizat)
-    if not state.overview_validated:
-        validation_round = 0
-        feedback = ""
-        while validation_round < MAX_VALIDATION_ATTEMPTS:
-            validation_round += 1
-            result, feedback = run_overview_validator(state)
-
-            if result == "OK":
-                log_ui(state.status_log, "✅ Overview validation passed.")
-                state.validation_text = vtext_add("✅ Chapters Overview Validation: PASSED", state.validation_text)
-                state.overview_validated = True
-                break
-
-            elif result == "NOT OK":
-                log_ui(state.status_log, "⚠️ Overview validation issues found.")
-                state.validation_text = vtext_add(
-                    f"⚠️ Chapters Overview Validation Feedback (attempt {validation_round}):\n{feedback}",
-                    state.validation_text
-                )
-                # Re-gen cu feedback
-                state = run_overview_generator(state, feedback=feedback)
-                log_ui(state.status_log, "🔄 Revised overview with feedback.")
+def _start_speculation(state: PipelineContext, best_of_n: int) -> Optional[Tuple[str, Future]]:
+    """
+    Pornește, în paralel cu validarea overview-ului, tokenizarea și (pentru un run de la zero)
+    scrierea capitolului 1 pe overview-ul curent. Rezultatele sunt folosite doar dacă
+    validarea nu schimbă overview-ul. Returnează (overview, future) sau None.
+    """
+    if state.run_mode == RUN_MODE_CHOICES["OVERVIEW"] or not settings_manager.get_pipeline_setting("speculative_overview_steps"):
+        return None
+
+    write_first = (
+        state.num_chapters > 0
+        and not state.chapters_full
+        and not state.pending_validation_index
+        and (state.next_chapter_index or 1) == 1
+    )
+    snapshot = replace(state, chapters_full=[], status_log=[])
+    owner = threading.get_ident()
 
-            else:
-                # result poate fi "ERROR" / "UNKNOWN"
-                log_ui(state.status_log, f"❌ Overview validation error: {feedback}")
-                state.validation_text = vtext_add(f"❌ Validation Error:\n{feedback}", state.validation_text)
-                break
+    def _speculate():
+        with attribute_calls_to(owner):
+            tokenized, method = get_cached_tokenization(snapshot), "cached"
+            if tokenized is None:
+                tokenized, method = run_overview_tokenizer(snapshot.chapters_overview or "", snapshot.num_chapters)
+            first = None
+            if write_first:
+                first = _write_chapter(snapshot, 1, tokenized[0] if tokenized else None, best_of_n)
+            return tokenized, method, first
 
-            yield state.expanded_plot, state.chapters_overview, [], "", gr.update(choices=[], value=None), "_Validating overview..._", "\n".join(state.status_log), state.validation_text
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative")
+    future = executor.submit(_speculate)
+    executor.shutdown(wait=False)
+    return snapshot.chapters_overview, future
 
-        if not state.overview_validated:
-            # Continuăm oricum (comportament anterior)
-            state.overview_validated = True
 
-        if (yield from maybe_pause_pipeline("overview validation", state)):
-            return
+def _log_candidates(state: PipelineContext, label: str, candidates, best_of_n: int) -> None:
+    log_ui(state.status_log, f"🎲 {label}: best of {best_of_n} — {describe_candidates(candidates)}.")
 
-    # Early stop dacă user a cerut OVERVIEW only
-    if state.run_mode == RUN_MODE_CHOICES["OVERVIEW"]:
-        save_checkpoint(state)
-        log_ui(state.status_log, "⏹️ Stopped after chapters overview as requested.")
-        yield state.expanded_plot, state.chapters_overview, [], "", gr.update(choices=[], value=None), "_Stopped after overview_", "\n".join(state.status_log), state.validation_text
-        return
 
-    # Step 4: Generate & validate chapters (modularizat)
-    log_ui(state.status_log, "🚀 Step 4: Writing chapters...")
-    
-    tokenized_chapters = _tokenize_chapters(state)
-    
-    preloop_choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
-    yield (
-        state.expanded_plot,
-        state.chapters_overview,
-        state.chapters_full,
-        gr.update(),
-        gr.update(choices=preloop_choices),
-        "_Starting chapter generation..._",
-        "\n".join(state.status_log),
-        state.validation_text,
+def _validate_chapter(state: PipelineContext, chapter_index: int, chapter_description: Optional[str]):
+    """
+    Pre-check-uri locale înaintea validatorului LLM (dacă sunt activate în Settings → Pipeline).
+    Returnează (result, details, llm_call_saved).
+    """
+    if not settings_manager.get_pipeline_setting("chapter_prechecks"):
+        result, details = run_chapter_validator(state, chapter_index)
+        return result, details, False
+
+    pre_result, pre_details = run_chapter_prechecks(
+        state,
+        chapter_index,
+        chapter_description,
+        min_word_ratio=float(settings_manager.get_pipeline_setting("chapter_precheck_min_word_ratio")),
     )
+    if pre_result == PRECHECK_FAIL:
+        log_ui(state.status_log, f"⚡ Chapter {chapter_index} failed pre-checks — revising without LLM validation.")
+        return "NOT OK", pre_details, True
+    if pre_result == PRECHECK_PASS and settings_manager.get_pipeline_setting("chapter_precheck_skip_llm"):
+        log_ui(state.status_log, f"⚡ Chapter {chapter_index} passed strict pre-checks — LLM validator skipped.")
+        return "OK", pre_details, True
 
-    if state.pending_validation_index:
-        start_index = int(state.pending_validation_index)
-    elif state.next_chapter_index:
-        start_index = min(int(state.next_chapter_index), len(state.chapters_full) + 1)
-    else:
-        start_index = len(state.chapters_full) + 1
-
-    first_chapter_text = ""
-    first_display_done = len(state.chapters_full) > 0
-
-    for i in range(start_index - 1, state.num_chapters):
-        chapter_desc = tokenized_chapters[i] if tokenized_chapters and i < len(tokenized_chapters) else None
-        current_index = i + 1
-        state.choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
-        is_pending_validation = (state.pending_validation_index == current_index)
-
-        # 4.a Generate (sau retake după resume direct la validare)
-        if not is_pending_validation:
-            log_ui(state.status_log, f"✍️ Generating Chapter {current_index}/{state.num_chapters}...")
-            yield (
-                state.expanded_plot,
-                state.chapters_overview,
-                state.chapters_full,
-                gr.update(),
-                gr.update(choices=state.choices),
-                f"Generating chapter {current_index}...",
-                "\n".join(state.status_log),
-                state.validation_text,
-            )
+    result, details = run_chapter_validator(state, chapter_index)
+    return result, details, False
 
-            # folosim writer-ul modularizat (returnează text; runner decide inserția)
-            chapter_text = run_chapter_writer(state, current_index, chapter_description=chapter_desc)
-            state.chapters_full.append(chapter_text)
-            log_ui(state.status_log, f"✅ Chapter {current_index} generated.")
-
-            state.choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
-            if current_index == 1 and not first_chapter_text:
-                first_chapter_text = state.chapters_full[0]
-            if current_index == 1 and not first_display_done:
-                dropdown_update = gr.update(choices=state.choices, value="Chapter 1")
-                current_text_update = first_chapter_text
-                first_display_done = True
-            else:
-                dropdown_update = gr.update(choices=state.choices)
-                current_text_update = gr.update()
-
-            counter_value = f"📘 {len(state.chapters_full)} chapter(s) generated so far"
-            yield (
-                state.expanded_plot,
-                state.chapters_overview,
-                state.chapters_full,
-                current_text_update,
-                dropdown_update,
-                counter_value,
-                "\n".join(state.status_log),
-                state.validation_text,
+
+# ------- Public API: exact semnături folosite de UI -------
+
+def _expand_step(state: PipelineContext, emitter: EventEmitter):
+    log_ui(state.status_log, "📝 Step 1: Expanding plot...")
+    yield emitter.emit(state, "_No chapters yet_")
+
+    run_plot_expander(state)
+    log_ui(state.status_log, "✅ Plot expanded.")
+    yield emitter.emit(state, "_Ready for chapters..._")
+
+
+def _overview_step(state: PipelineContext, emitter: EventEmitter):
+    log_ui(state.status_log, "📘 Step 2: Generating chapter overview...")
+    yield emitter.emit(state, "_Generating overview..._")
+
+    run_overview_generator(state)
+    log_ui(state.status_log, "✅ Chapters overview generated.")
+    yield emitter.emit(state, "_Overview ready_")
+
+
+def _validate_overview_step(state: PipelineContext, emitter: EventEmitter, run: dict):
+    # tokenizarea + capitolul 1 rulează speculativ cât timp validatorul lucrează
+    started = _start_speculation(state, run["best_of_n"])
+    validation_round = 0
+    feedback = ""
+    while validation_round < MAX_VALIDATION_ATTEMPTS:
+        validation_round += 1
+        result, feedback = run_overview_validator(state)
+
+        if result == "OK":
+            log_ui(state.status_log, "✅ Overview validation passed.")
+            state.validation_text = vtext_add("✅ Chapters Overview Validation: PASSED", state.validation_text)
+            state.overview_validated = True
+            break
+
+        elif result == "NOT OK":
+            log_ui(state.status_log, "⚠️ Overview validation issues found.")
+            state.validation_text = vtext_add(
+                f"⚠️ Chapters Overview Validation Feedback (attempt {validation_round}):\n{feedback}",
+                state.validation_text
             )
+            # Re-gen cu feedback
+            run_overview_generator(state, feedback=feedback)
+            log_ui(state.status_log, "🔄 Revised overview with feedback.")
+
+        else:
+            # result poate fi "ERROR" / "UNKNOWN"
+            log_ui(state.status_log, f"❌ Overview validation error: {feedback}")
+            state.validation_text = vtext_add(f"❌ Validation Error:\n{feedback}", state.validation_text)
+            break
 
-            state.next_chapter_index = current_index
-            state.pending_validation_index = current_index
-            if (yield from maybe_pause_pipeline(f"chapter {current_index} generation", state)):
-                return
+        yield emitter.emit(state, "_Validating overview..._")
 
+    if not state.overview_validated:
+        # Continuăm oricum (comportament anterior)
+        state.overview_validated = True
+
+    if started is not None:
+        spec_overview, spec_future = started
+        if state.chapters_overview == spec_overview:
+            run["speculation"] = spec_future
         else:
-            log_ui(state.status_log, f"▶️ Resuming with validation for Chapter {current_index}...")
-            yield (
-                state.expanded_plot,
-                state.chapters_overview,
-                state.chapters_full,
-                gr.update(),
-                gr.update(choices=state.choices),
-                f"Validating chapter {current_index}...",
-                "\n".join(state.status_log),
-                state.validation_text,
-            )
+            log_ui(state.status_log, "🗑️ Overview changed during validation — discarding speculative tokenization.")
 
-        # 4.b Validate (modularizat)
-        validation_attempts = 0
-        chapter_text = state.chapters_full[current_index - 1]
-        while validation_attempts < MAX_VALIDATION_ATTEMPTS:
+
+def _tokenize_step(state: PipelineContext, emitter: EventEmitter, run: dict):
+    log_ui(state.status_log, "🚀 Step 4: Writing chapters...")
+
+    tokenized_chapters = None
+    if run["speculation"] is not None:
+        try:
+            tokenized_chapters, method, run["speculative_first"] = run["speculation"].result()
+            if method != "cached":
+                log_ui(state.status_log, "📑 Using chapters overview tokenized during overview validation.")
+                store_tokenization(state, tokenized_chapters)
+            _log_tokenization(state, method)
+        except Exception as e:
+            log_ui(state.status_log, f"⚠️ Speculative tokenization failed ({e}) — tokenizing again.")
+            tokenized_chapters, run["speculative_first"] = None, None
+    if tokenized_chapters is None:
+        tokenized_chapters = _tokenize_chapters(state)
+    run["tokenized"] = tokenized_chapters
+
+    yield emitter.emit(state, "_Starting chapter generation..._")
+
+
+def _chapter_description(run: dict, current_index: int) -> Optional[str]:
+    tokenized_chapters = run["tokenized"]
+    i = current_index - 1
+    return tokenized_chapters[i] if tokenized_chapters and i < len(tokenized_chapters) else None
+
+
+def _write_chapter_step(state: PipelineContext, emitter: EventEmitter, run: dict, current_index: int):
+    """4.a Generate: capitolul nou devine draft, în așteptarea validării (pending_validation_index)."""
+    chapter_desc = _chapter_description(run, current_index)
+    best_of_n = run["best_of_n"]
+    state.choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
+    log_ui(state.status_log, f"✍️ Generating Chapter {current_index}/{state.num_chapters}...")
+    yield emitter.emit(state, f"Generating chapter {current_index}...")
+
+    # folosim writer-ul modularizat (returnează text; runner decide inserția)
+    if current_index == 1 and run["speculative_first"] is not None:
+        chapter_text, candidates = run["speculative_first"]
+        run["speculative_first"] = None
+        log_ui(state.status_log, "⚡ Chapter 1 was written while the overview was being validated.")
+    else:
+        chapter_text, candidates = yield from _write_chapter_streaming(state, current_index, chapter_desc, best_of_n, emitter)
+    if candidates:
+        run["validator_calls_saved"] += sum(not c.llm_validated for c in candidates)
+        run["sampled"] = candidates[0]  # candidatul best-of-N ales, deja validat
+        _log_candidates(state, f"Chapter {current_index}", candidates, best_of_n)
+    state.chapters_full.append(chapter_text)
+    log_ui(state.status_log, f"✅ Chapter {current_index} generated.")
+
+    state.choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
+    if current_index == 1 and not run["first_chapter_text"]:
+        run["first_chapter_text"] = state.chapters_full[0]
+    show_chapter = None
+    if current_index == 1 and not run["first_display_done"]:
+        show_chapter = 1
+        run["first_display_done"] = True
+
+    counter_value = f"📘 {len(state.chapters_full)} chapter(s) generated so far"
+    yield emitter.emit(state, counter_value, show_chapter=show_chapter)
+
+    run["written"].add(current_index)
+    state.next_chapter_index = current_index
+    state.pending_validation_index = current_index
+
+
+def _validate_chapter_step(state: PipelineContext, emitter: EventEmitter, run: dict, current_index: int):
+    """4.b Validate (cu revizii) — capitolul devine final."""
+    chapter_desc = _chapter_description(run, current_index)
+    best_of_n = run["best_of_n"]
+    sampled, run["sampled"] = run["sampled"], None
+    if current_index not in run["written"]:
+        log_ui(state.status_log, f"▶️ Resuming with validation for Chapter {current_index}...")
+        yield emitter.emit(state, f"Validating chapter {current_index}...")
+
+    validation_attempts = 0
+    while validation_attempts < MAX_VALIDATION_ATTEMPTS:
+        if sampled is not None:
+            # candidatul best-of-N a fost deja punctat de validator
+            result, details = sampled.result, sampled.details
+            sampled = None
+        else:
             log_ui(state.status_log, f"🧩 Step 5: Validating Chapter {current_index}...")
-            yield (
-                state.expanded_plot,
-                state.chapters_overview,
-                state.chapters_full,
-                gr.update(),
-                gr.update(choices=state.choices),
-                f"Validating chapter {current_index}...",
-                "\n".join(state.status_log),
-                state.validation_text,
-            )
+            yield emitter.emit(state, f"Validating chapter {current_index}...")
 
-            result, details = run_chapter_validator(state, current_index)
+            result, details, saved = _validate_chapter(state, current_index, chapter_desc)
+            run["validator_calls_saved"] += int(saved)
 
-            if result == "OK":
-                state.validation_text = vtext_add(f"✅ Chapter {current_index} Validation: PASSED", state.validation_text)
-                log_ui(state.status_log, f"✅ Chapter {current_index} passed validation.")
-                break
+        if result == "OK":
+            state.validation_text = vtext_add(f"✅ Chapter {current_index} Validation: PASSED", state.validation_text)
+            log_ui(state.status_log, f"✅ Chapter {current_index} passed validation.")
+            break
 
-            elif result == "NOT OK":
-                # salvăm feedback și regenerăm capitolul curent cu writer-ul (revizie)
-                state.validation_text = vtext_add(
-                    f"⚠️ Chapter {current_index} Validation Feedback:\n{details}",
-                    state.validation_text
-                )
-                log_ui(state.status_log, f"⚠️ Chapter {current_index} failed validation — regenerating.")
-
-                yield (
-                    state.expanded_plot,
-                    state.chapters_overview,
-                    state.chapters_full,
-                    gr.update(),
-                    gr.update(choices=state.choices),
-                    f"Regenerating chapter {current_index}...",
-                    "\n".join(state.status_log),
-                    state.validation_text,
-                )
+        elif result == "NOT OK":
+            # salvăm feedback și regenerăm capitolul curent cu writer-ul (revizie)
+            state.validation_text = vtext_add(
+                f"⚠️ Chapter {current_index} Validation Feedback:\n{details}",
+                state.validation_text
+            )
+            log_ui(state.status_log, f"⚠️ Chapter {current_index} failed validation — regenerating.")
 
-                revised = run_chapter_writer(
+            yield emitter.emit(state, f"Regenerating chapter {current_index}...")
+
+            local = _revise_locally(state, current_index, chapter_desc, details) if best_of_n <= 1 else None
+            if local:
+                revised, candidates = local[0], None
+                log_ui(state.status_log, f"🩹 Chapter {current_index}: {local[1]} passage(s) revised in place.")
+            else:
+                revised, candidates = _write_chapter(
                     state,
                     current_index,
-                    chapter_description=chapter_desc,
+                    chapter_desc,
+                    best_of_n,
                     feedback=details,
                     previous_output=state.chapters_full[-1],
                 )
-                state.chapters_full[-1] = revised
-                chapter_text = revised
-                log_ui(state.status_log, f"✅ Chapter {current_index} regenerated successfully.")
+            if candidates:
+                run["validator_calls_saved"] += sum(not c.llm_validated for c in candidates)
+                sampled = candidates[0]
+                _log_candidates(state, f"Chapter {current_index} revision", candidates, best_of_n)
+            state.chapters_full[-1] = revised
+            log_ui(state.status_log, f"✅ Chapter {current_index} regenerated successfully.")
 
-            else:
-                # "UNKNOWN" / "ERROR"
-                state.validation_text = vtext_add(
-                    f"❌ Chapter {current_index} Validation Error:\n{details}",
-                    state.validation_text
-                )
-                log_ui(state.status_log, f"❌ Validation error or unknown result for Chapter {current_index}.")
-                break
+        else:
+            # "UNKNOWN" / "ERROR"
+            state.validation_text = vtext_add(
+                f"❌ Chapter {current_index} Validation Error:\n{details}",
+                state.validation_text
+            )
+            log_ui(state.status_log, f"❌ Validation error or unknown result for Chapter {current_index}.")
+            break
 
-            validation_attempts += 1
+        validation_attempts += 1
 
-        state.next_chapter_index = current_index + 1
-        state.pending_validation_index = None
-        if (yield from maybe_pause_pipeline(f"chapter {current_index} complete", state)):
-            return
-
-        state.choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
-        if current_index == 1 and first_chapter_text and not first_display_done:
-            dropdown_update = gr.update(choices=state.choices, value="Chapter 1")
-            current_text_update = first_chapter_text
-            first_display_done = True
-        else:
-            dropdown_update = gr.update(choices=state.choices)
-            current_text_update = gr.update()
-
-        counter_value = f"📘 {len(state.chapters_full)} chapter(s) generated so far"
-        yield (
-            state.expanded_plot,
-            state.chapters_overview,
-            state.chapters_full,
-            current_text_update,
-            dropdown_update,
-            counter_value,
-            "\n".join(state.status_log),
-            state.validation_text,
+    if sampled is not None and sampled.result == "OK":
+        # ultima revizie best-of-N a trecut deja validarea
+        state.validation_text = vtext_add(f"✅ Chapter {current_index} Validation: PASSED", state.validation_text)
+        log_ui(state.status_log, f"✅ Chapter {current_index} passed validation.")
+
+    state.next_chapter_index = current_index + 1
+    state.pending_validation_index = None
+    if run["validator_calls_saved"] and (is_stop_requested() or current_index == state.num_chapters):
+        log_ui(state.status_log, f"⚡ Pre-checks saved {run['validator_calls_saved']} LLM validator call(s) in this run.")
+
+    state.choices = [f"Chapter {j+1}" for j in range(len(state.chapters_full))]
+    show_chapter = None
+    if current_index == 1 and run["first_chapter_text"] and not run["first_display_done"]:
+        show_chapter = 1
+        run["first_display_done"] = True
+
+    counter_value = f"📘 {len(state.chapters_full)} chapter(s) generated so far"
+    yield emitter.emit(state, counter_value, show_chapter=show_chapter)
+
+
+def _create_graph(state: PipelineContext, emitter: EventEmitter, run: dict) -> List[Step]:
+    """
+    Pașii pipeline-ului de generare ca graf (pipeline/step_graph.py). Fiecare pas știe, din
+    starea salvată, dacă este deja făcut — reluarea pornește de la primul pas neterminat:
+      expand → overview → validare overview → tokenizare → (scriere → validare) per capitol.
+    Capitolul N depinde de capitolul N-1 validat (writer-ul citește capitolele anterioare).
+    """
+    steps = [
+        Step("expand", lambda state: _expand_step(state, emitter), outputs=("expanded_plot",),
+             done=lambda state: state.expanded_plot is not None, label="plot expansion"),
+        Step("overview", lambda state: _overview_step(state, emitter), inputs=("expanded_plot",),
+             outputs=("chapters_overview",), done=lambda state: state.chapters_overview is not None,
+             label="chapter overview generation"),
+        Step("validate overview", lambda state: _validate_overview_step(state, emitter, run),
+             inputs=("chapters_overview",), outputs=("validated_overview",),
+             done=lambda state: bool(state.overview_validated), label="overview validation"),
+    ]
+    # OVERVIEW only: graful se oprește după validarea overview-ului
+    if state.run_mode == RUN_MODE_CHOICES["OVERVIEW"]:
+        return steps
+
+    steps.append(Step("tokenize", lambda state: _tokenize_step(state, emitter, run),
+                      inputs=("validated_overview",), outputs=("tokenization",), label="chapters tokenization"))
+    for index in range(1, (state.num_chapters or 0) + 1):
+        steps.append(Step(
+            f"write chapter {index}",
+            lambda state, index=index: _write_chapter_step(state, emitter, run, index),
+            inputs=("tokenization", f"chapter:{index - 1}"),
+            outputs=(f"draft:{index}",),
+            done=lambda state, index=index: len(state.chapters_full) >= index,
+            label=f"chapter {index} generation",
+        ))
+        steps.append(Step(
+            f"validate chapter {index}",
+            lambda state, index=index: _validate_chapter_step(state, emitter, run, index),
+            inputs=(f"draft:{index}",),
+            outputs=(f"chapter:{index}",),
+            done=lambda state, index=index: len(state.chapters_full) >= index and state.pending_validation_index != index,
+            label=f"chapter {index} complete",
+        ))
+    return steps
+
+
+# ------- Public API: exact semnături folosite de UI -------
+
+def _generate_book_outline_stream_impl(state: PipelineContext, persist: Persist = save_checkpoint):
+    """
+    Implementarea comună a pipeline-ului de generare.
+    Primește un PipelineContext complet inițializat.
+    persist primește starea după fiecare pas (checkpoint-ul global doar când UI-ul deține run-ul).
+    Yield-uiește loturi de evenimente (vezi pipeline/events.py), nu starea completă.
+    """
+    # Protecție input gol
+    if not state.plot.strip():
+        yield snapshot_events(
+            expanded="Please enter a plot description.",
+            log=["⚠️ No input provided."],
+            counter="_No chapters yet_",
         )
+        return
+
+    emitter = EventEmitter()
+    # starea run-ului curent, împărțită între pași (nu se salvează în checkpoint)
+    run = {
+        "best_of_n": best_of_n_count(),
+        "speculation": None,
+        "speculative_first": None,
+        "tokenized": None,
+        "sampled": None,
+        "written": set(),
+        "validator_calls_saved": 0,
+        "first_chapter_text": "",
+        "first_display_done": len(state.chapters_full) > 0,
+    }
+
+    paused = yield from run_step_graph(
+        _create_graph(state, emitter, run),
+        state,
+        on_complete=(lambda step, state: persist(state)) if persist else None,
+        on_pause=lambda label: maybe_pause_pipeline(label, state, emitter, persist),
+    )
+    if paused:
+        return
+
+    # Early stop dacă user a cerut OVERVIEW only
+    if state.run_mode == RUN_MODE_CHOICES["OVERVIEW"]:
+        if persist:
+            persist(state)
+        log_ui(state.status_log, "⏹️ Stopped after chapters overview as requested.")
+        yield emitter.emit(state, "_Stopped after overview_")
+        return
 
     # Finalizare
     log_ui(state.status_log, "🎉 All chapters generated successfully!")
-    final_choices = [f"Chapter {i+1}" for i in range(len(state.chapters_full))]
-    dropdown_final = gr.update(choices=final_choices)
+    cascade_line = describe_cascade()
+    if cascade_line:
+        log_ui(state.status_log, f"🪜 {cascade_line}")
     counter_final = f"✅ All {len(state.chapters_full)} chapters generated!"
     state.validation_text = vtext_add("🎯 All validations passed successfully.", state.validation_text)
 
     state.next_chapter_index = None
     state.pending_validation_index = None
-    save_checkpoint(state)
-
-    yield (
-        state.expanded_plot,
-        state.chapters_overview,
-        state.chapters_full,
-        gr.update(),
-        dropdown_final,
-        counter_final,
-        "\n".join(state.status_log),
-        state.validation_text,
-    )
+    if persist:
+        persist(state)
+
+    yield emitter.emit(state, counter_final)
 
 
 def generate_book_outline_stream(
@@ -399,11 +597,12 @@ def generate_book_outline_stream(
     anpc: Optional[str] = None,
     run_mode: Optional[str] = None,
     checkpoint: Optional[PipelineContext] = None,
-    refresh_from=None
+    refresh_from=None,
+    persist: Persist = save_checkpoint,
 ):
     """
-    Orchestrarea completă (streaming) pentru UI.
-    Păstrează semnătura/ordinul de yield identic cu versiunea anterioară.
+    Orchestrarea completă (streaming).
+    Yield-uiește loturi de PipelineEvent; UI-ul le aplică prin pipeline.events.PipelineView.
     """
     clear_stop()
 
@@ -430,15 +629,15 @@ def generate_book_outline_stream(
             run_mode=run_mode,
         )
 
-    yield from _generate_book_outline_stream_impl(state)
+    yield from _generate_book_outline_stream_impl(state, persist)
 
 
-def generate_book_outline_stream_resume(checkpoint: PipelineContext):
+def generate_book_outline_stream_resume(checkpoint: PipelineContext, persist: Persist = save_checkpoint):
     """
     Wrapper simplu pentru resume - apelează implementarea comună direct cu checkpoint-ul.
     """
     clear_stop()
     if checkpoint.run_mode == RUN_MODE_CHOICES["OVERVIEW"] and checkpoint.chapters_overview and len(checkpoint.chapters_full or []) < (checkpoint.num_chapters or 1):
         checkpoint.run_mode = RUN_MODE_CHOICES["FULL"]
-    yield from _generate_book_outline_stream_impl(checkpoint)
+    yield from _generate_book_outline_stream_impl(checkpoint, persist)
 
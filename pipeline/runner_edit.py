@@ -5,9 +5,11 @@ Pipeline pentru editarea selectivă a secțiunilor bazat pe impact analysis.
 Rulează doar pașii necesari pentru secțiunile identificate ca impactate.
 """
 
-import gradio as gr
+from dataclasses import replace
 
 from state.pipeline_context import PipelineContext
+from pipeline.events import EventEmitter, snapshot_events
+from pipeline.step_graph import Step, run_step_graph
 from state.pipeline_state import is_stop_requested, clear_stop
 from state.checkpoint_manager import get_checkpoint
 
@@ -17,7 +19,10 @@ from llm.overview_editor import run_overview_editor
 from llm.chapter_editor import run_chapter_editor
 
 from utils.logger import log_ui
+from provider.cascade import describe_cascade
 from state.drafts_manager import DraftsManager, DraftType
+from state.settings_manager import settings_manager
+from utils.renames import rename_in_text
 
 
 def _get_section_impact(impact_data: dict, section_name: str) -> str:
@@ -39,85 +44,100 @@ def _get_section_impact(impact_data: dict, section_name: str) -> str:
     return None
 
 
-def run_edit_pipeline_stream(
-    edited_section: str,
-    diff_data: dict,
-    impact_data: dict,
-    impacted_sections: list,
-    fill_name: str = None,
-):
-    """
-    Rulează pipeline-ul de editare pentru secțiunile impactate.
-    
-    Args:
-        edited_section: Numele secțiunii editate de user (ex: "Chapter 4")
-        diff_data: Datele diff-ului din version_diff
-        impact_data: Datele impact-ului din impact_analyzer
-        impacted_sections: Lista de nume de secțiuni impactate
-    
-    Yields:
-        (expanded_plot, chapters_overview, chapters_full, current_text, dropdown, counter, status_log, validation_text, drafts_dict)
-    """
-    clear_stop()
-    
-    checkpoint = get_checkpoint()
-    if not checkpoint:
-        yield "", "", [], "", gr.update(choices=[]), "_Error_", "⚠️ No checkpoint found.", "", {}
-        return
-    
-    # Initialize state from checkpoint (temporary state)
-    state = checkpoint
-    
-    # Dictionary to store drafts: {section_name: new_content}
-    drafts = DraftsManager()
-    
-    # Creează un log nou doar pentru edit pipeline (nu modificăm state.status_log existent)
-    edit_log = []
-    
-    diff_summary = ""
-    if diff_data.get("changes"):
-        diff_summary = "\n".join(f"- {item}" for item in diff_data.get("changes", []) if item)
-    else:
-        diff_summary = diff_data.get("message", "")
+def _parallel_chapter_workers() -> int:
+    """Câte capitole sunt adaptate simultan (Settings → Pipeline; 1 = secvențial)."""
+    try:
+        return max(1, int(settings_manager.get_pipeline_setting("edit_parallel_chapters") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _adapt_chapter(context, checkpoint, drafts, chapter_name, chapter_num, impact_reason, **edit_args) -> str:
+    """Adaptează un capitol. Priority: USER Draft > Checkpoint content."""
+    original_chapter = drafts.get_content(chapter_name, DraftType.USER.value)
+    if original_chapter is None:
+        original_chapter = checkpoint.chapters_full[chapter_num - 1] or ""
     
-    # Yield cu log-urile existente (edit_log este gol la început)
-    yield (
-        state.expanded_plot or "",
-        state.chapters_overview or "",
-        state.chapters_full or [],
-        gr.update(),
-        gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-        "_Adapting sections..._",
-        "\n".join(edit_log),
-        state.validation_text,
-        drafts
+    return run_chapter_editor(
+        context=context,
+        chapter_index=chapter_num,
+        original_chapter=original_chapter,
+        impact_reason=impact_reason,
+        **edit_args,
     )
-    
-    if (yield from _maybe_pause_pipeline("edit pipeline start", state, drafts)):
-        return
-    
-    # 1. Edit Expanded Plot dacă e impactat
-    if "Expanded Plot" in impacted_sections:
-        impact_reason = _get_section_impact(impact_data, "Expanded Plot")
-        if impact_reason:
-            log_ui(edit_log, "📝 Adapting Expanded Plot...")
-            yield (
-                state.expanded_plot or "",
-                state.chapters_overview or "",
-                state.chapters_full or [],
-                gr.update(),
-                gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-                "_Adapting Expanded Plot..._",
-                "\n".join(edit_log),
-                state.validation_text,
-                drafts
+
+
+def _apply_renames(state, checkpoint, renames, impacted_sections, drafts, emitter, edit_log):
+    """
+    Calea rapidă pentru redenumiri: înlocuire whole-word locală în fiecare secțiune impactată.
+    Secțiunile ambigue rămân pentru pipeline-ul LLM. Returnează lista lor (folosire: yield from).
+    """
+    remaining = []
+    renamed = 0
+    for name in impacted_sections:
+        source = drafts.get_content(name, DraftType.USER.value)
+        if name == "Expanded Plot":
+            source = state.expanded_plot if source is None else source
+        elif name == "Chapters Overview":
+            source = state.chapters_overview if source is None else source
+        elif name.startswith("Chapter ") and name.split()[1].isdigit() and 0 < int(name.split()[1]) <= len(checkpoint.chapters_full or []):
+            source = checkpoint.chapters_full[int(name.split()[1]) - 1] if source is None else source
+        else:
+            remaining.append(name)
+            continue
+
+        updated = rename_in_text(source or "", renames)
+        if updated is None:
+            remaining.append(name)
+            continue
+        if name == "Expanded Plot":
+            state.expanded_plot = updated
+        elif name == "Chapters Overview":
+            state.chapters_overview = updated
+        else:
+            state.chapters_full[int(name.split()[1]) - 1] = updated
+        drafts.add_generated(name, updated)
+        renamed += 1
+
+    log_ui(edit_log, f"⚡ Rename applied locally to {renamed} section(s)" + (f"; {len(remaining)} left for the LLM." if remaining else "."))
+    yield emitter.emit(state, "_Rename applied_", drafts=drafts)
+    return remaining
+
+
+def _edit_graph(state, checkpoint, drafts, emitter, edit_log, *, edited_section, diff_data, impact_data,
+                impacted_sections, fill_name, diff_summary, workers):
+    """
+    Pașii edit pipeline-ului ca graf (pipeline/step_graph.py):
+      renames → Expanded Plot → Chapters Overview → capitole.
+    Cu workers > 1 capitolele sunt independente între ele (rulează în paralel pe snapshot-ul de după
+    overview); altfel fiecare capitol depinde de cel anterior și vede versiunea lui adaptată.
+    """
+    # secțiunile rămase pentru LLM după calea rapidă de redenumire
+    remaining = set(impacted_sections)
+    steps = []
+
+    if diff_data.get("renames"):
+        def _renames(state):
+            left = yield from _apply_renames(
+                state, checkpoint, diff_data["renames"], impacted_sections, drafts, emitter, edit_log
             )
+            remaining.intersection_update(left)
+        steps.append(Step("renames", _renames, outputs=("renames",), label="rename"))
+
+    def _skip_unless_remaining(name):
+        return lambda state: name not in remaining
+
+    impact_reason = _get_section_impact(impact_data, "Expanded Plot")
+    if "Expanded Plot" in impacted_sections and impact_reason:
+        def _plot(state, impact_reason=impact_reason):
+            log_ui(edit_log, "📝 Adapting Expanded Plot...")
+            yield emitter.emit(state, "_Adapting Expanded Plot..._", drafts=drafts)
             
             # Priority: USER Draft > Checkpoint content
             original_plot = drafts.get_content("Expanded Plot", DraftType.USER.value)
             if original_plot is None:
                 original_plot = state.expanded_plot or ""
-            state = run_plot_editor(
+            run_plot_editor(
                 context=state,
                 original_plot=original_plot,
                 impact_reason=impact_reason,
@@ -128,44 +148,23 @@ def run_edit_pipeline_stream(
             drafts.add_generated("Expanded Plot", state.expanded_plot)
             log_ui(edit_log, "✅ Expanded Plot adapted.")
             # DO NOT SAVE CHECKPOINT
-            
-            yield (
-                state.expanded_plot or "",
-                state.chapters_overview or "",
-                state.chapters_full or [],
-                gr.update(),
-                gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-                "_Expanded Plot adapted_",
-                "\n".join(edit_log),
-                state.validation_text,
-                drafts
-            )
-            
-            if (yield from _maybe_pause_pipeline("expanded plot adaptation", state, drafts)):
-                return
-    
-    # 2. Edit Chapters Overview dacă e impactat
-    if "Chapters Overview" in impacted_sections:
-        impact_reason = _get_section_impact(impact_data, "Chapters Overview")
-        if impact_reason:
+            yield emitter.emit(state, "_Expanded Plot adapted_", drafts=drafts)
+        steps.append(Step(
+            "Expanded Plot", _plot, inputs=("renames",), outputs=("expanded_plot",),
+            done=_skip_unless_remaining("Expanded Plot"), label="expanded plot adaptation",
+        ))
+
+    impact_reason = _get_section_impact(impact_data, "Chapters Overview")
+    if "Chapters Overview" in impacted_sections and impact_reason:
+        def _overview(state, impact_reason=impact_reason):
             log_ui(edit_log, "📘 Adapting Chapters Overview...")
-            yield (
-                state.expanded_plot or "",
-                state.chapters_overview or "",
-                state.chapters_full or [],
-                gr.update(),
-                gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-                "_Adapting Chapters Overview..._",
-                "\n".join(edit_log),
-                state.validation_text,
-                drafts
-            )
+            yield emitter.emit(state, "_Adapting Chapters Overview..._", drafts=drafts)
             
             # Priority: USER Draft > Checkpoint content
             original_overview = drafts.get_content("Chapters Overview", DraftType.USER.value)
             if original_overview is None:
                 original_overview = state.chapters_overview or ""
-            state = run_overview_editor(
+            run_overview_editor(
                 context=state,
                 original_overview=original_overview,
                 impact_reason=impact_reason,
@@ -176,24 +175,15 @@ def run_edit_pipeline_stream(
             drafts.add_generated("Chapters Overview", state.chapters_overview)
             log_ui(edit_log, "✅ Chapters Overview adapted.")
             # DO NOT SAVE CHECKPOINT
-            
-            yield (
-                state.expanded_plot or "",
-                state.chapters_overview or "",
-                state.chapters_full or [],
-                gr.update(),
-                gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-                "_Chapters Overview adapted_",
-                "\n".join(edit_log),
-                state.validation_text,
-                drafts
-            )
-            
-            if (yield from _maybe_pause_pipeline("chapters overview adaptation", state, drafts)):
-                return
-    
-    # 3. Edit capitolele impactate
+            yield emitter.emit(state, "_Chapters Overview adapted_", drafts=drafts)
+        steps.append(Step(
+            "Chapters Overview", _overview, inputs=("renames", "expanded_plot"), outputs=("chapters_overview",),
+            done=_skip_unless_remaining("Chapters Overview"), label="chapters overview adaptation",
+        ))
+
+    edit_args = dict(diff_summary=diff_summary, edited_section=edited_section, fill_name=fill_name)
     chapters_to_edit = [s for s in impacted_sections if s.startswith("Chapter ")]
+    previous = None
     for chapter_name in sorted(chapters_to_edit, key=lambda x: int(x.split()[1]) if x.split()[1].isdigit() else 0):
         try:
             chapter_num = int(chapter_name.split()[1])
@@ -206,92 +196,150 @@ def run_edit_pipeline_stream(
         impact_reason = _get_section_impact(impact_data, chapter_name)
         if not impact_reason:
             continue
-        
-        log_ui(edit_log, f"✍️ Adapting {chapter_name}...")
-        yield (
-            state.expanded_plot or "",
-            state.chapters_overview or "",
-            state.chapters_full or [],
-            gr.update(),
-            gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-            f"_Adapting {chapter_name}..._",
-            "\n".join(edit_log),
-            state.validation_text,
-            drafts
-        )
-        
-        # Priority: USER Draft > Checkpoint content
-        original_chapter = drafts.get_content(chapter_name, DraftType.USER.value)
-        if original_chapter is None:
-            original_chapter = checkpoint.chapters_full[chapter_num - 1] or ""
-        
-        edited_chapter = run_chapter_editor(
-            context=state,
-            chapter_index=chapter_num,
-            original_chapter=original_chapter,
-            impact_reason=impact_reason,
-            diff_summary=diff_summary,
-            edited_section=edited_section,
-            fill_name=fill_name,
-        )
-        
-        state.chapters_full[chapter_num - 1] = edited_chapter
-        drafts.add_generated(chapter_name, edited_chapter)
-        log_ui(edit_log, f"✅ {chapter_name} adapted.")
-        # DO NOT SAVE CHECKPOINT
-        
-        yield (
-            state.expanded_plot or "",
-            state.chapters_overview or "",
-            state.chapters_full or [],
-            gr.update(),
-            gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]),
-            f"_{chapter_name} adapted_",
-            "\n".join(edit_log),
-            state.validation_text,
-            drafts
-        )
-        
-        if (yield from _maybe_pause_pipeline(f"{chapter_name} adaptation", state, drafts)):
-            return
+
+        def _adapt(context, chapter_name=chapter_name, chapter_num=chapter_num, impact_reason=impact_reason):
+            return _adapt_chapter(context, checkpoint, drafts, chapter_name, chapter_num, impact_reason, **edit_args)
+
+        def _store(state, edited_chapter, chapter_name=chapter_name, chapter_num=chapter_num):
+            state.chapters_full[chapter_num - 1] = edited_chapter
+            drafts.add_generated(chapter_name, edited_chapter)
+            log_ui(edit_log, f"✅ {chapter_name} adapted.")
+            # DO NOT SAVE CHECKPOINT
+            yield emitter.emit(state, f"_{chapter_name} adapted_", drafts=drafts)
+
+        def _adapt_inline(state, _adapt=_adapt, _store=_store):
+            yield from _store(state, _adapt(state))
+
+        inputs = ("renames", "expanded_plot", "chapters_overview")
+        if workers <= 1 and previous:
+            inputs += (previous,)
+        steps.append(Step(
+            chapter_name,
+            _adapt if workers > 1 else _adapt_inline,
+            inputs=inputs,
+            outputs=(f"chapter:{chapter_num}",),
+            done=_skip_unless_remaining(chapter_name),
+            parallel=workers > 1,
+            apply=_store,
+            label=f"{chapter_name} adaptation",
+        ))
+        previous = f"chapter:{chapter_num}"
+    return steps
+
+
+def run_edit_pipeline_stream(
+    edited_section: str,
+    diff_data: dict,
+    impact_data: dict,
+    impacted_sections: list,
+    fill_name: str = None,
+    parallel_chapters: int = None,
+):
+    """
+    Rulează pipeline-ul de editare pentru secțiunile impactate.
+    
+    Args:
+        edited_section: Numele secțiunii editate de user (ex: "Chapter 4")
+        diff_data: Datele diff-ului din version_diff
+        impact_data: Datele impact-ului din impact_analyzer
+        impacted_sections: Lista de nume de secțiuni impactate
+        parallel_chapters: Câte capitole sunt adaptate simultan; None = Settings → Pipeline (folosit de Regenerate Selected)
+    
+    Yields:
+        Loturi de PipelineEvent (vezi pipeline/events.py); DraftsManager vine ca eveniment DRAFTS.
+    """
+    clear_stop()
+    
+    checkpoint = get_checkpoint()
+    if not checkpoint:
+        yield snapshot_events(log=["⚠️ No checkpoint found."], counter="_Error_")
+        return
+    
+    # Initialize state from checkpoint (temporary state)
+    state = checkpoint
+    
+    # Dictionary to store drafts: {section_name: new_content}
+    drafts = DraftsManager()
+    
+    # Creează un log nou doar pentru edit pipeline (nu modificăm state.status_log existent)
+    edit_log = []
+    emitter = EventEmitter(log=edit_log)
+    
+    diff_summary = ""
+    if diff_data.get("changes"):
+        diff_summary = "\n".join(f"- {item}" for item in diff_data.get("changes", []) if item)
+    else:
+        diff_summary = diff_data.get("message", "")
+    
+    # Yield cu log-urile existente (edit_log este gol la început)
+    yield emitter.emit(state, "_Adapting sections..._", drafts=drafts)
+    
+    if (yield from _maybe_pause_pipeline("edit pipeline start", state, drafts, emitter)):
+        return
+    
+    workers = max(1, parallel_chapters or _parallel_chapter_workers())
+    steps = _edit_graph(
+        state, checkpoint, drafts, emitter, edit_log,
+        edited_section=edited_section, diff_data=diff_data, impact_data=impact_data,
+        impacted_sections=impacted_sections, fill_name=fill_name, diff_summary=diff_summary, workers=workers,
+    )
+    # capitolele paralele văd toate aceeași stare: cea de după Expanded Plot / Chapters Overview
+    frozen = {}
+
+    def _snapshot(state):
+        if "state" not in frozen:
+            frozen["state"] = replace(state, chapters_full=list(state.chapters_full))
+        return frozen["state"]
+
+    def _on_start(step, state):
+        # Expanded Plot / Chapters Overview își loghează singure pornirea
+        if step.name.startswith("Chapter "):
+            log_ui(edit_log, f"✍️ Adapting {step.name}...")
+            yield emitter.emit(state, f"_Adapting {step.name}..._", drafts=drafts)
+
+    failed = []
+
+    def _on_error(step, error):
+        failed.append(step.name)
+        log_ui(edit_log, f"❌ {step.name} adaptation failed: {error}")
+
+    paused = yield from run_step_graph(
+        steps, state,
+        workers=workers,
+        snapshot=_snapshot,
+        on_start=_on_start,
+        on_pause=lambda label: _maybe_pause_pipeline(label, state, drafts, emitter),
+        on_error=_on_error,
+    )
+    if paused:
+        return
     
     # Finalizare
-    log_ui(edit_log, f"🎉 Adaptive editing pipeline completed!")
-    final_choices = [f"Chapter {i+1}" for i in range(len(state.chapters_full))]
-    dropdown_final = gr.update(choices=final_choices)
-    counter_final = f"✅ Adaptation complete for {len(impacted_sections)} section(s)"
+    if failed:
+        # capitolele eșuate rămân cu draft-ul anterior (sau fără draft) — nu le raportăm ca adaptate
+        counter_final = (
+            f"⚠️ Adapted {len(impacted_sections) - len(failed)}/{len(impacted_sections)} section(s); "
+            f"failed: {', '.join(failed)}"
+        )
+        log_ui(edit_log, counter_final)
+    else:
+        log_ui(edit_log, f"🎉 Adaptive editing pipeline completed!")
+        counter_final = f"✅ Adaptation complete for {len(impacted_sections)} section(s)"
+    cascade_line = describe_cascade()
+    if cascade_line:
+        log_ui(edit_log, f"🪜 {cascade_line}")
     
     # DO NOT SAVE CHECKPOINT
     
-    yield (
-        state.expanded_plot or "",
-        state.chapters_overview or "",
-        state.chapters_full or [],
-        gr.update(),
-        dropdown_final,
-        counter_final,
-        "\n".join(edit_log),
-        state.validation_text,
-        drafts
-    )
+    yield emitter.emit(state, counter_final, drafts=drafts)
 
 
-def _maybe_pause_pipeline(step_label: str, state: PipelineContext, drafts: DraftsManager):
+def _maybe_pause_pipeline(step_label: str, state: PipelineContext, drafts: DraftsManager, emitter: EventEmitter):
     """Helper pentru pauză pipeline (similar cu runner.py)."""
     if not is_stop_requested():
         return False
     # DO NOT SAVE CHECKPOINT
     log_ui(state.status_log, f"🛑 Stop requested — pipeline paused after {step_label}.")
-    yield (
-        state.expanded_plot or "",
-        state.chapters_overview or "",
-        state.chapters_full or [],
-        gr.update(),
-        gr.update(choices=[f"Chapter {i+1}" for i in range(len(state.chapters_full))]) if state.chapters_full else gr.update(choices=[]),
-        "_Paused_",
-        "\n".join(state.status_log),
-        state.validation_text,
-        drafts
-    )
+    yield emitter.emit(state, "_Paused_", drafts=drafts)
     return True
 
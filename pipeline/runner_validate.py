@@ -11,9 +11,14 @@ from handlers.editor.utils import format_validation_markdown
 from state.checkpoint_manager import get_checkpoint, get_section_content
 from state.infill_manager import InfillManager
 from state.drafts_manager import DraftsManager, DraftType
-from llm.version_diff import call_llm_version_diff
-from llm.impact_analyzer import call_llm_impact_analysis
+from llm.version_diff import call_llm_version_diff, classify_change, CHANGE_COSMETIC, CHANGE_FULL, CHANGE_HUNKS, COSMETIC_MESSAGE
+from llm.impact_analyzer import run_impact_analysis
 from llm.overview_validator_after_edit import call_llm_overview_validator_after_edit
+from state.settings_manager import settings_manager
+from utils.renames import detect_renames, describe_renames, mentions, rename_in_text
+from state.section_index import SectionIndex, changed_text
+
+_PREFILTER_MIN_SCORE_RATIO = 0.2
 
 
 def _format_overview_validation_errors(errors):
@@ -138,10 +143,104 @@ def build_candidate_sections(section: str, checkpoint):
 
 
 
+def prefilter_candidates(section: str, candidates, query: str):
+    """
+    Păstrează Expanded Plot / Chapters Overview și doar capitolele relevante pentru termenii modificați
+    (index invers local), plus o marjă de siguranță: primele N capitole candidate (cele imediat următoare).
+    Capitolele care menționează o entitate modificată sunt păstrate indiferent de scor.
+    Returnează (candidates filtrați, câte capitole au fost eliminate).
+    """
+    try:
+        margin = int(settings_manager.get_pipeline_setting("impact_prefilter_margin"))
+    except (TypeError, ValueError):
+        margin = -1
+    chapters = [name for name, _ in candidates if name.startswith("Chapter ")]
+    if margin < 0 or len(chapters) <= margin or not query.strip():
+        return candidates, 0
+
+    index = SectionIndex().view(candidates)
+    ranked = index.rank(query, chapters)
+    top = ranked[0][1] if ranked else 0.0
+    keep = set(chapters[:margin])
+    keep.update(index.mentioning(query, chapters))
+    keep.update(name for name, score in ranked if score > 0 and score >= _PREFILTER_MIN_SCORE_RATIO * top)
+    filtered = [(name, content) for name, content in candidates if not name.startswith("Chapter ") or name in keep]
+    return filtered, len(candidates) - len(filtered)
+
+
+def _book_sections(section: str, checkpoint):
+    """Toate secțiunile cărții în afară de cea editată (USER draft > checkpoint)."""
+    drafts_mgr = DraftsManager()
+    names = ["Expanded Plot", "Chapters Overview"] + [f"Chapter {i}" for i in range(1, len(checkpoint.chapters_full or []) + 1)]
+    for name in names:
+        if name == section:
+            continue
+        if drafts_mgr.has_type(name, DraftType.USER.value):
+            yield name, drafts_mgr.get_content(name, DraftType.USER.value) or ""
+        else:
+            yield name, get_section_content(name) or ""
+
+
+def _rename_fast_path(section, original_version, draft, checkpoint):
+    """
+    Editare care este doar o redenumire (ex: "Robert" → "Michael"): planul se construiește local,
+    fără version_diff / impact_analyzer, pe toate secțiunile care menționează numele.
+    Returnează (msg, plan, False) sau None dacă editarea nu este o redenumire.
+    """
+    if not settings_manager.get_pipeline_setting("rename_fast_path"):
+        return None
+    # Expanded Plot / Chapters Overview confirmă numele care în secțiune apar doar la început de propoziție
+    reference = "\n\n".join(get_section_content(name) or "" for name in ("Expanded Plot", "Chapters Overview"))
+    renames = detect_renames(original_version, draft or "", reference)
+    if not renames:
+        return None
+
+    diff_data = {"changes": [f"Renamed {describe_renames(renames)}."], "renames": renames}
+    impact_entries, ambiguous = [], []
+    for name, content in _book_sections(section, checkpoint):
+        if not mentions(content, renames):
+            continue
+        reason = " ".join(
+            f'Replace all instances of "{r["old"]}" with "{r["new"]}" throughout the text, preserving all other content unchanged.'
+            for r in renames
+        )
+        impact_entries.append({"name": name, "reason": reason})
+        if rename_in_text(content, renames) is None:
+            ambiguous.append(name)
+    impacted = [entry["name"] for entry in impact_entries]
+
+    if not impacted:
+        msg = format_validation_markdown("CHANGES_DETECTED", diff_data)
+        return _append_warnings(section, msg), None, False
+
+    impact_data = {"impacted_sections": impact_entries}
+    msg = format_validation_markdown("CHANGES_DETECTED", diff_data, "IMPACT_DETECTED", impact_data, impacted)
+    local = len(impacted) - len(ambiguous)
+    msg += f"\n\n⚡ Rename detected locally: {local} section(s) will be updated without the LLM"
+    msg += f"; {len(ambiguous)} ambiguous section(s) will be adapted by the LLM ({', '.join(ambiguous)})." if ambiguous else "."
+    plan = {
+        "edited_section": section,
+        "diff_data": diff_data,
+        "impact_data": impact_data,
+        "impacted_sections": impacted,
+        "fill_name": None,
+    }
+    return _append_warnings(section, msg), plan, False
+
+
 def run_validate_pipeline(section, draft):
+    return run_validate_pipeline_with_outcome(section, draft)[0]
+
+
+def run_validate_pipeline_with_outcome(section, draft):
+    """
+    Ca run_validate_pipeline, dar întoarce și rezultatul structurat: ((msg, plan, flag), outcome).
+    outcome: "PLAN" (plan de editare), "NO_CHANGES", "NO_IMPACT", "INVALID" (overview respins),
+    "ERROR" sau "UNKNOWN" (răspuns LLM în format neașteptat).
+    """
     checkpoint = get_checkpoint()
     if not checkpoint:
-        return "Error: No checkpoint found.", None, False
+        return ("Error: No checkpoint found.", None, False), "ERROR"
 
     im = InfillManager()
     is_fill = im.is_fill(section)
@@ -154,20 +253,30 @@ def run_validate_pipeline(section, draft):
         diff_data = {"changes": [chapter_msg]}
     else:
         original_version = get_section_content(section) or ""
+        change, hunks = CHANGE_FULL, []
+        if settings_manager.get_pipeline_setting("version_diff_prepass"):
+            change, hunks = classify_change(original_version, draft or "")
+        if change == CHANGE_COSMETIC:
+            msg = format_validation_markdown("NO_CHANGES", {"message": COSMETIC_MESSAGE})
+            return (_append_warnings(section, msg), None, False), "NO_CHANGES"
+        fast_path = _rename_fast_path(section, original_version, draft, checkpoint)
+        if fast_path:
+            return fast_path, "PLAN" if fast_path[1] else "NO_IMPACT"
         result, diff_data = call_llm_version_diff(
             section_type=section,
             original_version=original_version,
             modified_version=draft or "",
             genre=checkpoint.genre or "",
+            changed_hunks=hunks if change == CHANGE_HUNKS else None,
         )
 
     if result in {"ERROR", "UNKNOWN", "NO_CHANGES"}:
         msg = format_validation_markdown(result, diff_data)
-        return _append_warnings(section, msg), None, False
+        return (_append_warnings(section, msg), None, False), result
 
     if result != "CHANGES_DETECTED":
         msg = format_validation_markdown(result, diff_data)
-        return _append_warnings(section, msg), None, False
+        return (_append_warnings(section, msg), None, False), "UNKNOWN"
 
     if diff_data.get("changes"):
         diff_summary_text = "\n".join(f"- {item}" for item in diff_data.get("changes", []) if item)
@@ -195,13 +304,17 @@ def run_validate_pipeline(section, draft):
                 errors.append(f"Chapter addition detected. Adding chapters is supported through Add Fill. {reason}".strip())
             if errors:
                 msg = _format_overview_validation_errors(errors)
-                return msg, None, True
+                return (msg, None, True), "INVALID"
         elif validator_result == "ERROR":
             error_msg = validator_data.get("error", "Unknown error")
             msg = f"## ❌ Overview validation error\n\n{error_msg}"
-            return msg, None, True
+            return (msg, None, True), "ERROR"
 
     candidates = build_candidate_sections(section, checkpoint)
+    skipped_candidates = 0
+    if not is_fill:
+        query = changed_text(original_version, draft or "") + "\n" + diff_summary_text
+        candidates, skipped_candidates = prefilter_candidates(section, candidates, query)
 
     if is_fill and chapter_num is not None:
         section_name_for_impact = f"Chapter {chapter_num} (Candidate)"
@@ -209,7 +322,7 @@ def run_validate_pipeline(section, draft):
         section_name_for_impact = section
 
     total_chapters = len(checkpoint.chapters_full or [])
-    impact_result, impact_data, impacted = call_llm_impact_analysis(
+    impact_result, impact_data, impacted = run_impact_analysis(
         section_name=section_name_for_impact,
         edited_section_content=draft or "",
         diff_summary=diff_summary_text,
@@ -219,6 +332,8 @@ def run_validate_pipeline(section, draft):
     )
 
     msg = format_validation_markdown(result, diff_data, impact_result, impact_data, impacted)
+    if skipped_candidates:
+        msg += f"\n\n🔎 Pre-filter: {skipped_candidates} chapter(s) with no overlap with the edited terms were not sent to impact analysis."
     plan = {
         "edited_section": section_name_for_impact,
         "diff_data": diff_data,
@@ -227,5 +342,6 @@ def run_validate_pipeline(section, draft):
         "fill_name": section if is_fill else None,
     } if impact_result == "IMPACT_DETECTED" and impacted else None
 
-    return _append_warnings(section, msg), plan, False
+    outcome = "PLAN" if plan else ("NO_IMPACT" if impact_result in ("NO_IMPACT", "IMPACT_DETECTED") else "ERROR")
+    return (_append_warnings(section, msg), plan, False), outcome
 
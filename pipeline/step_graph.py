@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# pipeline/step_graph.py
+"""
+Executor mic pentru pipeline-uri exprimate ca DAG de pași (create / edit).
+
+Fiecare Step își declară artefactele citite (inputs) și produse (outputs); dependențele
+rezultă din ele — un pas pornește când toți producătorii input-urilor lui s-au terminat.
+Input-urile pe care nu le produce niciun pas vin din starea inițială (checkpoint).
+
+- Pașii secvențiali (parallel=False) sunt generatoare rulate în thread-ul pipeline-ului
+  și pot yield-ui loturi de evenimente (progres fin, ex: segmente).
+- Pașii paraleli (parallel=True) rulează run(snapshot) într-un pool, pe o copie a stării din
+  momentul pornirii; apply(state, result) aplică rezultatul în thread-ul pipeline-ului.
+- Resume: un pas al cărui done(state) este True la momentul în care devine gata este marcat
+  terminat fără a rula (starea salvată îl conține deja).
+- on_start(step, state) rulează în thread-ul pipeline-ului când pasul pornește (log / contor).
+- După fiecare pas: on_complete(step, state) (checkpoint) și verificarea stop-ului; la stop nu
+  mai pornesc pași noi, cei în curs sunt așteptați, apoi on_pause(label) yield-uiește pauza.
+- Fluxul de progres uniform: pentru fiecare pas un eveniment STEP (running / done / skipped / failed).
+  Un pas paralel eșuat este raportat prin on_error; pașii care depind de el nu mai rulează.
+"""
+
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from pipeline.events import EventKind, PipelineEvent
+from state.llm_telemetry import attribute_calls_to
+from state.pipeline_state import is_stop_requested
+
+STEP_RUNNING = "running"
+STEP_DONE = "done"
+STEP_SKIPPED = "skipped"
+STEP_FAILED = "failed"
+
+
+class StepGraphError(ValueError):
+    """Graf invalid: artefact produs de doi pași, nume duplicat sau ciclu."""
+
+
+@dataclass
+class Step:
+    name: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    done: Optional[Callable[[Any], bool]] = None
+    parallel: bool = False
+    apply: Optional[Callable[[Any, Any], Optional[Iterator[List[PipelineEvent]]]]] = None
+    label: Optional[str] = None  # pentru mesajul de pauză ("paused after <label>")
+
+
+def _step_event(step: Step, status: str) -> List[PipelineEvent]:
+    return [PipelineEvent(EventKind.STEP, key=step.name, value=status)]
+
+
+def _dependencies(steps: Sequence[Step]) -> Dict[str, Set[str]]:
+    """name → numele pașilor de care depinde; validează graful (fără cicluri)."""
+    producers: Dict[str, str] = {}
+    names: Set[str] = set()
+    for step in steps:
+        if step.name in names:
+            raise StepGraphError(f"Duplicate step name: {step.name}")
+        names.add(step.name)
+        for output in step.outputs:
+            if output in producers:
+                raise StepGraphError(f"'{output}' is produced by both {producers[output]} and {step.name}")
+            producers[output] = step.name
+    deps = {step.name: {producers[i] for i in step.inputs if i in producers} - {step.name} for step in steps}
+
+    remaining = {name: set(d) for name, d in deps.items()}
+    while remaining:
+        free = [name for name, d in remaining.items() if not d]
+        if not free:
+            raise StepGraphError(f"Cycle between steps: {', '.join(sorted(remaining))}")
+        for name in free:
+            del remaining[name]
+        for d in remaining.values():
+            d.difference_update(free)
+    return deps
+
+
+def _no_events():
+    return
+    yield
+
+
+def run_step_graph(
+    steps: Sequence[Step],
+    state: Any,
+    *,
+    workers: int = 1,
+    snapshot: Callable[[Any], Any] = lambda state: state,
+    on_complete: Optional[Callable[[Step, Any], None]] = None,
+    on_start: Optional[Callable[[Step, Any], Optional[Iterator[List[PipelineEvent]]]]] = None,
+    on_pause: Optional[Callable[[str], Iterator[List[PipelineEvent]]]] = None,
+    on_error: Optional[Callable[[Step, Exception], None]] = None,
+):
+    """
+    Rulează graful până la capăt sau până la stop. Pașii gata sunt porniți în ordinea din `steps`.
+    Returnează True dacă pipeline-ul a fost oprit (folosire: paused = yield from run_step_graph(...)).
+    """
+    deps = _dependencies(steps)
+    pending: List[Step] = list(steps)
+    finished: Set[str] = set()
+    running: Dict[Any, Step] = {}
+    owner = threading.get_ident()
+    stopped = False
+    last_label = None
+
+    def _ready() -> List[Step]:
+        return [s for s in pending if deps[s.name] <= finished]
+
+    def _finish(step: Step):
+        nonlocal stopped, last_label
+        finished.add(step.name)
+        last_label = step.label or step.name
+        if on_complete:
+            on_complete(step, state)
+        if not stopped and is_stop_requested():
+            stopped = True
+
+    def _started(step: Step):
+        yield _step_event(step, STEP_RUNNING)
+        if on_start:
+            yield from (on_start(step, state) or _no_events())
+
+    def _run_parallel(step: Step, view: Any):
+        with attribute_calls_to(owner):
+            return step.run(view)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="step") as pool:
+        while pending or running:
+            progressed = False
+            for step in _ready():
+                if step.done and step.done(state):
+                    pending.remove(step)
+                    finished.add(step.name)
+                    yield _step_event(step, STEP_SKIPPED)
+                    progressed = True
+            if progressed:
+                continue
+
+            if not stopped:
+                for step in _ready():
+                    if not step.parallel or len(running) >= max(1, workers):
+                        continue
+                    pending.remove(step)
+                    running[pool.submit(_run_parallel, step, snapshot(state))] = step
+                    yield from _started(step)
+
+                sequential = next((s for s in _ready() if not s.parallel), None)
+                if sequential is not None:
+                    pending.remove(sequential)
+                    yield from _started(sequential)
+                    yield from (sequential.run(state) or _no_events())
+                    _finish(sequential)
+                    yield _step_event(sequential, STEP_DONE)
+                    continue
+
+            if not running:
+                break
+
+            done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=lambda f: steps.index(running[f])):
+                step = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # dependenții pasului eșuat nu mai pornesc; restul grafului continuă
+                    if on_error:
+                        on_error(step, e)
+                    yield _step_event(step, STEP_FAILED)
+                    continue
+                if step.apply:
+                    yield from (step.apply(state, result) or _no_events())
+                _finish(step)
+                yield _step_event(step, STEP_DONE)
+            if not stopped and is_stop_requested():
+                stopped = True
+
+    if stopped and on_pause:
+        return (yield from on_pause(last_label or "start"))
+    return stopped
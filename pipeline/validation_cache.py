@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+# pipeline/validation_cache.py
+"""
+Cache pentru planurile de validare (run_validate_pipeline), cheiat pe
+(secțiune, hash-ul draft-ului, versiunea checkpoint-ului, amprenta celorlalte draft-uri,
+setările care schimbă planul). Se păstrează doar planurile reale și rezultatele NO_CHANGES;
+erorile și răspunsurile în format neașteptat se recalculează la următorul Validate.
+
+- validate_section: Validate din orice mod al editorului. Discard → editare → Validate din nou,
+  sau comutarea între moduri, refolosesc planul cât timp nici draft-ul, nici cartea nu s-au schimbat.
+- schedule_validation: validare speculativă în fundal când un draft este păstrat (Keep Draft) sau
+  rămâne neschimbat câteva secunde; Validate întoarce apoi rezultatul instant.
+
+Cache-ul este LRU, limitat la _MAX_ENTRIES planuri. Acceptarea oricărei secțiuni salvează checkpoint-ul
+(versiune nouă), iar intrările calculate pe versiunea veche sunt eliminate la următorul acces.
+"""
+
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from state.checkpoint_manager import get_checkpoint_version
+from state.drafts_manager import DraftsManager, DraftType
+from state.settings_manager import settings_manager
+from pipeline.runner_validate import run_validate_pipeline_with_outcome
+from provider.cascade import describe_cascade
+
+IDLE_SECONDS = 5.0
+_MAX_ENTRIES = 32
+# setările din Settings → Pipeline care schimbă planul produs pentru același draft
+_PLAN_SETTINGS = ("rename_fast_path", "version_diff_prepass", "impact_prefilter_margin", "impact_shard_chapters")
+_CACHEABLE_OUTCOMES = ("PLAN", "NO_CHANGES")
+
+Key = Tuple[str, str, int, str, str]
+
+_lock = threading.Lock()
+_results: "OrderedDict[Key, tuple]" = OrderedDict()
+_running: Dict[Key, Future] = {}
+_timers: Dict[str, threading.Timer] = {}
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-validate")
+
+
+def _hash(*parts: str) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _drafts_fingerprint(section: str) -> str:
+    """Draft-urile USER / FILL ale celorlalte secțiuni (validarea le citește în locul checkpoint-ului)."""
+    drafts_mgr = DraftsManager()
+    parts = []
+    for name in sorted(set(drafts_mgr.get_user_drafts()) | set(drafts_mgr.get_fill_drafts())):
+        if name != section:
+            parts += [name, drafts_mgr.get_content(name, DraftType.USER.value) or drafts_mgr.get_content(name) or ""]
+    return _hash(*parts)
+
+
+def _settings_fingerprint() -> str:
+    return _hash(*(str(settings_manager.get_pipeline_setting(name)) for name in _PLAN_SETTINGS))
+
+
+def validation_key(section: str, content: str) -> Key:
+    return section, _hash(content), get_checkpoint_version(), _drafts_fingerprint(section), _settings_fingerprint()
+
+
+def _evict_stale() -> None:
+    """Elimină planurile calculate pe un checkpoint mai vechi (o secțiune a fost acceptată între timp). Apelat sub _lock."""
+    version = get_checkpoint_version()
+    for key in [k for k in _results if k[2] != version]:
+        del _results[key]
+
+
+def _store(key: Key, result: tuple) -> None:
+    with _lock:
+        _evict_stale()
+        _results[key] = copy.deepcopy(result)
+        _results.move_to_end(key)
+        while len(_results) > _MAX_ENTRIES:
+            _results.popitem(last=False)
+
+
+def _lookup(key: Key) -> Optional[tuple]:
+    with _lock:
+        _evict_stale()
+        result = _results.get(key)
+        if result is None:
+            return None
+        _results.move_to_end(key)
+        # handlerele pot modifica planul (ex: Regenerate) — fiecare primește o copie
+        return copy.deepcopy(result)
+
+
+def clear_validation_cache() -> None:
+    with _lock:
+        _results.clear()
+
+
+def _validate_and_store(key: Key, section: str, content: str) -> tuple:
+    result, outcome = run_validate_pipeline_with_outcome(section, content)
+    if outcome in _CACHEABLE_OUTCOMES:
+        _store(key, result)
+    return result
+
+
+def _run(key: Key, section: str, content: str) -> Optional[tuple]:
+    try:
+        result = _validate_and_store(key, section, content)
+    except Exception:
+        result = None
+    with _lock:
+        _running.pop(key, None)
+    return result
+
+
+def _start(section: str, content: str) -> None:
+    key = validation_key(section, content)
+    with _lock:
+        _timers.pop(section, None)
+        _evict_stale()
+        if key in _results or key in _running:
+            return
+        _running[key] = _executor.submit(_run, key, section, content)
+
+
+def schedule_validation(section: str, content: str, delay: float = IDLE_SECONDS) -> None:
+    """
+    Programează validarea speculativă (Settings → Pipeline). Un nou apel pentru aceeași secțiune
+    înainte de expirarea întârzierii o reprogramează (debounce); delay=0 pornește imediat.
+    """
+    if not section or not content or not settings_manager.get_pipeline_setting("speculative_validation"):
+        return
+    with _lock:
+        timer = _timers.pop(section, None)
+    if timer:
+        timer.cancel()
+    if delay <= 0:
+        _start(section, content)
+        return
+    timer = threading.Timer(delay, _start, args=(section, content))
+    timer.daemon = True
+    with _lock:
+        _timers[section] = timer
+    timer.start()
+
+
+def validate_section(section: str, content: str):
+    """
+    Înlocuitor pentru run_validate_pipeline în handlere: planul din cache dacă draft-ul și contextul
+    sunt aceleași (așteaptă validarea din fundal dacă rulează deja pentru aceeași cheie), altfel
+    validare normală, al cărei rezultat intră în cache.
+    """
+    key = validation_key(section, content)
+    result = _lookup(key)
+    if result is None:
+        with _lock:
+            future = _running.get(key)
+        if future is not None and future.result() is not None:
+            result = _lookup(key)
+    if result is None:
+        result = _validate_and_store(key, section, content)
+    return _with_cascade_line(result)
+
+
+def _with_cascade_line(result: tuple) -> tuple:
+    """Adaugă la mesaj economia cascadei de validatori (calculată acum, nu cea din cache)."""
+    cascade_line = describe_cascade()
+    if not cascade_line:
+        return result
+    msg, *rest = result
+    return (f"{msg}\n\n🪜 {cascade_line}", *rest)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+# provider/cascade.py
+"""
+Cascadă pentru validatori: verdictul este cerut întâi unui model rapid / ieftin (ex: LM Studio local),
+setat ca „Cascade Model” pe task. Un verdict clar (format recunoscut + CONFIDENCE peste prag) este
+acceptat; altfel (UNKNOWN, eroare, încredere mică) cererea este repetată pe modelul task-ului.
+
+Telemetria (contoare persistente, grupul "validator_cascade") ține per task: verdicte acceptate,
+escaladări și estimarea timpului / costului economisit față de rularea directă pe modelul task-ului.
+"""
+
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from state.settings_manager import settings_manager
+from state.llm_telemetry import count_event, get_event_counts, get_task_stats, estimate_tokens
+from state import llm_cassette
+from provider import provider_manager
+
+CASCADE_GROUP = "validator_cascade"
+
+CONFIDENCE_INSTRUCTION = (
+    "After your answer, add one final line in exactly this form:\n"
+    "CONFIDENCE: <number from 0 to 100>\n"
+    "where the number says how sure you are of your verdict."
+)
+_CONFIDENCE_RE = re.compile(r"^[\s*_`]*CONFIDENCE[\s*_`]*:\s*(\d{1,3})\s*%?[\s*_`]*$", re.IGNORECASE | re.MULTILINE)
+
+
+def split_confidence(content: Optional[str]) -> Tuple[str, Optional[int]]:
+    """Separă linia CONFIDENCE de verdict. Returnează (textul fără ea, încrederea sau None)."""
+    if not content:
+        return "", None
+    matches = list(_CONFIDENCE_RE.finditer(content))
+    if not matches:
+        return content.strip(), None
+    last = matches[-1]
+    text = (content[:last.start()] + content[last.end():]).strip()
+    return text, min(100, int(last.group(1)))
+
+
+def _min_confidence() -> int:
+    try:
+        return int(settings_manager.get_pipeline_setting("validator_cascade_min_confidence") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _model(name: Optional[str]):
+    return next((m for m in settings_manager.get_models() if m.name == name), None)
+
+
+def _call_cost(model, prompt_tokens: int, output_tokens: int) -> float:
+    if not model:
+        return 0.0
+    return (prompt_tokens * (model.input_price or 0) + output_tokens * (model.output_price or 0)) / 1_000_000
+
+
+def _typical_latency(task_name: str, model_name: Optional[str]) -> float:
+    """Durata medie istorică a task-ului pe modelul dat (0 dacă nu există istoric)."""
+    stats = get_task_stats(task_name, model_name) if model_name else None
+    ok_calls = (stats or {}).get("calls", 0) - (stats or {}).get("failed", 0)
+    return stats["llm_seconds"] / ok_calls if stats and ok_calls > 0 else 0.0
+
+
+def _record(task_name: str, outcome: str, seconds_saved: float, cost_saved: float) -> None:
+    if llm_cassette.is_replaying():
+        return  # răspunsurile redate dintr-o casetă nu sunt economii reale
+    count_event(CASCADE_GROUP, f"{task_name}.{outcome}")
+    count_event(CASCADE_GROUP, f"{task_name}.seconds_saved", round(seconds_saved, 3))
+    count_event(CASCADE_GROUP, f"{task_name}.cost_saved", round(cost_saved, 6))
+
+
+def get_validator_response(
+    task_name: str,
+    messages: List[Dict[str, str]],
+    is_decisive: Callable[[str], bool],
+) -> str:
+    """
+    Înlocuiește provider_manager.get_llm_response pentru validatori.
+    is_decisive(text) spune dacă textul (fără linia CONFIDENCE) este un verdict clar, în formatul validatorului.
+    Fără cascade model configurat, este exact apelul normal.
+    """
+    cascade_model = settings_manager.get_cascade_model(task_name)
+    if not cascade_model:
+        return provider_manager.get_llm_response(task_name=task_name, messages=messages)
+
+    cascade_messages = messages + [{"role": "user", "content": CONFIDENCE_INSTRUCTION}]
+    started = time.perf_counter()
+    try:
+        raw = provider_manager.get_llm_response(task_name=task_name, messages=cascade_messages, model_override=cascade_model)
+    except Exception:
+        raw = None
+    elapsed = time.perf_counter() - started
+
+    content, confidence = split_confidence(raw)
+    prompt_tokens = estimate_tokens("".join(m.get("content") or "" for m in cascade_messages))
+    output_tokens = estimate_tokens(raw)
+    cheap_cost = _call_cost(_model(cascade_model), prompt_tokens, output_tokens)
+
+    primary = settings_manager.get_model_for_task(task_name)
+    if raw and confidence is not None and confidence >= _min_confidence() and is_decisive(content):
+        primary_cost = _call_cost(primary, prompt_tokens, output_tokens)
+        primary_latency = _typical_latency(task_name, primary.name if primary else None)
+        _record(task_name, "accepted", max(0.0, primary_latency - elapsed) if primary_latency else 0.0, primary_cost - cheap_cost)
+        return content
+
+    # verdict neclar → modelul task-ului; timpul și costul primului apel sunt pierdute
+    _record(task_name, "escalated", -elapsed, -cheap_cost)
+    return provider_manager.get_llm_response(task_name=task_name, messages=messages)
+
+
+def cascade_stats() -> Dict[str, Dict[str, float]]:
+    """{task: {accepted, escalated, seconds_saved, cost_saved}} din contoarele persistente."""
+    stats: Dict[str, Dict[str, float]] = {}
+    for key, value in get_event_counts(CASCADE_GROUP).items():
+        task_name, _, field = key.rpartition(".")
+        stats.setdefault(task_name, {"accepted": 0, "escalated": 0, "seconds_saved": 0.0, "cost_saved": 0.0})[field] = value
+    return stats
+
+
+def describe_cascade() -> Optional[str]:
+    """Linie de log cu rata de escaladare și economia estimată; None dacă nicio cascadă n-a rulat."""
+    parts = []
+    seconds = cost = 0.0
+    for task_name, s in sorted(cascade_stats().items()):
+        total = int(s["accepted"] + s["escalated"])
+        if not total:
+            continue
+        parts.append(f"{task_name} {int(s['escalated'])}/{total} escalated ({s['escalated'] / total:.0%})")
+        seconds += s["seconds_saved"]
+        cost += s["cost_saved"]
+    if not parts:
+        return None
+    return f"Validator cascade: {'; '.join(parts)} — net ~{seconds:.0f}s and ~${cost:.2f} saved so far."
@@ -1,6 +1,11 @@
 
-from typing import List, Dict, Any
+import time
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
 from state.settings_manager import settings_manager
+from state.llm_telemetry import record_llm_call
+from state import llm_cassette
 import provider.lm_studio as lm_studio
 import provider.automatic1111 as automatic1111
 import provider.openai as openai_provider
@@ -10,14 +15,65 @@ import provider.deepseek as deepseek_provider
 import provider.openrouter as openrouter_provider
 import provider.moonshot as moonshot_provider
 
+# Limite de concurență per provider (ex: {"LM Studio": 1, "OpenAI": 8}). Fără limită dacă lipsește.
+_provider_limits: Dict[str, int] = {}
+_provider_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_provider_lock = threading.Lock()
 
-def get_llm_response(task_name: str, messages: List[Dict[str, str]], **kwargs) -> str:
+
+def set_provider_concurrency(limits: Optional[Dict[str, int]]) -> None:
+    """Setează numărul maxim de apeluri simultane pentru fiecare provider."""
+    with _provider_lock:
+        _provider_limits.clear()
+        _provider_semaphores.clear()
+        for provider, limit in (limits or {}).items():
+            if limit and int(limit) > 0:
+                _provider_limits[provider] = int(limit)
+                _provider_semaphores[provider] = threading.BoundedSemaphore(int(limit))
+
+
+@contextmanager
+def _provider_slot(provider: str):
+    with _provider_lock:
+        semaphore = _provider_semaphores.get(provider)
+    if semaphore is None:
+        yield
+        return
+    with semaphore:
+        yield
+
+
+def _dispatch_llm(provider: str, model_dict: Dict[str, Any], messages: List[Dict[str, str]], merged_params: Dict[str, Any]) -> str:
+    if provider == "LM Studio":
+        return lm_studio.generate_text(model_dict, messages, **merged_params)
+    elif provider == "OpenAI":
+        return openai_provider.generate_text(model_dict, messages, **merged_params)
+    elif provider == "Gemini":
+        return gemini_provider.generate_text(model_dict, messages, **merged_params)
+    elif provider == "xAI":
+        return xai_provider.generate_text(model_dict, messages, **merged_params)
+    elif provider == "DeepSeek":
+        return deepseek_provider.generate_text(model_dict, messages, **merged_params)
+    elif provider == "OpenRouter":
+        return openrouter_provider.generate_text(model_dict, messages, **merged_params)
+    elif provider == "Moonshot":
+        return moonshot_provider.generate_text(model_dict, messages, **merged_params)
+    else:
+        raise Exception(f"Unknown or unsupported LLM provider: {provider}")
+
+
+def get_llm_response(task_name: str, messages: List[Dict[str, str]], model_override: Optional[str] = None, **kwargs) -> str:
     """
     Generic entry point for LLM tasks.
     Reads parameters from task settings and merges with any explicit kwargs.
     Implements retry logic for HTTP errors.
+    model_override: run the task on this model instead of the assigned one (e.g. validator cascade).
     """
     model_settings = settings_manager.get_model_for_task(task_name)
+    if model_override:
+        model_settings = next((m for m in settings_manager.get_models() if m.name == model_override), None)
+        if not model_settings:
+            raise Exception(f"Model '{model_override}' not found.")
     if not model_settings:
         defaults = [m for m in settings_manager.get_models() if m.name == "default_llm"]
         if defaults:
@@ -58,24 +114,20 @@ def get_llm_response(task_name: str, messages: List[Dict[str, str]], **kwargs) -
     
     last_error = None
     for attempt in range(retries + 1):
+        started = time.perf_counter()
         try:
-            if provider == "LM Studio":
-                return lm_studio.generate_text(model_dict, messages, **merged_params)
-            elif provider == "OpenAI":
-                return openai_provider.generate_text(model_dict, messages, **merged_params)
-            elif provider == "Gemini":
-                return gemini_provider.generate_text(model_dict, messages, **merged_params)
-            elif provider == "xAI":
-                return xai_provider.generate_text(model_dict, messages, **merged_params)
-            elif provider == "DeepSeek":
-                return deepseek_provider.generate_text(model_dict, messages, **merged_params)
-            elif provider == "OpenRouter":
-                return openrouter_provider.generate_text(model_dict, messages, **merged_params)
-            elif provider == "Moonshot":
-                return moonshot_provider.generate_text(model_dict, messages, **merged_params)
-            else:
-                raise Exception(f"Unknown or unsupported LLM provider: {provider}")
+            with _provider_slot(provider):
+                started = time.perf_counter()
+                content = llm_cassette.call(
+                    task_name, model_settings.name, provider, messages, merged_params,
+                    lambda: _dispatch_llm(provider, model_dict, messages, merged_params),
+                )
+            record_llm_call(task_name, model_settings.name, provider, messages, content, time.perf_counter() - started,
+                            persist=not llm_cassette.is_replaying())
+            return content
         except Exception as e:
+            record_llm_call(task_name, model_settings.name, provider, messages, None, time.perf_counter() - started, ok=False,
+                            persist=not llm_cassette.is_replaying())
             last_error = e
             if attempt < retries:
                 continue
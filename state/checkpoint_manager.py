@@ -3,13 +3,15 @@ from typing import Optional, List
 from state.pipeline_context import PipelineContext
 
 _checkpoint_data: Optional[PipelineContext] = None
+_version = 0  # crește la fiecare salvare / ștergere; cheie ieftină pentru cache-uri care depind de checkpoint
 _lock = Lock()
 
 
 def save_checkpoint(context: PipelineContext) -> None:
     """Salvează checkpoint-ul complet. Face deep copy pentru liste mutabile."""
-    global _checkpoint_data
+    global _checkpoint_data, _version
     with _lock:
+        _version += 1
         if context is None:
             _checkpoint_data = None
             return
@@ -71,11 +73,18 @@ def get_checkpoint() -> Optional[PipelineContext]:
 
 def clear_checkpoint() -> None:
     """Șterge checkpoint-ul."""
-    global _checkpoint_data
+    global _checkpoint_data, _version
     with _lock:
+        _version += 1
         _checkpoint_data = None
 
 
+def get_checkpoint_version() -> int:
+    """Versiunea checkpoint-ului: se schimbă la fiecare save_checkpoint / save_section / clear_checkpoint."""
+    with _lock:
+        return _version
+
+
 def has_checkpoint() -> bool:
     """Verifică dacă există un checkpoint."""
     with _lock:
@@ -100,6 +109,8 @@ def save_section(section: str, content: str) -> bool:
     if section == "Expanded Plot":
         context.expanded_plot = content
     elif section == "Chapters Overview":
+        from llm.overview_tokenizer import update_tokenization
+        update_tokenization(context, content)
         context.chapters_overview = content
     elif section.startswith("Chapter "):
         try:
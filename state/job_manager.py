@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+# state/job_manager.py
+"""
+Runner de job-uri pe server, decuplat de durata de viață a generatorului Gradio.
+
+Un job (create run / edit pipeline) primește un ID, este pus într-o coadă
+persistentă (jobs/jobs.json) și este executat de un worker thread dedicat
+tipului său. UI-ul doar se abonează la progres (subscribe) și se poate
+detașa / reatașa oricând fără să oprească rularea.
+
+Output-urile unui job (loturi de evenimente, vezi pipeline/events.py) sunt păstrate
+în ordine, astfel încât un abonat nou sau rămas în urmă le poate aplica pe toate;
+la final istoricul poate fi compactat (compact_fn) într-un singur lot echivalent.
+"""
+
+import os
+import json
+import uuid
+import threading
+from datetime import datetime
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from utils.timestamp import ts_prefix
+from state.pipeline_state import StopToken, stop_scope
+
+_JOBS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "jobs")
+_JOBS_FILE = os.path.join(_JOBS_DIR, "jobs.json")
+_MAX_FINISHED_JOBS = 50
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    INTERRUPTED = "interrupted"  # Serverul a fost oprit în timpul rulării (job ne-reluabil)
+
+
+ACTIVE_STATUSES = (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+
+
+@dataclass
+class Job:
+    job_id: str
+    kind: str
+    spec: Dict[str, Any] = field(default_factory=dict)
+    label: str = ""
+    status: str = JobStatus.QUEUED.value
+    progress: str = ""
+    error: Optional[str] = None
+    created_at: str = ""
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    # Runtime only (nu se persistă)
+    outputs: List[Any] = field(default_factory=list)
+    seq: int = 0  # numărul total de output-uri produse (nu scade la compactare)
+    detach_epoch: int = 0
+    stop_token: StopToken = field(default_factory=StopToken)  # stop-ul acestui job (vezi state/pipeline_state.py)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "spec": self.spec,
+            "label": self.label,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        persisted = (
+            "job_id", "kind", "spec", "label", "status", "progress", "error",
+            "created_at", "started_at", "finished_at",
+        )
+        return cls(**{k: v for k, v in data.items() if k in persisted})
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def last_output(self) -> Any:
+        return self.outputs[-1] if self.outputs else None
+
+
+@dataclass
+class _JobRunner:
+    fn: Callable[[Dict[str, Any]], Any]
+    resumable: Union[bool, Callable[[Dict[str, Any]], bool]] = False
+    progress_fn: Optional[Callable[[Any], str]] = None
+    compact_fn: Optional[Callable[[List[Any]], List[Any]]] = None
+
+
+class JobManager:
+    """
+    Singleton care ține evidența job-urilor și a worker-ilor.
+    Fiecare tip de job (kind) are propria coadă și propriul worker thread,
+    astfel încât un edit scurt nu așteaptă după o carte de 40 de capitole.
+    """
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(JobManager, cls).__new__(cls)
+            cls._instance._jobs = {}
+            cls._instance._queues = {}
+            cls._instance._workers = {}
+            cls._instance._runners = {}
+            cls._instance._cond = threading.Condition()
+            cls._instance._restored = False
+        return cls._instance
+
+    def __init__(self):
+        pass
+
+    # ---- Registry ----
+
+    def register_runner(
+        self,
+        kind: str,
+        fn: Callable[[Dict[str, Any]], Any],
+        resumable: Union[bool, Callable[[Dict[str, Any]], bool]] = False,
+        progress_fn: Optional[Callable[[Any], str]] = None,
+        compact_fn: Optional[Callable[[List[Any]], List[Any]]] = None,
+    ) -> None:
+        """
+        Înregistrează un tip de job.
+        fn(spec) trebuie să returneze un generator; valorile yield-uite sunt livrate
+        abonaților în ordine (fără să se piardă vreuna). fn rulează în stop_scope-ul job-ului,
+        deci is_stop_requested() din pipeline vede doar stop-ul acestui job.
+        resumable=True înseamnă că spec-ul ajunge pentru a relua job-ul după restart; poate fi și
+        o funcție resumable(spec) când doar unele job-uri ale tipului pot fi reluate.
+        compact_fn(outputs) reduce istoricul unui job terminat la o listă echivalentă, mai scurtă.
+        """
+        with self._cond:
+            self._runners[kind] = _JobRunner(fn, resumable, progress_fn, compact_fn)
+            self._queues.setdefault(kind, deque())
+
+    # ---- Persistence ----
+
+    def _persist(self) -> None:
+        """Scrie coada pe disc. Apelat cu self._cond deținut."""
+        finished = [j for j in self._jobs.values() if not j.is_active]
+        finished.sort(key=lambda j: j.finished_at or j.created_at or "")
+        drop = {j.job_id for j in finished[:-_MAX_FINISHED_JOBS]} if len(finished) > _MAX_FINISHED_JOBS else set()
+        for job_id in drop:
+            self._jobs.pop(job_id, None)
+
+        data = [j.to_dict() for j in self._jobs.values()]
+        try:
+            os.makedirs(_JOBS_DIR, exist_ok=True)
+            tmp_path = _JOBS_FILE + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, _JOBS_FILE)
+        except Exception as e:
+            print(ts_prefix(f"[JobManager] Failed to persist jobs: {e}"), flush=True)
+
+    def restore(self) -> None:
+        """
+        Reîncarcă coada de pe disc (o singură dată per proces).
+        Job-urile active reluabile sunt puse din nou în coadă; celelalte devin INTERRUPTED.
+        """
+        with self._cond:
+            if self._restored:
+                return
+            self._restored = True
+
+            if not os.path.exists(_JOBS_FILE):
+                return
+            try:
+                with open(_JOBS_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f) or []
+            except Exception as e:
+                print(ts_prefix(f"[JobManager] Failed to read jobs file: {e}"), flush=True)
+                return
+
+            for item in data:
+                try:
+                    job = Job.from_dict(item)
+                except Exception:
+                    continue
+                runner = self._runners.get(job.kind)
+                if job.is_active:
+                    if runner and _can_resume(runner, job.spec or {}):
+                        job.status = JobStatus.QUEUED.value
+                        job.spec = dict(job.spec or {}, resume=True)
+                        job.progress = "Re-queued after restart"
+                        self._queues.setdefault(job.kind, deque()).append(job.job_id)
+                    else:
+                        job.status = JobStatus.INTERRUPTED.value
+                        job.finished_at = job.finished_at or _now()
+                self._jobs[job.job_id] = job
+
+            self._persist()
+            for kind in list(self._queues.keys()):
+                if self._queues[kind]:
+                    self._ensure_worker(kind)
+
+    # ---- Submission ----
+
+    def submit(self, kind: str, spec: Optional[Dict[str, Any]] = None, label: str = "") -> str:
+        """Pune un job în coadă și returnează ID-ul lui."""
+        with self._cond:
+            if kind not in self._runners:
+                raise ValueError(f"Unknown job kind: {kind}")
+            job_id = uuid.uuid4().hex[:8]
+            job = Job(
+                job_id=job_id,
+                kind=kind,
+                spec=dict(spec or {}),
+                label=label or kind,
+                created_at=_now(),
+            )
+            self._jobs[job_id] = job
+            self._queues[kind].append(job_id)
+            self._persist()
+            self._ensure_worker(kind)
+            self._cond.notify_all()
+            return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Anulează un job: dacă e în coadă, îl scoate; dacă rulează, cere stop pe token-ul lui
+        (pipeline-ul se oprește la următorul punct de pauză, ca la butonul Stop), iar job-ul
+        se încheie CANCELLED.
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job or not job.is_active:
+                return False
+            if job.status == JobStatus.QUEUED.value:
+                try:
+                    self._queues[job.kind].remove(job_id)
+                except ValueError:
+                    pass
+                job.status = JobStatus.CANCELLED.value
+                job.finished_at = _now()
+                self._persist()
+                self._cond.notify_all()
+                return True
+            job.stop_token.request()
+        return True
+
+    # ---- Queries ----
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self, kind: Optional[str] = None) -> List[Job]:
+        with self._cond:
+            jobs = [j for j in self._jobs.values() if kind is None or j.kind == kind]
+        jobs.sort(key=lambda j: j.created_at or "", reverse=True)
+        return jobs
+
+    def has_active_jobs(self, kind: Optional[str] = None) -> bool:
+        with self._cond:
+            return any(j.is_active for j in self._jobs.values() if kind is None or j.kind == kind)
+
+    def get_running_job(self, kind: str) -> Optional[Job]:
+        with self._cond:
+            for job in self._jobs.values():
+                if job.kind == kind and job.status == JobStatus.RUNNING.value:
+                    return job
+        return None
+
+    # ---- Subscription ----
+
+    def subscribe(self, job_id: str, poll_interval: float = 1.0):
+        """
+        Generator care yield-uiește, la fiecare trezire, lista output-urilor noi ale job-ului
+        (de la începutul job-ului pentru un abonat nou). Output-urile produse între două
+        treziri vin în același lot, deci un abonat lent nu rămâne în urmă.
+        Se termină când job-ul se încheie sau când abonatul este detașat (detach).
+        Job-ul continuă să ruleze indiferent de abonați.
+        """
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if not job:
+                return
+            epoch = job.detach_epoch
+
+        seen = 0
+        while True:
+            with self._cond:
+                job = self._jobs.get(job_id)
+                if not job:
+                    return
+                while job.seq == seen and job.is_active and job.detach_epoch == epoch:
+                    self._cond.wait(timeout=poll_interval)
+                if job.detach_epoch != epoch:
+                    return
+                # outputs acoperă indicii [seq - len(outputs), seq); după compactare,
+                # un abonat rămas în urmă primește lotul compactat (care resetează starea).
+                start = job.seq - len(job.outputs)
+                new_outputs = job.outputs[max(0, seen - start):] if seen < job.seq else []
+                seen = job.seq
+                finished = not job.is_active
+
+            if new_outputs:
+                yield new_outputs
+            if finished:
+                return
+
+    def detach(self, job_id: str) -> None:
+        """Încheie toți abonații curenți ai job-ului (job-ul continuă să ruleze)."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job:
+                job.detach_epoch += 1
+                self._cond.notify_all()
+
+    # ---- Workers ----
+
+    def _ensure_worker(self, kind: str) -> None:
+        """Pornește worker-ul pentru un tip de job, dacă nu rulează deja. Apelat cu self._cond deținut."""
+        worker = self._workers.get(kind)
+        if worker and worker.is_alive():
+            return
+        worker = threading.Thread(target=self._worker_loop, args=(kind,), name=f"job-worker-{kind}", daemon=True)
+        self._workers[kind] = worker
+        worker.start()
+
+    def _worker_loop(self, kind: str) -> None:
+        while True:
+            with self._cond:
+                queue = self._queues[kind]
+                while not queue:
+                    self._cond.wait()
+                job = self._jobs.get(queue.popleft())
+                if not job or job.status != JobStatus.QUEUED.value:
+                    continue
+                job.status = JobStatus.RUNNING.value
+                job.started_at = _now()
+                runner = self._runners[kind]
+                self._persist()
+                self._cond.notify_all()
+
+            self._run_job(job, runner)
+
+    def _run_job(self, job: Job, runner: _JobRunner) -> None:
+        try:
+            with stop_scope(job.stop_token):
+                outputs = runner.fn(dict(job.spec))
+                for output in outputs:
+                    progress = None
+                    if runner.progress_fn:
+                        try:
+                            progress = runner.progress_fn(output)
+                        except Exception:
+                            progress = None
+                    with self._cond:
+                        job.outputs.append(output)
+                        job.seq += 1
+                        if progress:
+                            job.progress = progress
+                        self._cond.notify_all()
+            final_status = JobStatus.CANCELLED.value if job.stop_token.is_requested() else JobStatus.DONE.value
+            error = None
+        except Exception as e:
+            final_status = JobStatus.FAILED.value
+            error = str(e)
+            print(ts_prefix(f"[JobManager] Job {job.job_id} ({job.kind}) failed: {e}"), flush=True)
+
+        compacted = None
+        if runner.compact_fn and job.outputs:
+            try:
+                compacted = runner.compact_fn(list(job.outputs))
+            except Exception as e:
+                print(ts_prefix(f"[JobManager] Failed to compact job {job.job_id}: {e}"), flush=True)
+
+        with self._cond:
+            if compacted is not None:
+                job.outputs = compacted
+            job.status = final_status
+            job.error = error
+            job.finished_at = _now()
+            self._persist()
+            self._cond.notify_all()
+
+
+def _can_resume(runner: _JobRunner, spec: Dict[str, Any]) -> bool:
+    return runner.resumable(spec) if callable(runner.resumable) else bool(runner.resumable)
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
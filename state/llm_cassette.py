@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+# state/llm_cassette.py
+"""
+Casetă pentru apelurile LLM: înregistrează fiecare pereche cerere/răspuns a unui run
+(task, model, parametri, timp) într-un fișier JSON Lines comprimat (.jsonl.gz) și o poate
+reda ulterior în loc de provider — pentru reproducerea unui run prost sau pentru
+benchmark-ul codului PlotKing fără token-uri plătite.
+
+Fiecare intrare are un hash al cererii (task + model + mesaje + parametri). La redare,
+intrările sunt căutate după hash; dacă cererea nu mai coincide cu înregistrarea (prompt
+modificat, alt context), se folosește următoarea intrare a aceluiași task și divergența
+este raportată.
+
+Activare:
+  - batch.py --record PATH / --replay PATH [--replay-speed X]
+  - variabilele de mediu PLOTKING_RECORD / PLOTKING_REPLAY / PLOTKING_REPLAY_SPEED (UI)
+"""
+
+import os
+import gzip
+import atexit
+import json
+import time
+import hashlib
+from datetime import datetime
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import log_console
+
+CASSETTE_VERSION = 1
+MODE_OFF = "off"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+
+_lock = Lock()
+_mode = MODE_OFF
+_path: Optional[str] = None
+_file = None
+_seq = 0
+_speed = 0.0
+_entries: List[Dict] = []
+_by_hash: Dict[str, List[Dict]] = {}
+_divergences: List[Dict] = []
+_replayed = 0
+
+
+class CassetteExhausted(Exception):
+    """Redarea a cerut un apel pentru care caseta nu mai are intrări."""
+
+
+def request_hash(task_name: str, model_name: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"task": task_name, "model": model_name, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _text_hash(text: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest() if text is not None else None
+
+
+def mode() -> str:
+    return _mode
+
+
+def is_replaying() -> bool:
+    return _mode == MODE_REPLAY
+
+
+def start_recording(path: str) -> None:
+    """Pornește înregistrarea; fișierul existent este suprascris."""
+    global _mode, _path, _file, _seq
+    stop()
+    with _lock:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _file = gzip.open(path, "wt", encoding="utf-8")
+        _file.write(json.dumps({"version": CASSETTE_VERSION, "created_at": datetime.now().isoformat(timespec="seconds")}) + "\n")
+        _file.flush()
+        _path, _seq, _mode = path, 0, MODE_RECORD
+    log_console(f"⏺️ Recording LLM calls to {path}")
+
+
+def start_replay(path: str, speed: float = 0.0) -> None:
+    """
+    Pornește redarea din casetă.
+    speed: 1.0 = timpii originali, 10.0 = de 10× mai repede, 0 = instant.
+    """
+    global _mode, _path, _speed, _entries, _by_hash, _divergences, _replayed
+    stop()
+    lines = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    lines.append(json.loads(line))
+        except (EOFError, json.JSONDecodeError):
+            # casetă netrunchiată corect (proces oprit brusc) — păstrăm intrările complete
+            pass
+    header = lines[0] if lines and "version" in lines[0] else {}
+    if header.get("version", CASSETTE_VERSION) > CASSETTE_VERSION:
+        raise ValueError(f"Unsupported cassette version {header.get('version')} in {path}.")
+    entries = [line for line in lines if "seq" in line]
+
+    with _lock:
+        _entries = entries
+        _by_hash = {}
+        for entry in entries:
+            entry["used"] = False
+            _by_hash.setdefault(entry["request_hash"], []).append(entry)
+        _divergences, _replayed = [], 0
+        _path, _speed, _mode = path, max(0.0, float(speed or 0.0)), MODE_REPLAY
+    log_console(f"⏯️ Replaying {len(entries)} LLM call(s) from {path} (speed: {'instant' if not _speed else f'{_speed:g}×'})")
+
+
+def stop() -> Dict:
+    """Oprește înregistrarea / redarea și întoarce un sumar."""
+    global _mode, _file
+    with _lock:
+        summary = {"mode": _mode, "path": _path, "recorded": _seq, "replayed": _replayed,
+                   "divergences": list(_divergences), "unused": sum(1 for e in _entries if not e.get("used"))}
+        if _file is not None:
+            _file.close()
+            _file = None
+        _mode = MODE_OFF
+    return summary
+
+
+atexit.register(stop)
+
+
+def format_summary(summary: Dict) -> str:
+    if summary["mode"] == MODE_RECORD:
+        return f"⏺️ Cassette saved: {summary['recorded']} LLM call(s) → {summary['path']}"
+    if summary["mode"] == MODE_REPLAY:
+        text = (f"⏯️ Replayed {summary['replayed']} LLM call(s) from {summary['path']}; "
+                f"{len(summary['divergences'])} diverged, {summary['unused']} unused.")
+        for d in summary["divergences"][:10]:
+            text += f"\n   ⚠️ #{d['seq']} {d['task']}: {d['reason']}"
+        return text
+    return "Cassette off."
+
+
+def configure_from_env() -> None:
+    """Activează caseta din PLOTKING_RECORD / PLOTKING_REPLAY (+ PLOTKING_REPLAY_SPEED)."""
+    replay_path = os.environ.get("PLOTKING_REPLAY")
+    record_path = os.environ.get("PLOTKING_RECORD")
+    if replay_path:
+        start_replay(replay_path, float(os.environ.get("PLOTKING_REPLAY_SPEED", "0") or 0))
+    elif record_path:
+        start_recording(record_path)
+
+
+def _record(entry: Dict) -> None:
+    global _seq
+    with _lock:
+        if _file is None:
+            return
+        _seq += 1
+        entry["seq"] = _seq
+        _file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        _file.flush()
+
+
+def _take(task_name: str, req_hash: str) -> Dict:
+    """Intrarea potrivită după hash; altfel următoarea intrare nefolosită a task-ului (divergență)."""
+    global _replayed
+    with _lock:
+        entry = next((e for e in _by_hash.get(req_hash, []) if not e["used"]), None)
+        if entry is None:
+            entry = next((e for e in _entries if not e["used"] and e["task"] == task_name), None)
+            if entry is None:
+                raise CassetteExhausted(f"Cassette {_path} has no recorded '{task_name}' call left to replay.")
+            _divergences.append({
+                "seq": entry["seq"],
+                "task": task_name,
+                "recorded_hash": entry["request_hash"],
+                "replayed_hash": req_hash,
+                "reason": "request differs from the recording",
+            })
+            log_console(f"⚠️ Cassette divergence at #{entry['seq']} ({task_name}): request hash "
+                        f"{req_hash[:12]} ≠ recorded {entry['request_hash'][:12]}")
+        entry["used"] = True
+        _replayed += 1
+        return entry
+
+
+def call(
+    task_name: str,
+    model_name: str,
+    provider: str,
+    messages: List[Dict[str, str]],
+    params: Dict[str, Any],
+    dispatch: Callable[[], str],
+) -> str:
+    """
+    Punctul de intrare din provider_manager pentru o încercare de apel LLM.
+    Off → dispatch(); record → dispatch() + scriere în casetă; replay → răspunsul înregistrat.
+    """
+    if _mode == MODE_OFF:
+        return dispatch()
+
+    req_hash = request_hash(task_name, model_name, messages, params)
+
+    if _mode == MODE_REPLAY:
+        entry = _take(task_name, req_hash)
+        if _speed:
+            time.sleep(entry.get("elapsed", 0.0) / _speed)
+        if not entry.get("ok", True):
+            raise Exception(entry.get("error") or "Recorded LLM call failed.")
+        response = entry["response"]
+        if entry.get("response_hash") and _text_hash(response) != entry["response_hash"]:
+            with _lock:
+                _divergences.append({
+                    "seq": entry["seq"],
+                    "task": task_name,
+                    "recorded_hash": entry["response_hash"],
+                    "replayed_hash": _text_hash(response),
+                    "reason": "recorded response was modified",
+                })
+        return response
+
+    started = time.perf_counter()
+    entry = {
+        "task": task_name,
+        "model": model_name,
+        "provider": provider,
+        "params": params,
+        "request_hash": req_hash,
+        "messages": messages,
+        "started_at": time.time(),
+    }
+    try:
+        content = dispatch()
+    except Exception as e:
+        entry.update(ok=False, error=str(e), response=None, elapsed=time.perf_counter() - started)
+        _record(entry)
+        raise
+    entry.update(ok=True, response=content, response_hash=_text_hash(content), elapsed=time.perf_counter() - started)
+    _record(entry)
+    return content
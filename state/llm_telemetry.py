@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# state/llm_telemetry.py
+"""
+Telemetrie pentru apelurile LLM făcute prin provider_manager.get_llm_response.
+Provider-ii returnează doar textul, deci numărul de token-uri este estimat (~4 caractere / token).
+
+Pe lângă lista de apeluri din proces, agregatele istorice (per task + model) și
+sumarele ultimelor rulări sunt persistate în settings/telemetry.json și folosite
+de estimatorul de cost / durată. Fișierul se rescrie periodic (cel mult o dată la
+_FLUSH_SECONDS) și la ieșirea din proces, nu la fiecare apel LLM.
+"""
+
+import os
+import json
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from threading import Lock
+from typing import Dict, List, Optional
+
+CHARS_PER_TOKEN = 4
+TELEMETRY_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "settings", "telemetry.json")
+_MAX_RUNS = 30
+_FLUSH_SECONDS = 5.0
+
+_calls: List[Dict] = []
+_lock = Lock()
+_io_lock = Lock()
+_store: Optional[Dict] = None
+_flush_timer: Optional[threading.Timer] = None
+_attribution = threading.local()
+
+
+def _empty_stats() -> Dict:
+    return {"calls": 0, "failed": 0, "prompt_tokens": 0, "output_tokens": 0, "output_words": 0, "llm_seconds": 0.0}
+
+
+def _load_store() -> Dict:
+    """Încarcă (o singură dată) agregatele istorice. Apelat cu _lock deținut."""
+    global _store
+    if _store is None:
+        _store = {"tasks": {}, "runs": [], "counters": {}}
+        if os.path.exists(TELEMETRY_FILE):
+            try:
+                with open(TELEMETRY_FILE, "r", encoding="utf-8") as f:
+                    data = json.load(f) or {}
+                _store["tasks"] = data.get("tasks", {}) or {}
+                _store["runs"] = data.get("runs", []) or []
+                _store["counters"] = data.get("counters", {}) or {}
+            except Exception as e:
+                print(f"Error loading telemetry: {e}")
+    return _store
+
+
+def _save_store() -> None:
+    """Programează scrierea agregatelor pe disc (o singură scriere pe fereastră). Apelat cu _lock deținut."""
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(_FLUSH_SECONDS, flush_telemetry)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def flush_telemetry() -> None:
+    """Scrie imediat agregatele pe disc dacă s-au schimbat de la ultima scriere."""
+    global _flush_timer
+    with _io_lock:  # snapshot + scriere în ordine: o scriere mai veche nu o poate suprascrie pe una nouă
+        with _lock:
+            timer, _flush_timer = _flush_timer, None
+            if timer is None or _store is None:
+                return
+            timer.cancel()
+            data = json.dumps(_store, indent=2)
+        try:
+            os.makedirs(os.path.dirname(TELEMETRY_FILE), exist_ok=True)
+            tmp_path = TELEMETRY_FILE + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, TELEMETRY_FILE)
+        except Exception as e:
+            print(f"Error saving telemetry: {e}")
+
+
+atexit.register(flush_telemetry)
+
+
+@contextmanager
+def attribute_calls_to(thread_id: int):
+    """
+    Apelurile din blocul curent sunt atribuite thread-ului `thread_id` — folosit de
+    thread pool-urile pornite dintr-un job, ca apelurile să intre în sumarul run-ului.
+    """
+    previous = getattr(_attribution, "thread_id", None)
+    _attribution.thread_id = thread_id
+    try:
+        yield
+    finally:
+        _attribution.thread_id = previous
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimare grosieră a numărului de token-uri pentru un text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def record_llm_call(
+    task_name: str,
+    model_name: str,
+    provider: str,
+    messages: List[Dict[str, str]],
+    output: Optional[str],
+    elapsed: float,
+    ok: bool = True,
+    persist: bool = True,
+) -> Dict:
+    """
+    Înregistrează un apel (o încercare) către LLM.
+    persist=False (ex: redare din casetă) nu actualizează agregatele istorice folosite de estimator.
+    """
+    prompt_text = "".join((m.get("content") or "") for m in messages or [] if isinstance(m.get("content"), str))
+    record = {
+        "task": task_name,
+        "model": model_name,
+        "provider": provider,
+        "started_at": time.time() - elapsed,
+        "elapsed": elapsed,
+        "prompt_tokens": estimate_tokens(prompt_text),
+        "output_tokens": estimate_tokens(output) if ok else 0,
+        "output_words": len((output or "").split()) if ok else 0,
+        "ok": ok,
+        "thread_id": getattr(_attribution, "thread_id", None) or threading.get_ident(),
+    }
+    with _lock:
+        _calls.append(record)
+        if not persist:
+            return record
+        store = _load_store()
+        stats = store["tasks"].setdefault(task_name, {}).setdefault(model_name, _empty_stats())
+        stats["calls"] += 1
+        stats["failed"] += 0 if ok else 1
+        stats["prompt_tokens"] += record["prompt_tokens"]
+        stats["output_tokens"] += record["output_tokens"]
+        stats["output_words"] += record["output_words"]
+        if ok:
+            stats["llm_seconds"] += elapsed
+        _save_store()
+    return record
+
+
+def call_count() -> int:
+    with _lock:
+        return len(_calls)
+
+
+def get_calls(since: int = 0, thread_id: Optional[int] = None) -> List[Dict]:
+    """Returnează apelurile înregistrate începând cu indexul `since` (opțional filtrate pe thread)."""
+    with _lock:
+        calls = list(_calls[since:])
+    if thread_id is not None:
+        calls = [c for c in calls if c["thread_id"] == thread_id]
+    return calls
+
+
+def summarize_calls(calls: List[Dict]) -> Dict:
+    """Agregă o listă de apeluri: număr, token-uri estimate și timp total petrecut în LLM."""
+    return {
+        "calls": len(calls),
+        "failed": sum(1 for c in calls if not c["ok"]),
+        "prompt_tokens": sum(c["prompt_tokens"] for c in calls),
+        "output_tokens": sum(c["output_tokens"] for c in calls),
+        "llm_seconds": sum(c["elapsed"] for c in calls),
+    }
+
+
+def get_task_stats(task_name: str, model_name: Optional[str] = None) -> Optional[Dict]:
+    """Agregatele istorice pentru un task (pe un model anume sau cumulat pe toate modelele)."""
+    with _lock:
+        by_model = dict(_load_store()["tasks"].get(task_name, {}))
+    if model_name is not None:
+        stats = by_model.get(model_name)
+        return dict(stats) if stats else None
+    if not by_model:
+        return None
+    total = _empty_stats()
+    for stats in by_model.values():
+        for key in total:
+            total[key] += stats.get(key, 0)
+    return total
+
+
+def get_model_stats(model_name: str) -> Optional[Dict]:
+    """Agregatele istorice ale unui model, cumulate pe toate task-urile."""
+    with _lock:
+        tasks = _load_store()["tasks"]
+        matches = [dict(by_model[model_name]) for by_model in tasks.values() if model_name in by_model]
+    if not matches:
+        return None
+    total = _empty_stats()
+    for stats in matches:
+        for key in total:
+            total[key] += stats.get(key, 0)
+    return total
+
+
+def record_run(run: Dict) -> None:
+    """Persistă sumarul unei rulări (estimare vs real) pentru recalibrarea estimatorului."""
+    with _lock:
+        store = _load_store()
+        store["runs"].append(dict(run, finished_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S")))
+        store["runs"] = store["runs"][-_MAX_RUNS:]
+        _save_store()
+    flush_telemetry()  # rar și valoros: nu așteptăm fereastra
+
+
+def get_runs() -> List[Dict]:
+    with _lock:
+        return list(_load_store()["runs"])
+
+
+def count_event(group: str, key: str, amount: float = 1) -> None:
+    """Contor persistent simplu (ex: ce metodă a tokenizat overview-ul); `amount` permite sume (secunde, cost)."""
+    with _lock:
+        counters = _load_store()["counters"].setdefault(group, {})
+        counters[key] = counters.get(key, 0) + amount
+        _save_store()
+
+
+def get_event_counts(group: str) -> Dict[str, float]:
+    with _lock:
+        return dict(_load_store()["counters"].get(group, {}))
@@ -7,12 +7,22 @@ from typing import List
 def reset_all_states():
     """
     Resetează toate stările aplicației la refresh.
+    Dacă un job rulează în background, starea lui (checkpoint / drafts) rămâne neatinsă,
+    ca UI-ul să se poată reatașa după refresh.
     """
-    set_current_project(None)
-    clear_checkpoint()
-    DraftsManager().clear()
-    clear_stop()
-    clear_paused()
+    from state.job_manager import JobManager
+    jobs = JobManager()
+    create_active = jobs.has_active_jobs("create")
+    edit_active = jobs.has_active_jobs("edit")
+
+    if not create_active:
+        set_current_project(None)
+        clear_checkpoint()
+    if not edit_active:
+        DraftsManager().clear()
+    if not (create_active or edit_active):
+        clear_stop()
+        clear_paused()
 
 def get_current_section_content(section: str) -> str:
     """Get current content for section: draft if exists, else checkpoint.
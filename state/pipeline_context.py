@@ -19,6 +19,9 @@ class PipelineContext:
     choices: Optional[List[str]] = None
     next_chapter_index: Optional[int] = None
     pending_validation_index: Optional[int] = None
+    # descrierile per capitol din chapters_overview + hash-ul overview-ului din care provin
+    tokenized_overview: Optional[List[str]] = None
+    tokenized_overview_hash: Optional[str] = None
 
     def to_dict(self):
         return self.__dict__
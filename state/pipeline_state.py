@@ -1,24 +1,67 @@
-from threading import Lock
+from contextlib import contextmanager
+from threading import Event, Lock, local
 
 _pipeline_state = {
     "stop_requested": False,
     "paused": False,
 }
 _lock = Lock()
+_scope = local()
+
+
+class StopToken:
+    """Cerere de stop pentru o singură rulare (un job, o carte din batch), independentă de flag-ul global."""
+
+    def __init__(self):
+        self._event = Event()
+
+    def request(self):
+        self._event.set()
+
+    def is_requested(self):
+        return self._event.is_set()
+
+
+@contextmanager
+def stop_scope(token: StopToken):
+    """
+    Leagă token-ul de thread-ul curent: în interior request_stop / is_stop_requested folosesc token-ul,
+    iar clear_stop nu are efect (un token nou pentru fiecare rulare), deci rulările concurente nu își
+    șterg sau nu își preiau una alteia stop-ul.
+    """
+    previous = getattr(_scope, "token", None)
+    _scope.token = token
+    try:
+        yield token
+    finally:
+        _scope.token = previous
+
+
+def _current_token():
+    return getattr(_scope, "token", None)
 
 def request_stop():
+    token = _current_token()
+    if token is not None:
+        token.request()
+        return
     with _lock:
         _pipeline_state["stop_requested"] = True
 
 def clear_stop():
+    if _current_token() is not None:
+        return
     with _lock:
         _pipeline_state["stop_requested"] = False
 
 def is_stop_requested():
+    token = _current_token()
+    if token is not None:
+        return token.is_requested()
     with _lock:
         return _pipeline_state["stop_requested"]
 
 def clear_paused():
     """Resetează starea paused."""
     with _lock:
-        _pipeline_state["paused"] = False
\ No newline at end of file
+        _pipeline_state["paused"] = False
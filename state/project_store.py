@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+# state/project_store.py
+"""
+Citirea / scrierea fișierelor de proiect (projects/<nume>.json), fără dependențe de UI.
+Folosit de handlerele tab-ului Create, de job-urile din background și de CLI (batch.py).
+"""
+
+import os, re, json
+from typing import Optional
+
+from utils.timestamp import ts_prefix
+from pipeline.constants import RUN_MODE_CHOICES
+
+_PROJECTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "projects")
+_NAME_RE = re.compile(r'^[A-Za-z0-9 _-]+$')
+
+def _ensure_projects_dir():
+    os.makedirs(_PROJECTS_DIR, exist_ok=True)
+
+def _project_path(name: str) -> str:
+    return os.path.join(_PROJECTS_DIR, f"{name}.json")
+
+def _validate_name(name: str):
+    if not name or not name.strip():
+        return "❌ Please enter a project name."
+    name = name.strip()
+    if not _NAME_RE.match(name):
+        return "❌ Invalid project name. Use letters, numbers, spaces, '-' or '_' only."
+    return None
+
+def list_projects():
+    _ensure_projects_dir()
+    names = [fn[:-5] for fn in os.listdir(_PROJECTS_DIR) if fn.lower().endswith(".json")]
+    names.sort(key=lambda s: s.lower())
+    return names
+
+def _choose_plot_for_pipeline(plot, refined):
+    return refined if (refined or "").strip() else plot
+
+def _tokenized_fields(data: dict) -> dict:
+    """Tokenizarea overview-ului salvată în proiect → câmpurile PipelineContext."""
+    tokenized = data.get("tokenized_overview") or {}
+    if not isinstance(tokenized, dict) or not tokenized.get("chapters"):
+        return {}
+    return {
+        "tokenized_overview": list(tokenized["chapters"]),
+        "tokenized_overview_hash": tokenized.get("hash"),
+    }
+
+def _tokenized_data(context) -> Optional[dict]:
+    if not (context and context.tokenized_overview and context.tokenized_overview_hash):
+        return None
+    return {"hash": context.tokenized_overview_hash, "chapters": list(context.tokenized_overview)}
+
+def read_project_data(name: str) -> Optional[dict]:
+    """Citește fișierul JSON al proiectului. Returnează None dacă lipsește sau e corupt."""
+    path = _project_path(name)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def read_project_context(name: str):
+    """
+    Construiește un PipelineContext din fișierul proiectului, fără să atingă UI-ul sau checkpoint-ul.
+    Folosit de job-urile din background și de CLI.
+    """
+    from state.pipeline_context import PipelineContext
+
+    data = read_project_data(name)
+    if data is None:
+        return None
+
+    overview = data.get("chapters_overview", "") or None
+    return PipelineContext(
+        plot=_choose_plot_for_pipeline(data.get("plot_original", ""), data.get("plot_refined", "")),
+        num_chapters=data.get("num_chapters", None) or 0,
+        genre=data.get("genre", ""),
+        anpc=data.get("avg_pages_per_chapter", None) or 0,
+        run_mode=RUN_MODE_CHOICES["FULL"],
+        expanded_plot=data.get("expanded_plot", "") or None,
+        chapters_overview=overview,
+        chapters_full=list(data.get("chapters", []) or []),
+        validation_text="",
+        overview_validated=bool(overview),
+        status_log=[ts_prefix(f"📂 Project “{name}” loaded.")],
+        **_tokenized_fields(data),
+    )
+
+def write_project_context(name: str, context, plot_original: Optional[str] = None) -> None:
+    """
+    Scrie conținutul generat (expanded plot, overview, capitole) în fișierul proiectului,
+    păstrând restul câmpurilor existente. Creează fișierul dacă nu există.
+    """
+    _ensure_projects_dir()
+    data = read_project_data(name) or {
+        "project_name": name,
+        "plot_original": plot_original if plot_original is not None else (context.plot or ""),
+        "plot_refined": "",
+        "genre": context.genre or "",
+        "num_chapters": context.num_chapters,
+        "avg_pages_per_chapter": context.anpc,
+    }
+    data["expanded_plot"] = context.expanded_plot or ""
+    data["chapters_overview"] = context.chapters_overview or ""
+    data["chapters"] = list(context.chapters_full or [])
+    tokenized = _tokenized_data(context)
+    if tokenized:
+        data["tokenized_overview"] = tokenized
+
+    path = _project_path(name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
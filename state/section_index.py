@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+# state/section_index.py
+"""
+Index invers local (cuvinte + entități) peste secțiunile cărții, folosit de validare pentru a
+restrânge capitolele trimise la analiza de impact.
+Singleton-ul păstrează doar termenii per secțiune (recalculați când conținutul se schimbă); scorurile
+se calculează pe o vedere per apel (SectionView), cu df / N peste candidații acelui apel, deci validările
+concurente (ex: cea speculativă din fundal) nu își modifică una alteia rezultatul.
+"""
+
+import math
+import re
+import hashlib
+from collections import Counter
+from difflib import SequenceMatcher
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+
+_WORD_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
+_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between both but
+by can could did do does doing down during each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no nor not now of off on once only or other
+our ours ourselves out over own same she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which while who whom why will
+with would you your yours yourself yourselves chapter chapters section story plot overview expanded changed change
+changes now instead previously new old one two into upon said says like back still even though then than
+""".split())
+_ENTITY_PREFIX = "@"
+_ENTITY_WEIGHT = 3.0
+
+
+def _terms(text: str) -> Counter:
+    """Cuvinte (lowercase, fără stopwords) + entități: cuvinte / secvențe cu majusculă, prefixate cu '@'."""
+    terms = Counter()
+    run: List[str] = []
+
+    def _flush():
+        if run:
+            terms[_ENTITY_PREFIX + " ".join(run).lower()] += 1
+            run.clear()
+
+    for m in _WORD_RE.finditer(text or ""):
+        word = re.sub(r"['’]s$", "", m.group(0))  # posesive: "Gary's" → "Gary"
+        low = word.lower()
+        if word[:1].isupper() and low not in _STOPWORDS and len(word) > 1:
+            # cuvinte consecutive cu majusculă = o singură entitate ("Mount Everest")
+            gap = text[run_end:m.start()] if run else ""
+            if run and gap.strip():
+                _flush()
+            run.append(word)
+            run_end = m.end()
+        else:
+            _flush()
+        if len(low) >= 3 and low not in _STOPWORDS:
+            terms[low] += 1
+    _flush()
+    return terms
+
+
+def _entity_words(terms: Iterable[str]) -> set:
+    return {word for term in terms if term.startswith(_ENTITY_PREFIX) for word in term[len(_ENTITY_PREFIX):].split()}
+
+
+def changed_text(original: str, modified: str) -> str:
+    """Textul din zonele modificate (șters + adăugat), la nivel de cuvânt."""
+    a, b = (original or "").split(), (modified or "").split()
+    spans = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag != "equal":
+            spans.append(" ".join(a[i1:i2] + b[j1:j2]))
+    return "\n".join(spans)
+
+
+class SectionView:
+    """Vedere imuabilă peste un set de secțiuni: termenii fiecăreia + df calculat doar peste ele."""
+
+    def __init__(self, sections: Dict[str, Counter]):
+        self._sections = sections
+        self._df = Counter()
+        for terms in sections.values():
+            self._df.update(terms.keys())
+
+    def mentioning(self, query: str, names: Iterable[str]) -> List[str]:
+        """
+        Secțiunile din `names` care conțin cel puțin o entitate din query (ex: personajul redenumit).
+        Compară cuvintele entităților, deci "Gary" dintr-un capitol se potrivește cu "Gary Smith" din query.
+        """
+        wanted = _entity_words(_terms(query))
+        return [name for name in names if name in self._sections and wanted & _entity_words(self._sections[name])]
+
+    def rank(self, query: str, names: Iterable[str]) -> List[Tuple[str, float]]:
+        """
+        Scor TF-IDF simplu al suprapunerii dintre termenii din query și fiecare secțiune din `names`
+        (entitățile cântăresc mai mult). IDF-ul este netezit (+1), deci un termen prezent în toate
+        secțiunile contează în continuare.
+        """
+        query_terms = set(_terms(query))
+        total = max(1, len(self._sections))
+        scores = []
+        for name in names:
+            terms = self._sections.get(name)
+            score = 0.0
+            if terms:
+                for term in query_terms & terms.keys():
+                    idf = math.log((1 + total) / (1 + self._df[term])) + 1.0
+                    score += idf * (_ENTITY_WEIGHT if term.startswith(_ENTITY_PREFIX) else 1.0)
+            scores.append((name, score))
+        return sorted(scores, key=lambda item: -item[1])
+
+
+class SectionIndex:
+    """
+    Singleton: termenii indexați per secțiune a cărții.
+    Actualizare incrementală: o secțiune este re-indexată doar când conținutul ei (checkpoint sau draft) s-a schimbat.
+    """
+    _instance = None
+    _lock = Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(SectionIndex, cls).__new__(cls)
+                    cls._instance._sections = {}  # name -> (hash, Counter)
+        return cls._instance
+
+    def terms(self, name: str, content: str) -> Counter:
+        """Termenii secțiunii, din cache dacă acel conținut a mai fost indexat."""
+        digest = hashlib.sha1((content or "").encode("utf-8")).hexdigest()
+        with self._lock:
+            current = self._sections.get(name)
+            if current and current[0] == digest:
+                return current[1]
+        terms = _terms(content)
+        with self._lock:
+            self._sections[name] = (digest, terms)
+        return terms
+
+    def view(self, sections: Iterable[Tuple[str, str]]) -> SectionView:
+        """Vedere pentru un singur apel peste (nume, conținut); starea partajată nu este folosită la scor."""
+        return SectionView({name: self.terms(name, content) for name, content in sections})
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._sections.pop(name, None)
+
+    def clear(self) -> None:
+        """Golește indexul (alt proiect încărcat / proiect nou)."""
+        with self._lock:
+            self._sections.clear()
@@ -10,7 +10,9 @@ from handlers.settings import (
     DEFAULT_LLM_MODEL,
     DEFAULT_IMAGE_MODEL,
     PROVIDER_CAPABILITIES,
-    Model
+    Model,
+    get_pipeline_defaults,
+    get_pipeline_option,
 )
 
 SETTINGS_FILE = os.path.join("settings", "settings.json")
@@ -58,7 +60,8 @@ class SettingsManager:
                 "top_p": defaults.top_p,
                 "retries": defaults.retries,
                 "reasoning_effort": None,
-                "max_reasoning_tokens": None
+                "max_reasoning_tokens": None,
+                "cascade_model": None
             }
         return {
             "model": model_name,
@@ -68,13 +71,15 @@ class SettingsManager:
             "top_p": 0.95,
             "retries": 3,
             "reasoning_effort": None,
-            "max_reasoning_tokens": None
+            "max_reasoning_tokens": None,
+            "cascade_model": None
         }
 
     def _create_default_settings(self) -> Dict[str, Any]:
         settings = {
             "models": [DEFAULT_LLM_MODEL, DEFAULT_IMAGE_MODEL],
-            "tasks": {}
+            "tasks": {},
+            "pipeline": get_pipeline_defaults()
         }
         
         for task in LLM_TASKS:
@@ -147,6 +152,8 @@ class SettingsManager:
                     task_value["reasoning_effort"] = None
                 if "max_reasoning_tokens" not in task_value:
                     task_value["max_reasoning_tokens"] = None
+                if task_value.get("cascade_model") not in current_models:
+                    task_value["cascade_model"] = None
 
         for task in IMAGE_TASKS:
             tech_name = task["technical_name"]
@@ -161,6 +168,11 @@ class SettingsManager:
             else:
                 # Invalid format - convert to dict structure
                 settings["tasks"][tech_name] = {"model": "default_image"}
+
+        if not isinstance(settings.get("pipeline"), dict):
+            settings["pipeline"] = {}
+        for key, value in get_pipeline_defaults().items():
+            settings["pipeline"].setdefault(key, value)
                 
         return settings
 
@@ -210,6 +222,16 @@ class SettingsManager:
                 return model_obj
         return None
     
+    def get_cascade_model(self, task_name: str) -> Optional[str]:
+        """First-pass (cheap) model of a validator cascade, or None when the task runs on its model only."""
+        task_data = self.settings["tasks"].get(task_name)
+        if not isinstance(task_data, dict):
+            return None
+        cascade_model = task_data.get("cascade_model")
+        if not cascade_model or cascade_model == task_data.get("model"):
+            return None
+        return cascade_model
+    
     def get_task_params(self, task_name: str) -> Dict[str, Any]:
         """Get task parameters (max_tokens, timeout, temperature, top_p, retries, reasoning params)."""
         task_data = self.settings["tasks"].get(task_name)
@@ -260,6 +282,21 @@ class SettingsManager:
         
         return result
     
+    def get_pipeline_setting(self, name: str) -> Any:
+        """Get a pipeline option (falls back to its default)."""
+        value = self.settings.get("pipeline", {}).get(name)
+        if value is None:
+            option = get_pipeline_option(name)
+            return option.default if option else None
+        return value
+
+    def update_pipeline_settings(self, settings_update: Dict[str, Any]):
+        """Update pipeline options."""
+        pipeline = self.settings.setdefault("pipeline", get_pipeline_defaults())
+        for key, value in settings_update.items():
+            pipeline[key] = value
+        self.save_settings()
+
     def update_task_settings(self, task_name: str, settings_update: Dict[str, Any]):
         """Update task settings (model and/or parameters)."""
         current = self.settings["tasks"].get(task_name)
@@ -318,6 +355,8 @@ class SettingsManager:
             if isinstance(task_data, dict):
                 if task_data.get("model") == model_name:
                     task_data["model"] = fallback_model
+                if task_data.get("cascade_model") == model_name:
+                    task_data["cascade_model"] = None
 
         self.save_settings()
 
@@ -329,6 +368,8 @@ class SettingsManager:
             if isinstance(task_data, dict):
                 if task_data.get("model") == old_name:
                     task_data["model"] = new_name
+                if task_data.get("cascade_model") == old_name:
+                    task_data["cascade_model"] = new_name
 
 
 settings_manager = SettingsManager()
@@ -31,6 +31,17 @@ from handlers.create.create_handlers import (
     bot_reply_chat_message,
     reset_chat_handler,
 )
+from handlers.create.job_handlers import (
+    refresh_jobs_panel,
+    queue_project_handler,
+    attach_job_stream,
+    detach_job_handler,
+    cancel_job_handler,
+)
+from handlers.create.estimator_handlers import (
+    estimate_handler,
+    show_last_run_comparison,
+)
 from handlers.create.project_manager import (
     save_project,
     load_project,
@@ -39,7 +50,7 @@ from handlers.create.project_manager import (
 )
 from llm.refine_chat.llm import refine_chat
 from pipeline.constants import RUN_MODE_CHOICES
-from pipeline.runner_create import generate_book_outline_stream
+from pipeline.jobs import create_job_stream
 from llm.refine_plot.llm import refine_plot
 
 
@@ -131,6 +142,10 @@ def render_create_tab(current_project_label, header_save_btn, editor_sections_ep
                 value=RUN_MODE_CHOICES["FULL"],
                 interactive=True,
             )
+            with gr.Accordion("🧮 Estimate", open=False):
+                estimate_btn = gr.Button("🧮 Estimate Time & Cost", size="sm")
+                estimate_output = gr.Markdown("_Press Estimate to model this run with the current Settings._")
+                run_comparison = gr.Markdown("")
 
     # ---- Top controls ----
     with gr.Row():
@@ -138,6 +153,19 @@ def render_create_tab(current_project_label, header_save_btn, editor_sections_ep
         stop_btn = gr.Button("🛑 Stop", variant="stop", visible=False)
         resume_btn = gr.Button("▶️ Resume", variant="primary", visible=False)
 
+    # ---- Background jobs (rularea continuă pe server chiar dacă tab-ul se închide) ----
+    with gr.Accordion("🧵 Background Jobs", open=False):
+        with gr.Row(equal_height=True):
+            with gr.Column(scale=3):
+                job_selector = gr.Dropdown(label="Job", choices=[], value=None, interactive=True)
+            with gr.Column(scale=1, elem_classes=["project-buttons"], min_width=120):
+                attach_job_btn = gr.Button("🔗 Attach", size="sm")
+                detach_job_btn = gr.Button("⏏️ Detach", size="sm")
+                cancel_job_btn = gr.Button("🚫 Cancel", size="sm")
+                queue_project_btn = gr.Button("📥 Queue Project", size="sm")
+                refresh_jobs_btn = gr.Button("🔄 Refresh", size="sm")
+        jobs_overview = gr.Markdown("_No background jobs yet._")
+
     # ---- Expanded Plot / Overview ----
     with gr.Row(equal_height=True):
         with gr.Column(elem_classes=["plot-wrapper"]):
@@ -172,16 +200,16 @@ def render_create_tab(current_project_label, header_save_btn, editor_sections_ep
 
     # ========= Generator WRAPPERS =========
     def _resume_pipeline():
-        yield from resume_pipeline(generate_book_outline_stream)
+        yield from resume_pipeline(create_job_stream)
 
     def _refresh_expanded():
-        yield from refresh_expanded(generate_book_outline_stream)
+        yield from refresh_expanded(create_job_stream)
 
     def _refresh_overview():
-        yield from refresh_overview(generate_book_outline_stream)
+        yield from refresh_overview(create_job_stream)
 
     def _refresh_chapter(selected_name):
-        yield from refresh_chapter(generate_book_outline_stream, selected_name)
+        yield from refresh_chapter(create_job_stream, selected_name)
 
     # ---- Chat Handlers are now in create_handlers.py ----
 
@@ -227,6 +255,10 @@ def render_create_tab(current_project_label, header_save_btn, editor_sections_ep
             regenerate_overview_btn,
             regenerate_chapter_btn,
         ],
+    ).then(
+        fn=show_last_run_comparison,
+        inputs=[],
+        outputs=[run_comparison],
     ).then(
         fn=_bump_editor_epoch,
         inputs=[editor_sections_epoch],
@@ -242,6 +274,19 @@ def render_create_tab(current_project_label, header_save_btn, editor_sections_ep
         return gr.update(value="🚀 Generate Book", interactive=True)
 
     
+    # Estimator
+    estimate_btn.click(
+        fn=estimate_handler,
+        inputs=[chapters_input, anpc_input, run_mode],
+        outputs=[estimate_output],
+    )
+    for estimate_input in (chapters_input, anpc_input, run_mode):
+        estimate_input.change(
+            fn=estimate_handler,
+            inputs=[chapters_input, anpc_input, run_mode],
+            outputs=[estimate_output],
+        )
+
     # Run Mode Change -> Update Button Label
     run_mode.change(
         fn=_update_btn_label,
@@ -293,6 +338,84 @@ def render_create_tab(current_project_label, header_save_btn, editor_sections_ep
             regenerate_overview_btn,
             regenerate_chapter_btn,
         ],
+    ).then(
+        fn=show_last_run_comparison,
+        inputs=[],
+        outputs=[run_comparison],
+    ).then(
+        fn=_bump_editor_epoch,
+        inputs=[editor_sections_epoch],
+        outputs=[editor_sections_epoch],
+    )
+
+    # Background jobs
+    refresh_jobs_btn.click(
+        fn=refresh_jobs_panel,
+        inputs=[job_selector],
+        outputs=[jobs_overview, job_selector],
+    )
+
+    queue_project_btn.click(
+        fn=queue_project_handler,
+        inputs=[project_dropdown, status_output],
+        outputs=[status_output, jobs_overview, job_selector],
+    )
+
+    cancel_job_btn.click(
+        fn=cancel_job_handler,
+        inputs=[job_selector, status_output],
+        outputs=[status_output, jobs_overview, job_selector],
+    )
+
+    detach_job_btn.click(
+        fn=detach_job_handler,
+        inputs=[job_selector, status_output],
+        outputs=[status_output],
+    )
+
+    attach_job_btn.click(
+        fn=show_controls_on_resume_run,
+        inputs=[],
+        outputs=[
+            stop_btn,
+            resume_btn,
+            generate_btn,
+            regenerate_expanded_btn,
+            regenerate_overview_btn,
+            regenerate_chapter_btn,
+        ],
+    ).then(
+        fn=attach_job_stream,
+        inputs=[job_selector, status_output],
+        outputs=[
+            expanded_output,
+            chapters_output,
+            chapters_state,
+            current_chapter_output,
+            chapter_selector,
+            chapter_counter,
+            status_output,
+            validation_feedback,
+        ],
+    ).then(
+        fn=post_pipeline_controls,
+        inputs=[],
+        outputs=[
+            stop_btn,
+            resume_btn,
+            generate_btn,
+            regenerate_expanded_btn,
+            regenerate_overview_btn,
+            regenerate_chapter_btn,
+        ],
+    ).then(
+        fn=refresh_jobs_panel,
+        inputs=[job_selector],
+        outputs=[jobs_overview, job_selector],
+    ).then(
+        fn=show_last_run_comparison,
+        inputs=[],
+        outputs=[run_comparison],
     ).then(
         fn=_bump_editor_epoch,
         inputs=[editor_sections_epoch],
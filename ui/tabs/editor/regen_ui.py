@@ -0,0 +1,173 @@
+# ui/tabs/editor/regen_ui.py
+import gradio as gr
+from handlers.editor.regen_presets import REGEN_LEVELS
+from handlers.editor.constants import Components, States
+
+def create_regen_ui():
+    """Create UI components for Regen mode."""
+    with gr.Column(visible=False) as regen_section:
+        regen_level_radio = gr.Radio(
+            label="Regeneration Level",
+            choices=list(REGEN_LEVELS.keys()),
+            value="Preserve Medium",
+            interactive=True,
+        )
+        regen_instructions_tb = gr.Textbox(
+            label="Regen Instructions (optional)",
+            placeholder="What should change in this chapter?",
+            lines=3,
+            interactive=True,
+        )
+        regen_btn = gr.Button("♻️ Regenerate Chapter", variant="primary")
+        with gr.Row():
+            regen_validate_btn = gr.Button("✅ Validate", visible=False, scale=1, min_width=0)
+            regen_force_edit_btn = gr.Button("⚡ Force Edit", visible=False, scale=1, min_width=0)
+        with gr.Row():
+            regen_keep_draft_btn = gr.Button("💾 Keep Draft", visible=False, scale=1, min_width=0)
+            regen_discard_btn = gr.Button("🗑️ Discard", visible=False, scale=1, min_width=0)
+    return regen_section, regen_level_radio, regen_instructions_tb, regen_btn, regen_validate_btn, regen_discard_btn, regen_force_edit_btn, regen_keep_draft_btn
+
+def create_regen_handlers(components, states):
+    """Wire events for Regen mode components."""
+    from handlers.editor.regen import regen_handler, regen_discard, regen_validate
+    from handlers.editor.rewrite import rewrite_force_edit
+    from handlers.editor.utils import keep_draft_handler
+
+    regen_section = components[Components.REGEN_SECTION]
+    regen_level_radio = components[Components.REGEN_LEVEL_RADIO]
+    regen_instructions_tb = components[Components.REGEN_INSTRUCTIONS_TB]
+    regen_btn = components[Components.REGEN_BTN]
+    regen_validate_btn = components[Components.REGEN_VALIDATE_BTN]
+    regen_discard_btn = components[Components.REGEN_DISCARD_BTN]
+    regen_force_edit_btn = components[Components.REGEN_FORCE_EDIT_BTN]
+    regen_keep_draft_btn = components[Components.REGEN_KEEP_DRAFT_BTN]
+
+    # Shared components
+    editor_tb = components[Components.EDITOR_TB]
+    selected_section = states[States.SELECTED_SECTION]
+    status_log = states[States.STATUS_LOG]
+    create_sections_epoch = states[States.CREATE_SECTIONS_EPOCH]
+
+    regen_outputs = [
+        components[Components.VIEWER_MD],
+        regen_validate_btn,
+        regen_discard_btn,
+        regen_force_edit_btn,
+        regen_keep_draft_btn,
+        regen_btn,
+        components[Components.STATUS_STRIP],
+        status_log,
+        components[Components.MODE_RADIO],
+        components[Components.SECTION_DROPDOWN],
+        components[Components.ADD_FILL_BTN],
+    ]
+
+    regen_btn.click(
+        fn=regen_handler,
+        inputs=[selected_section, regen_level_radio, regen_instructions_tb, status_log],
+        outputs=regen_outputs,
+        queue=True,
+        show_progress=False,
+    )
+
+    regen_discard_btn.click(
+        fn=regen_discard,
+        inputs=[selected_section, status_log],
+        outputs=regen_outputs,
+    )
+
+    # Force Edit / Validate / Keep Draft reuse the Rewrite handlers: the regenerated chapter lives in viewer_md
+    # exactly like a rewrite draft, and regen_section takes the rewrite_section slot.
+    regen_force_edit_btn.click(
+        fn=rewrite_force_edit,
+        inputs=[selected_section, components[Components.VIEWER_MD], status_log, create_sections_epoch],
+        outputs=[
+            components[Components.VIEWER_MD],
+            components[Components.STATUS_STRIP],
+            editor_tb,
+            components[Components.VALIDATION_TITLE],
+            components[Components.VALIDATION_BOX],
+            components[Components.VALIDATION_SECTION],
+            components[Components.APPLY_UPDATES_BTN],
+            components[Components.REGENERATE_BTN],
+            components[Components.CONTINUE_BTN],
+            components[Components.DISCARD2_BTN],
+            components[Components.CONFIRM_BTN],
+            components[Components.DISCARD_BTN],
+            components[Components.FORCE_EDIT_BTN],
+            components[Components.START_EDIT_BTN],
+            regen_section,
+            components[Components.MODE_RADIO],
+            components[Components.SECTION_DROPDOWN],
+            status_log,
+            create_sections_epoch,
+            states[States.SELECTED_TEXT],
+            states[States.SELECTED_INDICES],
+            components[Components.STATUS_ROW],
+            components[Components.STATUS_LABEL],
+            components[Components.BTN_CHECKPOINT],
+            components[Components.BTN_DRAFT],
+            components[Components.BTN_DIFF],
+            states[States.CURRENT_VIEW_STATE],
+            components[Components.BTN_UNDO],
+            components[Components.BTN_REDO],
+            components[Components.ADD_FILL_BTN],
+        ],
+    )
+
+    regen_validate_btn.click(
+        fn=regen_validate,
+        inputs=[selected_section, components[Components.VIEWER_MD], status_log],
+        outputs=[
+            components[Components.VALIDATION_BOX],
+            states[States.PENDING_PLAN],
+            components[Components.VALIDATION_TITLE],
+            components[Components.VALIDATION_BOX],
+            components[Components.VALIDATION_SECTION],
+            components[Components.APPLY_UPDATES_BTN],
+            components[Components.REGENERATE_BTN],
+            components[Components.CONTINUE_BTN],
+            components[Components.DISCARD2_BTN],
+            regen_section,
+            components[Components.VIEWER_MD],
+            editor_tb,
+            components[Components.MODE_RADIO],
+            components[Components.SECTION_DROPDOWN],
+            components[Components.STATUS_STRIP],
+            status_log,
+            components[Components.STATUS_ROW],
+            components[Components.ADD_FILL_BTN],
+        ],
+        queue=True,
+        show_progress=False,
+    )
+
+    regen_keep_draft_btn.click(
+        fn=keep_draft_handler,
+        inputs=[selected_section, components[Components.VIEWER_MD], status_log],
+        outputs=[
+            components[Components.VIEWER_MD],
+            components[Components.STATUS_LABEL],
+            states[States.CURRENT_VIEW_STATE],
+            components[Components.BTN_CHECKPOINT],
+            components[Components.BTN_DRAFT],
+            components[Components.BTN_DIFF],
+            components[Components.MODE_RADIO],
+            components[Components.SECTION_DROPDOWN],
+            components[Components.VIEW_ACTIONS_ROW],
+            states[States.STATUS_LOG],
+            components[Components.STATUS_STRIP],
+            # Manual Mode UI items to hide
+            components[Components.START_EDIT_BTN],
+            components[Components.CONFIRM_BTN],
+            components[Components.DISCARD_BTN],
+            components[Components.FORCE_EDIT_BTN],
+            components[Components.KEEP_DRAFT_BTN],
+            # Regen Mode items to hide (rewrite_section slot)
+            regen_section,
+            # Chat Mode items to hide
+            components[Components.CHAT_SECTION],
+            components[Components.ADD_FILL_BTN],
+            components[Components.CHAT_TYPE_DROPDOWN],
+        ]
+    )
@@ -122,7 +122,7 @@ def create_validate_handlers(components, states):
         
         if current_mode == "Manual":
             return editor_text or ""
-        elif current_mode == "Rewrite":
+        elif current_mode in ("Rewrite", "Regen"):
             return remove_highlight(viewer_content or "")
         else:  # Chat or View
             return get_current_section_content(section)
@@ -200,6 +200,7 @@ def create_validate_handlers(components, states):
             components[Components.BTN_REDO],
             components[Components.ADD_FILL_BTN],
             components[Components.CHAT_TYPE_DROPDOWN],
+            components[Components.REGEN_SECTION],
         ],
     )
 
@@ -323,7 +324,7 @@ def create_validate_handlers(components, states):
     btn_draft_regenerate.click(
         fn=draft_regenerate_selected,
         inputs=[generated_drafts_list, pending_plan, selected_section, status_log, create_sections_epoch, keep_drafts_choices_state],
-        outputs=[components[Components.DRAFT_REVIEW_PANEL], original_draft_checkbox, generated_drafts_list, components[Components.STATUS_STRIP], status_log, create_sections_epoch, components[Components.STATUS_ROW], stop_updates_btn, generated_drafts_choices_state, keep_drafts_choices_state],
+        outputs=[components[Components.DRAFT_REVIEW_PANEL], original_draft_checkbox, generated_drafts_list, components[Components.STATUS_STRIP], status_log, create_sections_epoch, components[Components.STATUS_ROW], stop_updates_btn, generated_drafts_choices_state, keep_drafts_choices_state, btn_draft_accept_all, btn_draft_revert, btn_draft_accept_selected, btn_draft_regenerate, select_all_gen_btn, mark_keep_btn],
         queue=True
     )
     
@@ -16,6 +16,7 @@ from state.drafts_manager import DraftsManager, DraftType
 from state.infill_manager import InfillManager
 import ui.tabs.editor.manual_ui as Manual
 import ui.tabs.editor.rewrite_ui as Rewrite
+import ui.tabs.editor.regen_ui as Regen
 import ui.tabs.editor.validate_ui as Validate
 import ui.tabs.editor.chat_ui as Chat
 from handlers.editor.constants import Components, States
@@ -64,7 +65,7 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
 
                 mode_radio = gr.Radio(
                     label="Editing Mode",
-                    choices=["View", "Manual", "Rewrite", "Chat"],
+                    choices=["View", "Manual", "Rewrite", "Regen", "Chat"],
                     value="View",
                     interactive=True,
                 )
@@ -75,6 +76,9 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
             # Rewrite Mode UI
             rewrite_section, rewrite_selected_preview, preset_dropdown, rewrite_instructions_tb, rewrite_btn, rewrite_validate_btn, rewrite_discard_btn, rewrite_force_edit_btn, rewrite_keep_draft_btn = Rewrite.create_rewrite_ui()
             
+            # Regen Mode UI
+            regen_section, regen_level_radio, regen_instructions_tb, regen_btn, regen_validate_btn, regen_discard_btn, regen_force_edit_btn, regen_keep_draft_btn = Regen.create_regen_ui()
+            
             # Chat Mode UI
             chat_section, chatbot, chat_input, chat_send_btn, chat_clear_btn, chat_actions_row_1, chat_discard_btn, chat_force_edit_btn, chat_actions_row_2, chat_validate_btn, chat_keep_draft_btn, chat_type_dropdown = Chat.create_chat_ui()
             
@@ -256,6 +260,12 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
         rewrite_action_upd = gr.update(visible=False)
         rewrite_keep_draft_upd = gr.update(visible=False)
         
+        # Regen Mode (doar pentru capitole; celelalte capitole rămân neatinse)
+        regen_section_upd = gr.update(visible=(mode == "Regen"))
+        is_chapter = bool(section) and section.startswith("Chapter ")
+        regen_btn_upd = gr.update(interactive=is_chapter)
+        regen_action_upd = gr.update(visible=False)
+        
         # Chat Mode
         chat_section_upd = gr.update(visible=(mode == "Chat"))
         # Hide chat action buttons when entering Chat mode - they'll be shown only after a draft is created
@@ -279,7 +289,7 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
         validation_section_upd = gr.update(visible=(pending_plan is not None))
         
         # --- Common UI updates (Viewer, Status Bar) ---
-        status_row_upd = gr.update(visible=(mode != "Rewrite")) # Hide status bar in Rewrite
+        status_row_upd = gr.update(visible=(mode not in ("Rewrite", "Regen"))) # Hide status bar in Rewrite/Regen
         view_actions_upd = gr.update(visible=False)
         viewer_update = gr.update()
         status_label_upd = gr.update()
@@ -293,6 +303,9 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
             # Re-fetch what should be shown based on preserved view_state (Checkpoint/Draft/Diff)
             # This is CRITICAL for user's report about preserving view selection.
             content, label, state, undo_upd, redo_upd = _handle_view_switch(view_state, section, pending_plan)
+            if mode == "Regen":
+                # Regen pornește de la textul curent (draft dacă există), ca și Rewrite
+                content = get_current_section_content(section) or "_Empty_"
             viewer_update = gr.update(visible=(mode != "Rewrite"), value=content)
             status_label_upd = gr.update(value=label)
             
@@ -326,7 +339,8 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
             rewrite_btn_upd, rewrite_action_upd, rewrite_action_upd, rewrite_action_upd, rewrite_keep_draft_upd,
             status_row_upd, view_actions_upd, status_label_upd,
             chat_actions_row_1_upd, chat_actions_row_2_upd, chat_type_dropdown_upd,
-            undo_upd, redo_upd
+            undo_upd, redo_upd,
+            regen_section_upd, regen_btn_upd, regen_action_upd, regen_action_upd, regen_action_upd, regen_action_upd
         )
 
     # ====== Dispatchers ======
@@ -336,18 +350,23 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
     def _continue_edit_dispatcher(section, current_log, current_mode, viewer_md=None):
         """Dispatch continue_edit to appropriate module based on mode."""
         from handlers.editor.rewrite import continue_edit as rewrite_continue_edit
+        from handlers.editor.regen import continue_edit as regen_continue_edit
         from handlers.editor.chat import continue_edit as chat_continue_edit
         from handlers.editor.manual import continue_edit as manual_continue_edit
         from handlers.editor.view import continue_edit as view_continue_edit
         
+        if current_mode == "Regen":
+            # last output: regen_section
+            return (*regen_continue_edit(section, current_log, viewer_md), gr.update(visible=True))
         if current_mode == "Rewrite":
-            return rewrite_continue_edit(section, current_log, viewer_md)
+            result = rewrite_continue_edit(section, current_log, viewer_md)
         elif current_mode == "Chat":
-            return chat_continue_edit(section, current_log)
+            result = chat_continue_edit(section, current_log)
         elif current_mode == "View":
-            return view_continue_edit(section, current_log)
+            result = view_continue_edit(section, current_log)
         else:
-            return manual_continue_edit(section, current_log)
+            result = manual_continue_edit(section, current_log)
+        return (*result, gr.update(visible=False))
 
     # ====== Wiring ======
     
@@ -461,7 +480,8 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
             rewrite_btn, rewrite_validate_btn, rewrite_discard_btn, rewrite_force_edit_btn, rewrite_keep_draft_btn, 
             status_row, view_actions_row, status_label,
             chat_actions_row_1, chat_actions_row_2, chat_type_dropdown,
-            btn_undo, btn_redo
+            btn_undo, btn_redo,
+            regen_section, regen_btn, regen_validate_btn, regen_discard_btn, regen_force_edit_btn, regen_keep_draft_btn
         ]
     )
     
@@ -488,6 +508,14 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
         Components.REWRITE_DISCARD_BTN: rewrite_discard_btn,
         Components.REWRITE_FORCE_EDIT_BTN: rewrite_force_edit_btn,
         Components.REWRITE_KEEP_DRAFT_BTN: rewrite_keep_draft_btn,
+        Components.REGEN_SECTION: regen_section,
+        Components.REGEN_LEVEL_RADIO: regen_level_radio,
+        Components.REGEN_INSTRUCTIONS_TB: regen_instructions_tb,
+        Components.REGEN_BTN: regen_btn,
+        Components.REGEN_VALIDATE_BTN: regen_validate_btn,
+        Components.REGEN_DISCARD_BTN: regen_discard_btn,
+        Components.REGEN_FORCE_EDIT_BTN: regen_force_edit_btn,
+        Components.REGEN_KEEP_DRAFT_BTN: regen_keep_draft_btn,
         Components.CHAT_SECTION: chat_section,
         Components.CHATBOT: chatbot,
         Components.CHAT_INPUT: chat_input,
@@ -557,6 +585,7 @@ def render_editor_tab(editor_sections_epoch, create_sections_epoch):
 
     Manual.create_manual_handlers(components, states)
     Rewrite.create_rewrite_handlers(components, states)
+    Regen.create_regen_handlers(components, states)
     Chat.create_chat_handlers(components, states)
     Validate.create_validate_handlers(components, states)
     
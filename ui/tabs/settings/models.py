@@ -16,7 +16,7 @@ def render_models_tab(process_log):
 
         def get_model_data(model_name):
             if not model_name:
-                return "", "", "llm", LLM_PROVIDERS[0], "", "", True, False, False, False, LLM_PROVIDERS
+                return "", "", "llm", LLM_PROVIDERS[0], "", "", False, True, False, False, True, LLM_PROVIDERS, 0.0, 0.0
                 
             model = next((m for m in settings_manager.get_models() if m.name == model_name), None)
             if not model:
@@ -40,12 +40,12 @@ def render_models_tab(process_log):
             key_vis = caps.get("has_api_key", False)
             reasoning_vis = caps.get("has_reasoning", False)
             
-            return name, tech_name, m_type, provider, url, key, reasoning, url_vis, key_vis, reasoning_vis, delete_interactive, provider_choices
+            return name, tech_name, m_type, provider, url, key, reasoning, url_vis, key_vis, reasoning_vis, delete_interactive, provider_choices, model.input_price, model.output_price
 
         (
             initial_name, initial_tech_name, initial_type, initial_provider, 
             initial_url, initial_key, initial_reasoning, initial_url_vis, initial_key_vis, initial_reasoning_vis,
-            initial_delete_interactive, curr_provider_choices
+            initial_delete_interactive, curr_provider_choices, initial_input_price, initial_output_price
         ) = get_model_data(default_val)
 
         with gr.Row():
@@ -78,6 +78,9 @@ def render_models_tab(process_log):
             model_url_input = gr.Textbox(label="Endpoint URL", value=initial_url, visible=initial_url_vis)
             model_key_input = gr.Textbox(label="API Key", type="password", visible=initial_key_vis, value=initial_key)
             reasoning_checkbox = gr.Checkbox(label="Reasoning", value=initial_reasoning, visible=initial_reasoning_vis)
+            with gr.Row():
+                input_price_input = gr.Number(label="Input Price ($ / 1M tokens)", value=initial_input_price, minimum=0, precision=4)
+                output_price_input = gr.Number(label="Output Price ($ / 1M tokens)", value=initial_output_price, minimum=0, precision=4)
             
             def update_provider_choices(m_type):
                 if m_type == "llm":
@@ -103,7 +106,7 @@ def render_models_tab(process_log):
 
         def load_model_details(model_name):
             (
-                name, tech, mtype, prov, url, key, reasoning, url_v, key_v, reasoning_v, del_int, p_choices
+                name, tech, mtype, prov, url, key, reasoning, url_v, key_v, reasoning_v, del_int, p_choices, in_price, out_price
             ) = get_model_data(model_name)
             
             return (
@@ -114,16 +117,18 @@ def render_models_tab(process_log):
                 gr.update(value=url, visible=url_v),
                 gr.update(value=key, visible=key_v),
                 gr.update(value=reasoning, visible=reasoning_v),
-                gr.update(interactive=del_int)
+                gr.update(interactive=del_int),
+                in_price,
+                out_price
             )
 
         model_selector.change(
             fn=load_model_details,
             inputs=[model_selector],
-            outputs=[name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, delete_btn]
+            outputs=[name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, delete_btn, input_price_input, output_price_input]
         )
 
-        def save_model(name, tech_name, m_type, provider, url, key, reasoning, current_log):
+        def save_model(name, tech_name, m_type, provider, url, key, reasoning, input_price, output_price, current_log):
             if not name:
                 return append_log_string(current_log, ts_prefix("❌ Name is required.")), gr.update()
             
@@ -139,7 +144,9 @@ def render_models_tab(process_log):
                     "url": url,
                     "api_key": key,
                     "reasoning": reasoning if reasoning else False,
-                    "is_default": False
+                    "is_default": False,
+                    "input_price": float(input_price or 0.0),
+                    "output_price": float(output_price or 0.0)
                 }
                 
                 if model_exists:
@@ -162,7 +169,7 @@ def render_models_tab(process_log):
 
         save_evt = save_btn.click(
             fn=save_model,
-            inputs=[name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, process_log],
+            inputs=[name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, input_price_input, output_price_input, process_log],
             outputs=[process_log, model_selector]
         )
 
@@ -171,7 +178,8 @@ def render_models_tab(process_log):
                 return (
                     append_log_string(current_log, ts_prefix("❌ No model selected.")), 
                     gr.update(), gr.update(), gr.update(), gr.update(), 
-                    gr.update(), gr.update(), gr.update(), gr.update(), gr.update()
+                    gr.update(), gr.update(), gr.update(), gr.update(), gr.update(),
+                    gr.update(), gr.update()
                 )
             try:
                 settings_manager.delete_model(name)
@@ -182,7 +190,7 @@ def render_models_tab(process_log):
                 log_msg = append_log_string(current_log, ts_prefix(f"✅ Model '{name}' deleted."))
                 
                 (
-                    f_name, f_tech, f_type, f_provider, f_url, f_key, f_reasoning, f_url_vis, f_key_vis, f_reasoning_vis, f_del_int, f_choices
+                    f_name, f_tech, f_type, f_provider, f_url, f_key, f_reasoning, f_url_vis, f_key_vis, f_reasoning_vis, f_del_int, f_choices, f_in_price, f_out_price
                 ) = get_model_data(fallback_name)
                 
                 return (
@@ -195,20 +203,23 @@ def render_models_tab(process_log):
                     gr.update(value=f_url, visible=f_url_vis),
                     gr.update(value=f_key, visible=f_key_vis),
                     gr.update(value=f_reasoning, visible=f_reasoning_vis),
-                    gr.update(interactive=f_del_int)
+                    gr.update(interactive=f_del_int),
+                    f_in_price,
+                    f_out_price
                 )
 
             except Exception as e:
                 return (
                     append_log_string(current_log, ts_prefix(f"❌ Error: {e}")), 
                     gr.update(), gr.update(), gr.update(), gr.update(), 
-                    gr.update(), gr.update(), gr.update(), gr.update(), gr.update()
+                    gr.update(), gr.update(), gr.update(), gr.update(), gr.update(),
+                    gr.update(), gr.update()
                 )
 
         del_evt = delete_btn.click(
             fn=delete_model,
             inputs=[model_selector, process_log],
-            outputs=[process_log, model_selector, name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, delete_btn]
+            outputs=[process_log, model_selector, name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, delete_btn, input_price_input, output_price_input]
         )
 
         def refresh_models_list():
@@ -216,4 +227,4 @@ def render_models_tab(process_log):
             names = [m.name for m in models]
             return gr.update(choices=names)
 
-        return refresh_models_list, model_selector, save_evt, del_evt, load_model_details, [name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, delete_btn]
+        return refresh_models_list, model_selector, save_evt, del_evt, load_model_details, [name_input, technical_name_input, type_selector, provider_selector, model_url_input, model_key_input, reasoning_checkbox, delete_btn, input_price_input, output_price_input]
@@ -0,0 +1,53 @@
+import gradio as gr
+from state.settings_manager import settings_manager
+from handlers.settings import PIPELINE_OPTIONS
+from utils.timestamp import ts_prefix
+from utils.logger import append_log_string
+
+
+def render_pipeline_tab(process_log):
+    with gr.Column():
+        gr.Markdown("### Pipeline Options")
+
+        option_inputs = []
+        with gr.Group():
+            for option in PIPELINE_OPTIONS:
+                value = settings_manager.get_pipeline_setting(option.technical_name)
+                if isinstance(option.default, bool):
+                    component = gr.Checkbox(label=option.display_name, value=bool(value), info=option.description)
+                else:
+                    component = gr.Number(
+                        label=option.display_name,
+                        value=value,
+                        info=option.description,
+                        minimum=option.minimum,
+                        maximum=option.maximum,
+                        precision=0 if isinstance(option.default, int) else None,
+                    )
+                option_inputs.append(component)
+
+        save_btn = gr.Button("💾 Save Pipeline Options", variant="primary")
+
+        def save_pipeline_options(*args):
+            *values, current_log = args
+            update = {}
+            for option, value in zip(PIPELINE_OPTIONS, values):
+                if isinstance(option.default, bool):
+                    update[option.technical_name] = bool(value)
+                elif value is None:
+                    update[option.technical_name] = option.default
+                else:
+                    update[option.technical_name] = type(option.default)(value)
+            try:
+                settings_manager.update_pipeline_settings(update)
+                return append_log_string(current_log, ts_prefix("✅ Pipeline options saved."))
+            except Exception as e:
+                return append_log_string(current_log, ts_prefix(f"❌ Error: {e}"))
+
+        save_btn.click(
+            fn=save_pipeline_options,
+            inputs=option_inputs + [process_log],
+            outputs=[process_log]
+        )
+
+    return option_inputs
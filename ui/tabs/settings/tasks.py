@@ -1,7 +1,11 @@
 import gradio as gr
+from utils.timestamp import ts_prefix
+from utils.logger import append_log_string
+from provider.cascade import describe_cascade
 from state.settings_manager import settings_manager, LLM_TASKS
 from handlers.settings import (
     REASONING_EFFORT_OPTIONS,
+    CASCADE_TASKS,
     get_task_defaults,
     IMAGE_TASKS
 )
@@ -13,6 +17,18 @@ from handlers.settings.tasks_handlers import (
 )
 
 
+def _create_cascade_handler(tech_name, display_name):
+    def handler(cascade_model, log):
+        value = None if cascade_model in (None, "None") else cascade_model
+        settings_manager.update_task_settings(tech_name, {"cascade_model": value})
+        message = f"Cascade model for {display_name}: {value or 'off'}."
+        cascade_line = describe_cascade()
+        if cascade_line:
+            message += f" {cascade_line}"
+        return append_log_string(log, ts_prefix(message))
+    return handler
+
+
 def render_tasks_tab(process_log):
     with gr.Column():
         gr.Markdown("### Assign Models to Tasks")
@@ -107,6 +123,18 @@ def render_tasks_tab(process_log):
                                     minimum=0
                                 )
                         
+                        if tech_name in CASCADE_TASKS:
+                            cascade_dd = gr.Dropdown(
+                                label="Cascade Model (ask this model first; escalate to the task model when unsure)",
+                                choices=["None"] + [m for m in llm_models if m != current_model],
+                                value=task_settings.get("cascade_model") or "None",
+                            )
+                            cascade_dd.change(
+                                fn=_create_cascade_handler(tech_name, display_name),
+                                inputs=[cascade_dd, process_log],
+                                outputs=[process_log]
+                            )
+                        
                         with gr.Row():
                             save_btn = gr.Button("💾 Save Parameters", variant="primary", size="sm")
                             reset_btn = gr.Button("🔄 Reset Defaults", variant="secondary", size="sm")
@@ -1,6 +1,7 @@
 import gradio as gr
 from ui.tabs.settings.models import render_models_tab
 from ui.tabs.settings.tasks import render_tasks_tab
+from ui.tabs.settings.pipeline import render_pipeline_tab
 from state.settings_manager import settings_manager
 from utils.timestamp import ts_prefix
 
@@ -16,6 +17,8 @@ def render_settings_tab():
                         refresh_models_fn, model_selector_comp, save_evt, del_evt, load_model_details_fn, model_input_components = render_models_tab(process_log)
                     with gr.Tab("📋 Tasks"):
                         refresh_tasks_fn, task_outputs = render_tasks_tab(process_log)
+                    with gr.Tab("🧩 Pipeline"):
+                        render_pipeline_tab(process_log)
             
             # Wire up auto-refresh for tasks when models change - using .then() on events returned from models.py
             # This ensures they run AFTER the save/delete logic completes
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# utils/edit_ops.py
+"""
+Operații de editare ancorate (find/replace, insert-after) pe care editorii LLM le pot întoarce
+în locul textului complet când schimbarea este locală. Aplicarea este locală și strictă:
+fiecare ancoră trebuie găsită (exact sau modulo spații), iar o ancoră ambiguă anulează patch-ul.
+"""
+
+import re
+import textwrap
+from typing import Any, Dict, List
+
+OP_REPLACE = "replace"
+OP_INSERT_AFTER = "insert_after"
+
+EDIT_OPERATIONS_FORMAT = textwrap.dedent("""\
+"operations" is a list of anchored edits applied in order to the current text:
+  {"op": "replace", "find": "exact text copied from the current text", "replace": "new text", "all": false}
+  {"op": "insert_after", "anchor": "exact text copied from the current text", "text": "text to insert right after it"}
+- "find" / "anchor" must be copied verbatim and be long enough to be unique (a full sentence is best).
+- Use "all": true only for renames that must change every occurrence (e.g. a character name).
+- "text" is inserted exactly as given: start it with a space or a blank line ("\\n\\n") as needed.
+- To delete a passage, replace it with "".
+""").strip()
+
+
+class EditOperationError(ValueError):
+    """O operație nu poate fi aplicată (ancoră lipsă, ambiguă sau operație invalidă)."""
+
+
+def _bounded(anchor: str, body: str) -> re.Pattern:
+    """
+    Ancora nu poate începe / termina în mijlocul unui cuvânt: "Tom" nu se potrivește în "Tomas",
+    iar un rename cu "all": true nu atinge cuvintele care doar conțin numele.
+    """
+    start = r"(?<!\w)" if re.match(r"\w", anchor) else ""
+    end = r"(?!\w)" if re.search(r"\w$", anchor) else ""
+    return re.compile(start + body + end)
+
+
+def _anchor_pattern(anchor: str) -> re.Pattern:
+    """Potrivire tolerantă la spații / rânduri noi între cuvintele ancorei."""
+    return _bounded(anchor.strip(), r"\s+".join(re.escape(word) for word in anchor.split()))
+
+
+def _find(text: str, anchor: str, allow_many: bool) -> List[re.Match]:
+    if not anchor or not anchor.strip():
+        raise EditOperationError("empty anchor")
+    matches = list(_bounded(anchor, re.escape(anchor)).finditer(text)) or list(_anchor_pattern(anchor).finditer(text))
+    if not matches:
+        raise EditOperationError(f"anchor not found: {anchor[:80]!r}")
+    if len(matches) > 1 and not allow_many:
+        raise EditOperationError(f"anchor is ambiguous ({len(matches)} matches): {anchor[:80]!r}")
+    return matches
+
+
+def apply_edit_operations(text: str, operations: List[Dict[str, Any]]) -> str:
+    """
+    Aplică operațiile în ordine și întoarce textul nou.
+    Ridică EditOperationError la prima operație care nu poate fi verificată — textul original rămâne valabil.
+    """
+    if not isinstance(operations, list) or not operations:
+        raise EditOperationError("no operations")
+    for op in operations:
+        if not isinstance(op, dict):
+            raise EditOperationError(f"invalid operation: {op!r}")
+        kind = op.get("op")
+        if kind == OP_REPLACE:
+            replacement = op.get("replace")
+            if replacement is None:
+                raise EditOperationError("replace without 'replace' text")
+            matches = _find(text, op.get("find") or "", bool(op.get("all")))
+            for m in reversed(matches):
+                text = text[:m.start()] + replacement + text[m.end():]
+        elif kind == OP_INSERT_AFTER:
+            insertion = op.get("text") or ""
+            if not insertion:
+                raise EditOperationError("insert_after without 'text'")
+            m = _find(text, op.get("anchor") or "", False)[0]
+            text = text[:m.end()] + insertion + text[m.end():]
+        else:
+            raise EditOperationError(f"unknown operation: {kind!r}")
+    return text
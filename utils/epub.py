@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# utils/epub.py
+"""
+Scrierea fișierului EPUB dintr-o listă de capitole (markdown), fără dependențe de UI sau checkpoint.
+Folosit atât de Export tab, cât și de CLI-ul de batch.
+"""
+
+import os
+import markdown
+from ebooklib import epub
+
+
+def write_epub(chapters_full, title, author, cover_image_path=None, font_family="Georgia, serif", font_size="12pt", output_dir="exports"):
+    """
+    Construiește fișierul EPUB din lista de capitole și returnează calea absolută.
+    """
+    book = epub.EpubBook()
+
+    book.set_identifier(f"id_{title.lower().replace(' ', '_')}")
+    book.set_title(title)
+    book.set_language('en')
+    book.add_author(author)
+
+    cover_page = None
+    if cover_image_path and os.path.exists(cover_image_path):
+        with open(cover_image_path, 'rb') as f:
+            cover_content = f.read()
+        ext = os.path.splitext(cover_image_path)[1]
+        if not ext:
+            ext = ".png" # Default to png if no extension
+        cover_file_name = f"cover{ext}"
+        
+        book.set_cover(cover_file_name, cover_content, create_page=False)
+        
+        # We use inline styles on a container div to ensure centering across different readers.
+        cover_html_content = f'''
+        <div style="position: absolute; top: 0; left: 0; bottom: 0; right: 0; text-align: center; margin: 0; padding: 0; display: flex; justify-content: center; align-items: center;">
+            <img src="{cover_file_name}" alt="Cover" style="max-width: 100%; max-height: 100%; height: auto; width: auto; object-fit: contain;" />
+        </div>
+        '''
+        
+        cover_page = epub.EpubHtml(title="Cover", file_name="cover_page.xhtml", lang='en')
+        cover_page.content = cover_html_content
+        book.add_item(cover_page)
+
+    title_page_content = f"""
+    <div style="text-align: center; margin-top: 20%;">
+        <h1 style="font-size: 2.5em; margin-bottom: 0.5em;">{title}</h1>
+        <h2 style="font-size: 1.2em; font-weight: normal; margin-left: 10%; color: #444;">by {author}</h2>
+    </div>
+    """
+    title_page = epub.EpubHtml(title="Title Page", file_name="title.xhtml", lang='en')
+    title_page.content = title_page_content
+    book.add_item(title_page)
+
+    epub_chapters = []
+    
+    book.spine = ['nav']
+    if cover_page:
+        book.spine.append(cover_page)
+    book.spine.append(title_page)
+
+    for i, chapter_content in enumerate(chapters_full or []):
+        lines = chapter_content.split('\n')
+        chapter_title = f"Chapter {i+1}"
+        
+        for line in lines:
+            if line.strip().startswith("## "):
+                chapter_title = line.strip().replace("## ", "").strip()
+                break
+        
+        chapter_file_name = f"chapter_{i+1}.xhtml"
+        
+        html_content = markdown.markdown(chapter_content)
+        
+        c = epub.EpubHtml(title=chapter_title, file_name=chapter_file_name, lang='en')
+        c.content = html_content
+        
+        c.add_item(epub.EpubItem(uid="style_nav", file_name="style/nav.css", media_type="text/css"))
+        
+        book.add_item(c)
+        epub_chapters.append(c)
+        book.spine.append(c)
+
+    book.toc = [epub.Link("title.xhtml", "Title Page", "title")]
+    book.toc.extend(epub_chapters)
+
+    book.add_item(epub.EpubNcx())
+    book.add_item(epub.EpubNav())
+
+    style = f'''
+    body {{ 
+        font-family: {font_family}; 
+        font-size: {font_size};
+        line-height: 1.6;
+        margin: 0;
+        padding: 0;
+    }} 
+    h1 {{ text-align: center; }}
+    p {{ margin-bottom: 1em; }}
+    '''
+    nav_css = epub.EpubItem(uid="style_nav", file_name="style/nav.css", media_type="text/css", content=style)
+    book.add_item(nav_css)
+
+    os.makedirs(output_dir, exist_ok=True)
+    
+    safe_title = "".join([c for c in title if c.isalnum() or c in (' ', '-', '_')]).strip().replace(' ', '_')
+    output_filename = f"{safe_title}.epub"
+    output_path = os.path.join(output_dir, output_filename)
+
+    epub.write_epub(output_path, book, {})
+    return os.path.abspath(output_path)
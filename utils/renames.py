@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# utils/renames.py
+"""
+Calea rapidă, fără LLM, pentru redenumiri (ex: "Robert" → "Michael").
+detect_renames compară secțiunea originală cu cea editată la nivel de token și acceptă editarea
+doar dacă este explicată complet de substituții consecvente de nume proprii — cuvinte care apar cu
+majusculă în interiorul unei propoziții (nu doar la început) și nu sunt cuvinte comune ("Yesterday",
+"She"); orice altă editare merge la version_diff. rename_in_text aplică
+substituțiile whole-word (inclusiv posesive și MAJUSCULE) și refuză textele ambigue.
+"""
+
+import re
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+_TOKEN_RE = re.compile(r"\w+|\s+|[^\w\s]")
+_MAX_NAME_WORDS = 4
+_SENTENCE_END = ".!?…\n"
+_OPENING = "\"'“‘«([—-* \t"
+# cuvinte care apar cu majusculă fără a fi nume: pronume, cuvinte funcționale, timp, titluri generice
+_COMMON_WORDS = frozenset("""
+i me my mine we us our ours you your yours he him his she her hers it its they them their theirs
+this that these those there here who whom whose which what when where why how
+a an the and or but nor so yet for of in on at by to from with without into onto over under after before
+if then than as because while though although since until unless whether not no yes all any each every
+some many much more most few both either neither one two three other another such same own
+is am are was were be been being have has had do does did will would shall should can could may might must
+today tomorrow yesterday tonight now later soon never always sometimes morning evening night day week year
+monday tuesday wednesday thursday friday saturday sunday
+january february march april may june july august september october november december
+spring summer autumn fall winter north south east west
+mr mrs ms miss sir madam lord lady king queen prince princess captain doctor dr mother father mom dad
+god chapter part book
+""".split())
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text or "")
+
+
+def _is_name(phrase: str) -> bool:
+    """Nume propriu plauzibil: 1–4 cuvinte, fiecare începând cu majusculă."""
+    words = phrase.split()
+    return 0 < len(words) <= _MAX_NAME_WORDS and all(w[:1].isupper() and re.fullmatch(r"[\w'’.-]+", w) for w in words)
+
+
+def _sentence_initial(text: str, start: int) -> bool:
+    """Poziția `start` este la începutul unei propoziții (după ., !, ?, linie nouă sau început de text)."""
+    before = text[:start].rstrip(_OPENING)
+    return not before or before[-1] in _SENTENCE_END
+
+
+def _is_common(name: str) -> bool:
+    return any(w.lower().strip("'’.-") in _COMMON_WORDS for w in name.split())
+
+
+def is_proper_noun(name: str, *texts: str) -> bool:
+    """
+    Nume propriu "sigur": niciun cuvânt nu este comun, iar numele apare cu majusculă în interiorul
+    unei propoziții în cel puțin unul din texte (ex: secțiunea editată, Expanded Plot, Chapters Overview).
+    Un cuvânt scris cu majusculă doar la început de propoziție poate fi un cuvânt obișnuit.
+    """
+    if _is_common(name):
+        return False
+    pattern = _pattern(name)
+    return any(not _sentence_initial(text, m.start()) for text in texts if text for m in pattern.finditer(text))
+
+
+def _pattern(name: str, flags: int = 0) -> re.Pattern:
+    return re.compile(r"(?<!\w)" + r"\s+".join(re.escape(w) for w in name.split()) + r"(?!\w)", flags)
+
+
+def _replacement(match: str, old: str, new: str) -> Optional[str]:
+    """Păstrează forma ocurenței: exactă → new, MAJUSCULE → NEW; altă formă → None (ambiguu)."""
+    if match == old:
+        return new
+    if match.isupper() and not old.isupper():
+        return new.upper()
+    return None
+
+
+def rename_in_text(text: str, renames: List[Dict[str, str]]) -> Optional[str]:
+    """
+    Aplică redenumirile whole-word. Returnează textul nou (identic dacă numele nu apare),
+    sau None când înlocuirea este ambiguă și decizia trebuie lăsată LLM-ului:
+    o ocurență în altă formă (ex: "mark" pentru numele "Mark"), sau noul nume există deja în text.
+    """
+    for rename in renames:
+        old, new = rename["old"], rename["new"]
+        found = _pattern(old, re.IGNORECASE).findall(text)
+        if not found:
+            continue
+        if _pattern(new).search(text) or any(_replacement(m, old, new) is None for m in found):
+            return None
+        text = _pattern(old, re.IGNORECASE).sub(lambda m: _replacement(m.group(0), old, new), text)
+    return text
+
+
+def mentions(text: str, renames: List[Dict[str, str]]) -> bool:
+    return any(_pattern(r["old"], re.IGNORECASE).search(text or "") for r in renames)
+
+
+def detect_renames(original: str, modified: str, reference: str = "") -> Optional[List[Dict[str, str]]]:
+    """
+    [{"old": ..., "new": ...}] dacă diferența dintre versiuni este exclusiv redenumirea consecventă
+    a unor nume proprii (toate ocurențele), altfel None. `reference` (ex: Expanded Plot + Chapters
+    Overview) poate confirma că un nume este propriu când în secțiune apare doar la început de propoziție.
+    """
+    if not original or not modified or original == modified:
+        return None
+    a, b = _tokens(original), _tokens(modified)
+    mapping: Dict[str, str] = {}
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        if tag != "replace":
+            return None
+        old, new = "".join(a[i1:i2]).strip(), "".join(b[j1:j2]).strip()
+        if not (_is_name(old) and _is_name(new)) or mapping.setdefault(old, new) != new:
+            return None
+    # "ROBERT" → "MICHAEL" este forma în majuscule a lui "Robert" → "Michael", nu o redenumire separată
+    renames = [
+        {"old": old, "new": new} for old, new in mapping.items()
+        if not (old.isupper() and any(o != old and o.upper() == old and n.upper() == new for o, n in mapping.items()))
+    ]
+    # editarea trebuie explicată complet de redenumiri (fără ocurențe rămase sau alte modificări)
+    if not renames or rename_in_text(original, renames) != modified:
+        return None
+    # "Yesterday" → "Today", "She" → "He": nu sunt redenumiri, ci editări de conținut
+    for rename in renames:
+        if not is_proper_noun(rename["old"], original, reference) or _is_common(rename["new"]):
+            return None
+    return renames
+
+
+def describe_renames(renames: List[Dict[str, str]]) -> str:
+    return ", ".join(f'"{r["old"]}" → "{r["new"]}"' for r in renames)